@@ -0,0 +1,56 @@
+"""
+Measure the AsyncGerritClient throughput against the fake Gerrit server, with latency and errors.
+
+For each concurrency level, fetch every group of a synthetic instance (with its members and
+subgroups) and report the groups per second, and the requests made including the retries.
+"""
+
+import argparse
+import asyncio
+import time
+
+from pydantic_gerrit.aio import AsyncGerritClient
+from tests.fake_gerrit import FakeGerrit
+
+
+async def fetch_all(url: str, names: list[str], concurrency: int) -> None:
+    async with AsyncGerritClient(url, max_concurrency=concurrency, retries=10, backoff=0.01) as client:
+        await asyncio.gather(*(client.get_group_detail(x) for x in names))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--groups', type=int, default=500, help='number of groups (default: %(default)s)')
+    parser.add_argument('--members', type=int, default=20, help='direct members per group (default: %(default)s)')
+    parser.add_argument(
+        '--latency', type=float, default=0.02, help='seconds added to each response (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--error-rate', type=float, default=0.05, help='ratio of requests failing with 503 (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        nargs='+',
+        default=[1, 4, 16, 64],
+        help='concurrency levels to measure (default: %(default)s)',
+    )
+    args = parser.parse_args()
+
+    for concurrency in args.concurrency:
+        # A new server for each level, with the same seed, so each one gets the same failures
+        gerrit = FakeGerrit.synthetic(
+            args.groups, members_per_group=args.members, latency=args.latency, error_rate=args.error_rate
+        )
+        with gerrit:
+            start = time.perf_counter()
+            asyncio.run(fetch_all(gerrit.url, list(gerrit.groups), concurrency))
+            elapsed = time.perf_counter() - start
+        print(
+            f'concurrency {concurrency:3}: {args.groups / elapsed:8,.0f} groups/s'
+            f' ({len(gerrit.requests):,} requests, {gerrit.connections} connections)'
+        )
+
+
+if __name__ == '__main__':
+    main()
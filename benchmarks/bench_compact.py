@@ -0,0 +1,82 @@
+"""
+Compare the memory kept by the models of accounts and groups against their compact representations
+(see pydantic_gerrit.compact), in bytes per object, and the speed of the conversions.
+"""
+
+import argparse
+import gc
+import tracemalloc
+from collections.abc import Callable
+from functools import partial
+from json import dumps
+
+from benchmarks.helpers import ops_per_second
+from pydantic_gerrit.compact import CompactAccount, CompactGroup
+from pydantic_gerrit.latest.accounts import AccountInfo
+from pydantic_gerrit.latest.groups import GroupInfo
+from pydantic_gerrit.parsing import parse_response
+from tests import synthetic
+
+
+def retained_memory(func: Callable[[], object]) -> int:
+    """The memory used by the result of func."""
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--accounts', type=int, default=50_000, help='number of accounts (default: %(default)s)')
+    parser.add_argument('--groups', type=int, default=5_000, help='number of groups (default: %(default)s)')
+    parser.add_argument('--members', type=int, default=10, help='direct members per group (default: %(default)s)')
+    args = parser.parse_args()
+
+    accounts_content = dumps([synthetic.account(i) for i in range(args.accounts)]).encode()
+    # Each group with its members, as in groups/?o=MEMBERS
+    groups_content = dumps(
+        synthetic.groups_with_members(args.groups, members_per_group=args.members, accounts=args.accounts)
+    ).encode()
+
+    def accounts() -> list[AccountInfo]:
+        return parse_response(accounts_content, list[AccountInfo])
+
+    def groups() -> list[GroupInfo]:
+        return list(parse_response(groups_content, dict[str, GroupInfo]).values())
+
+    def shared(models: list[GroupInfo]) -> list[CompactGroup]:
+        accounts: dict[int, CompactAccount] = {}
+        return [CompactGroup.from_model(x, accounts) for x in models]
+
+    print(f'{args.accounts:,} accounts with avatars, {args.groups:,} groups with {args.members} members each')
+    runs: dict[str, tuple[int, Callable[[], object]]] = {
+        'AccountInfo': (args.accounts, accounts),
+        'CompactAccount': (args.accounts, lambda: [CompactAccount.from_model(x) for x in accounts()]),
+        'GroupInfo + members': (args.groups, groups),
+        'CompactGroup + members': (args.groups, lambda: [CompactGroup.from_model(x) for x in groups()]),
+        '... sharing the accounts': (args.groups, lambda: shared(groups())),
+    }
+    for title, (count, func) in runs.items():
+        print(f'  {title:>24}: {retained_memory(func) / count:10,.0f} bytes per object')
+
+    account_models = accounts()
+    compact_accounts = [CompactAccount.from_model(x) for x in account_models]
+    group_models = groups()
+    compact_groups = [CompactGroup.from_model(x) for x in group_models]
+    conversions = {
+        'CompactAccount.from_model': (args.accounts, partial(map, CompactAccount.from_model, account_models)),
+        'CompactAccount.to_model': (args.accounts, partial(map, CompactAccount.to_model, compact_accounts)),
+        'CompactGroup.from_model': (args.groups, partial(map, CompactGroup.from_model, group_models)),
+        'CompactGroup.to_model': (args.groups, partial(map, CompactGroup.to_model, compact_groups)),
+    }
+    for title, (count, convert) in conversions.items():
+        speed = ops_per_second(lambda convert=convert: list(convert()), count)  # type: ignore[misc]
+        print(f'  {title:>26}: {speed:10,.0f} objects/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Compare the validation throughput of GroupAuditEventInfo as a union tagged by `type` against the
+previous model, where `member` was a plain `AccountInfo | GroupInfo` union.
+
+Both share the other fields (date, user), so only the union differs between them.
+"""
+
+import argparse
+from typing import Any, Literal
+
+from pydantic import TypeAdapter
+
+from benchmarks.helpers import load_response, ops_per_second, scale_list
+from pydantic_gerrit.latest.accounts import AccountInfo
+from pydantic_gerrit.latest.groups import GroupAuditEventInfo, GroupInfo, _GroupAuditEventInfoBase
+
+
+class PlainUnionGroupAuditEventInfo(_GroupAuditEventInfoBase):
+    """GroupAuditEventInfo as it was before, with a plain (smart mode) union for `member`."""
+
+    type: Literal['ADD_USER', 'REMOVE_USER', 'ADD_GROUP', 'REMOVE_GROUP']
+    member: AccountInfo | GroupInfo
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=100_000, help='number of audit events (default: %(default)s)')
+    args = parser.parse_args()
+
+    events = scale_list(load_response('group-audit-event-info.jsonl'), args.events)
+    adapters: dict[str, TypeAdapter[list[Any]]] = {
+        'plain union': TypeAdapter(list[PlainUnionGroupAuditEventInfo]),
+        'tagged union': TypeAdapter(list[GroupAuditEventInfo]),
+    }
+
+    print(f'Validating {len(events)} audit events')
+    results: dict[str, float] = {}
+    for label, adapter in adapters.items():
+        results[label] = ops_per_second(lambda adapter=adapter: adapter.validate_python(events), len(events))  # type: ignore[misc]
+        print(f'  {label:>12}: {results[label]:12,.0f} events/s')
+    print(f'  {"speedup":>12}: {results["tagged union"] / results["plain union"]:12.2f}x')
+
+
+if __name__ == '__main__':
+    main()
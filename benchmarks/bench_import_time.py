@@ -0,0 +1,68 @@
+"""
+Measure the import time of each version package (all its endpoint modules), on a fresh
+interpreter. The time to import pydantic itself is not included.
+
+The models defer building their validators and serializers to their first use, so this is the
+startup cost paid even by programs that never touch most of the models.
+
+Exits with an error if any package is over the budget, so it can guard the startup time in CI.
+"""
+
+import argparse
+import pkgutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pydantic_gerrit
+
+# Run in a fresh interpreter, printing the import time in milliseconds
+MEASURE_SCRIPT = """
+import time
+from pydantic import BaseModel, Field, TypeAdapter, model_validator  # pydantic imports them lazily
+start = time.perf_counter()
+{imports}
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def version_packages() -> list[str]:
+    return sorted(
+        x.name
+        for x in pkgutil.iter_modules(pydantic_gerrit.__path__)
+        if x.ispkg and (x.name == 'latest' or x.name.startswith('v'))
+    )
+
+
+def endpoint_modules(package: str) -> list[str]:
+    path = Path(pydantic_gerrit.__path__[0]) / package
+    return [f'pydantic_gerrit.{package}.{x.name}' for x in pkgutil.iter_modules([str(path)])]
+
+
+def import_time(modules: list[str]) -> float:
+    script = MEASURE_SCRIPT.format(imports='\n'.join(f'import {x}' for x in modules))
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout  # noqa: S603
+    return float(output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--budget-ms', type=float, default=30.0, help='maximum import time (default: %(default)s)')
+    parser.add_argument('--runs', type=int, default=5, help='best of N runs (default: %(default)s)')
+    args = parser.parse_args()
+
+    over_budget = []
+    for package in version_packages():
+        modules = endpoint_modules(package)
+        elapsed = min(import_time(modules) for _ in range(args.runs))
+        status = 'ok' if elapsed <= args.budget_ms else 'OVER BUDGET'
+        print(f'  {package:>8}: {elapsed:6.1f} ms  ({len(modules)} endpoint modules) {status}')
+        if elapsed > args.budget_ms:
+            over_budget.append(package)
+
+    if over_budget:
+        sys.exit(f'Over the {args.budget_ms} ms budget: {", ".join(over_budget)}')
+
+
+if __name__ == '__main__':
+    main()
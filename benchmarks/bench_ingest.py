@@ -0,0 +1,100 @@
+"""
+Compare ways of validating a large log.audit dump, in time and peak memory (of the main process):
+
+- json.loads and model_validate of each item, as the tests do
+- parse_response() of the whole file
+- ingest(): streaming, in chunks
+- ingest_parallel(): streaming, with a pool of processes, each counting the events per user
+
+Each one only counts the events per user, so no result is kept.
+"""
+
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+
+from pydantic import TypeAdapter
+
+from pydantic_gerrit.ingest import ingest, ingest_parallel
+from pydantic_gerrit.latest.groups import GroupAuditEventInfo
+from pydantic_gerrit.parsing import parse_response
+from tests import synthetic
+
+
+def events_per_user(events: list[GroupAuditEventInfo]) -> Counter[int]:
+    return Counter(x.user.account_id for x in events)
+
+
+def measure(func: Callable[[], object], *, memory: bool) -> tuple[float, int]:
+    """The time of func, and its peak memory (measured in another run, since tracemalloc is slow)."""
+    gc.collect()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if memory:
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=200_000, help='number of audit events (default: %(default)s)')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        nargs='+',
+        default=sorted({1, 2, os.cpu_count() or 1}),
+        help='numbers of processes for ingest_parallel (default: %(default)s)',
+    )
+    args = parser.parse_args()
+
+    adapter: TypeAdapter[GroupAuditEventInfo] = TypeAdapter(GroupAuditEventInfo)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'log.audit.json'
+        path.write_bytes(b")]}'\n" + json.dumps(synthetic.audit_events(args.events), indent=2).encode())
+        print(f'{args.events:,} audit events ({path.stat().st_size / 2**20:.1f} MiB), {os.cpu_count()} cores')
+
+        def per_item() -> None:
+            data = json.loads(path.read_bytes().removeprefix(b")]}'"))
+            events_per_user([adapter.validate_python(x) for x in data])
+
+        def whole() -> None:
+            events_per_user(parse_response(path.read_bytes(), list[GroupAuditEventInfo]))
+
+        def streaming() -> None:
+            with path.open('rb') as file:
+                Counter(x.user.account_id for x in ingest(file, GroupAuditEventInfo))
+
+        runs: dict[str, tuple[Callable[[], object], bool]] = {
+            'json.loads + validate': (per_item, True),
+            'parse_response': (whole, True),
+            'ingest': (streaming, True),
+        }
+        for workers in args.workers:
+
+            def parallel(workers: int = workers) -> None:
+                with path.open('rb') as file:
+                    sum(ingest_parallel(file, GroupAuditEventInfo, events_per_user, workers=workers), Counter())
+
+            # The memory of the workers is not traced
+            runs[f'ingest_parallel, {workers} workers'] = (parallel, False)
+
+        for title, (func, memory) in runs.items():
+            elapsed, peak = measure(func, memory=memory)
+            peak_text = f'{peak / 2**20:8.1f} MiB' if memory else ''
+            print(f'  {title:>28}: {args.events / elapsed:10,.0f} events/s {peak_text}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Compare the memory retained by a validated audit log, with and without an InternPool sharing the
+equal accounts (validated as the interned type, see pydantic_gerrit.interning).
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from pydantic import TypeAdapter
+
+from benchmarks.helpers import load_response, scale_list
+from pydantic_gerrit.interning import InternPool, interned_type
+from pydantic_gerrit.latest.groups import GroupAuditEventInfo
+
+
+def measure(validate: Callable[[], object]) -> tuple[float, int]:
+    """Return the time spent and the memory retained by the result of `validate`."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = validate()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=100_000, help='number of audit events (default: %(default)s)')
+    args = parser.parse_args()
+
+    events = scale_list(load_response('group-audit-event-info.jsonl'), args.events)
+    adapter: TypeAdapter[list[GroupAuditEventInfo]] = TypeAdapter(list[GroupAuditEventInfo])
+    interned: TypeAdapter[list[GroupAuditEventInfo]] = TypeAdapter(interned_type(list[GroupAuditEventInfo]))
+    adapter.validate_python(events[:1])  # warm up
+    interned.validate_python(events[:1])
+
+    print(f'Validating {len(events)} audit events (times include the tracemalloc overhead)')
+    results = {
+        'no interning': measure(lambda: adapter.validate_python(events)),
+        'intern pool': measure(lambda: interned.validate_python(events, context=InternPool().context)),
+    }
+    for label, (elapsed, retained) in results.items():
+        print(f'  {label:>12}: {retained / 2**20:8.1f} MiB retained, {elapsed:6.2f} s')
+    print(f'  {"reduction":>12}: {results["no interning"][1] / results["intern pool"][1]:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
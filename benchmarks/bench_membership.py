@@ -0,0 +1,65 @@
+"""
+Build a MembershipIndex for a large synthetic instance, and measure its queries.
+
+The groups form a hierarchy (like an organization chart): each group includes a few groups of the
+level below, and has a few direct members.
+"""
+
+import argparse
+import time
+import tracemalloc
+from random import Random
+
+from pydantic_gerrit.latest.groups import GroupInfo
+from pydantic_gerrit.membership import MembershipIndex
+from tests import synthetic
+
+
+def hierarchy(count: int, *, fanout: int, members: int, accounts: int) -> list[GroupInfo]:
+    random = Random(0)  # noqa: S311
+    pool = [synthetic.account(i) for i in range(accounts)]
+    groups = []
+    for index in range(count):
+        subgroups = range(index * fanout + 1, min(count, (index + 1) * fanout + 1))
+        data = synthetic.group(
+            index,
+            members=random.sample(pool, members),
+            includes=[synthetic.group(x) for x in subgroups],
+        )
+        groups.append(GroupInfo.model_validate(data))
+    return groups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--groups', type=int, default=30_000, help='number of groups (default: %(default)s)')
+    parser.add_argument('--fanout', type=int, default=5, help='subgroups per group (default: %(default)s)')
+    parser.add_argument('--members', type=int, default=10, help='direct members per group (default: %(default)s)')
+    parser.add_argument('--accounts', type=int, default=20_000, help='number of accounts (default: %(default)s)')
+    args = parser.parse_args()
+
+    groups = hierarchy(args.groups, fanout=args.fanout, members=args.members, accounts=args.accounts)
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = MembershipIndex(groups)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'Index of {len(index):,} groups: built in {elapsed:.2f}s, peak memory {peak / 2**20:.1f} MiB')
+
+    account_ids = [synthetic.FIRST_ACCOUNT_ID + i for i in range(args.accounts)]
+    group_ids = [x.id for x in groups]
+    queries = len(account_ids)
+    start = time.perf_counter()
+    for account_id, group_id in zip(account_ids, group_ids * (queries // len(group_ids) + 1), strict=False):
+        index.is_member(account_id, group_id)
+    print(f'  is_member: {queries / (time.perf_counter() - start):12,.0f} queries/s')
+    start = time.perf_counter()
+    total = sum(len(index.groups_of(x)) for x in account_ids)
+    print(
+        f'  groups_of: {queries / (time.perf_counter() - start):12,.0f} queries/s ({total / queries:.1f} groups each)'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+Compare parsing a raw `groups/?o=MEMBERS` response into models the way the tests do (decode,
+remove the prefix, json.loads and model_validate per item) against parse_response().
+"""
+
+import argparse
+from json import dumps, loads
+
+from benchmarks.helpers import load_response, ops_per_second
+from pydantic_gerrit.latest.groups import GroupInfo
+from pydantic_gerrit.parsing import parse_response
+
+
+def double_parse(content: bytes) -> dict[str, GroupInfo]:
+    parsed = loads(content.decode().removeprefix(")]}'"))
+    return {key: GroupInfo.model_validate(value) for key, value in parsed.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--groups', type=int, default=10_000, help='number of groups (default: %(default)s)')
+    args = parser.parse_args()
+
+    recorded = list(load_response('groups-with-members.json').values())
+    groups = {f'group-{i}': recorded[i % len(recorded)] for i in range(args.groups)}
+    content = b")]}'\n" + dumps(groups).encode()
+    assert double_parse(content) == parse_response(content, dict[str, GroupInfo])
+
+    print(f'Parsing a response with {len(groups)} groups ({len(content):,} bytes)')
+    before = ops_per_second(lambda: double_parse(content), len(groups))
+    after = ops_per_second(lambda: parse_response(content, dict[str, GroupInfo]), len(groups))
+    print(f'  {"double parse":>14}: {before:12,.0f} groups/s')
+    print(f'  {"parse_response":>14}: {after:12,.0f} groups/s')
+    print(f'  {"speedup":>14}: {after / before:12.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Compare parsing a `groups/?o=MEMBERS` response into the full models against projections with only
+a few fields, in throughput and in the memory kept by the result.
+"""
+
+import argparse
+import gc
+import tracemalloc
+from functools import partial
+from json import dumps
+from typing import Any
+
+from benchmarks.helpers import ops_per_second
+from pydantic_gerrit.latest.groups import GroupInfo
+from pydantic_gerrit.parsing import parse_response
+from pydantic_gerrit.projection import projection
+from tests import synthetic
+
+
+def retained_memory(content: bytes, type_: Any) -> int:  # noqa: ANN401
+    """The memory used by the result of parsing the content."""
+    gc.collect()
+    tracemalloc.start()
+    result = parse_response(content, type_)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--groups', type=int, default=5_000, help='number of groups (default: %(default)s)')
+    parser.add_argument('--members', type=int, default=10, help='direct members per group (default: %(default)s)')
+    args = parser.parse_args()
+
+    groups = synthetic.groups_with_members(args.groups, members_per_group=args.members)
+    content = b")]}'\n" + dumps(groups).encode()
+    print(f'groups/?o=MEMBERS with {args.groups} groups ({len(content):,} bytes)')
+    types = {
+        'GroupInfo': GroupInfo,
+        'id, name, owner_id': projection(GroupInfo, 'id', 'name', 'owner_id'),
+        '... + account_id, email': projection(GroupInfo, 'id', 'name', 'owner_id', members=('account_id', 'email')),
+    }
+    baseline = None
+    for title, model in types.items():
+        type_ = dict[str, model]  # type: ignore[valid-type]
+        parse_response(content, type_)  # builds the validator
+        speed = ops_per_second(partial(parse_response, content, type_), args.groups)
+        baseline = baseline or speed
+        memory = retained_memory(content, type_)
+        print(f'  {title:>24}: {speed:10,.0f} groups/s {speed / baseline:6.2f}x {memory / 2**20:8.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
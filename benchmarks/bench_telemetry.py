@@ -0,0 +1,53 @@
+"""
+Measure the overhead of pydantic_gerrit.telemetry on parse_response(), when disabled (the default)
+and when enabled, against the same steps without it: removing the XSSI prefix, and validating with
+the cached TypeAdapter.
+
+The overhead is per parsed response, so it matters the most for the small ones, like a single
+account. The model methods (`AccountInfo.model_validate()`) are not instrumented at all.
+"""
+
+import argparse
+from json import dumps
+from typing import Any
+
+from benchmarks.helpers import ops_per_second
+from pydantic_gerrit import telemetry
+from pydantic_gerrit.latest.accounts import AccountInfo
+from pydantic_gerrit.latest.groups import GroupInfo
+from pydantic_gerrit.parsing import get_type_adapter, parse_response, response_json
+from tests import synthetic
+
+
+def compare(title: str, type_: Any, content: bytes, calls: int) -> None:  # noqa: ANN401
+    def parse() -> None:
+        for _ in range(calls):
+            parse_response(content, type_)
+
+    def untracked() -> None:
+        for _ in range(calls):
+            get_type_adapter(type_).validate_json(response_json(content))
+
+    print(f'{title} ({len(content):,} bytes)')
+    results = {'untracked': ops_per_second(untracked, calls), 'disabled': ops_per_second(parse, calls)}
+    telemetry.enable()
+    results['enabled'] = ops_per_second(parse, calls)
+    telemetry.disable()
+    for label, speed in results.items():
+        overhead = 1e9 / speed - 1e9 / results['untracked']
+        print(f'  {label:>9}: {speed:12,.0f} responses/s, {overhead:+8,.0f} ns per response')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=100_000, help='responses parsed per run (default: %(default)s)')
+    args = parser.parse_args()
+
+    compare('A minimal account', AccountInfo, b'{"_account_id": 1}', args.calls)
+    compare('An account with avatars', AccountInfo, dumps(synthetic.account(0)).encode(), args.calls)
+    groups = synthetic.groups_with_members(100)
+    compare('groups/?o=MEMBERS with 100 groups', dict[str, GroupInfo], dumps(groups).encode(), args.calls // 1000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Compare the parsing of the Gerrit timestamps of a large audit log, by the pydantic datetime parser
+of the models (which drops the nanoseconds) and by the opt-in Timestamp type (lossless, cached).
+
+An audit log has repeated timestamps, since Gerrit records the bulk changes at once. The recorded
+log has 31 events with 19 distinct timestamps. The "unique" run has no repetitions at all, so it
+shows the cost of the cache misses.
+"""
+
+import argparse
+from datetime import datetime
+
+from pydantic import TypeAdapter
+
+from benchmarks.helpers import load_response, ops_per_second, scale_list
+from pydantic_gerrit import timestamps
+from pydantic_gerrit.timestamps import Timestamp
+from tests import synthetic
+
+
+def compare(title: str, dates: list[str]) -> None:
+    generic: TypeAdapter[list[datetime]] = TypeAdapter(list[datetime])
+    lossless: TypeAdapter[list[Timestamp]] = TypeAdapter(list[Timestamp])
+    assert generic.validate_python(dates) == lossless.validate_python(dates)
+
+    def parse_timestamps() -> None:
+        timestamps._parsed.clear()  # noqa: SLF001, every run starts with an empty cache
+        lossless.validate_python(dates)
+
+    print(f'{title} ({len(dates):,} timestamps, {len(set(dates)):,} distinct)')
+    before = ops_per_second(lambda: generic.validate_python(dates), len(dates))
+    after = ops_per_second(parse_timestamps, len(dates))
+    print(f'  {"datetime":>9}: {before:12,.0f} timestamps/s')
+    print(f'  {"Timestamp":>9}: {after:12,.0f} timestamps/s')
+    print(f'  {"ratio":>9}: {after / before:12.2f}x')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=100_000, help='number of audit events (default: %(default)s)')
+    args = parser.parse_args()
+
+    recorded = [x['date'] for x in load_response('group-audit-event-info.jsonl')]
+    compare('Recorded audit log, scaled', scale_list(recorded, args.events))
+    compare('Synthetic audit log, unique', [x['date'] for x in synthetic.audit_events(args.events)])
+
+
+if __name__ == '__main__':
+    main()
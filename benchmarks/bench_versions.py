@@ -0,0 +1,69 @@
+"""
+Measure the cost of loading the models of every version package at once, as a service talking to
+several Gerrit versions does: the time to import them and build all their validators and
+serializers, and the memory they use, on a fresh interpreter.
+
+The version packages share the unchanged models of `latest` (see pydantic_gerrit.registry), so
+loading all of them should cost about the same as loading `latest` alone. For comparison, the last
+run gives each version package its own copy of every model (a subclass, with its own schema), as if
+the packages duplicated them.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from pydantic_gerrit.registry import LATEST, version_packages
+
+# Run in a fresh interpreter, printing the elapsed milliseconds and the traced memory
+MEASURE_SCRIPT = """
+import json, time, tracemalloc
+from importlib import import_module
+from pydantic import BaseModel, Field, TypeAdapter, model_validator  # pydantic imports them lazily
+if {trace}:
+    tracemalloc.start()
+start = time.perf_counter()
+models = set()
+for package in {packages}:
+    module = import_module(f'pydantic_gerrit.{{package}}')
+    for name in module.__all__:
+        model = getattr(module, name)
+        if isinstance(model, type) and issubclass(model, BaseModel):
+            if {copies} and package != 'latest':
+                model = type(name, (model,), {{'__module__': module.__name__}})
+            models.add(model)
+for model in models:
+    model.model_rebuild()  # builds the deferred validator and serializer
+elapsed = (time.perf_counter() - start) * 1000
+size = tracemalloc.get_traced_memory()[0] if {trace} else 0
+print(json.dumps([elapsed, size, len(models)]))
+"""
+
+
+def measure(packages: list[str], *, copies: bool, trace: bool) -> tuple[float, int, int]:
+    script = MEASURE_SCRIPT.format(packages=packages, copies=copies, trace=trace)
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout  # noqa: S603
+    elapsed, size, count = json.loads(output)
+    return elapsed, size, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='best of N runs for the time (default: %(default)s)')
+    args = parser.parse_args()
+
+    versions = list(version_packages().values())
+    runs = {
+        LATEST: ([LATEST], False),
+        f'{LATEST} + {", ".join(versions)}': ([LATEST, *versions], False),
+        '... with copies of the models': ([LATEST, *versions], True),
+    }
+    for title, (packages, copies) in runs.items():
+        elapsed = min(measure(packages, copies=copies, trace=False)[0] for _ in range(args.runs))
+        _, size, count = measure(packages, copies=copies, trace=True)
+        print(f'  {title:>30}: {count:3} models {elapsed:8.1f} ms {size / 2**20:8.2f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+import time
+from collections.abc import Callable
+from json import loads
+from typing import Any
+
+from tests.helpers import read_recorded
+
+
+def load_response(name: str) -> Any:  # noqa: ANN401
+    return loads(read_recorded(name))
+
+
+def scale_list(items: list[Any], size: int) -> list[Any]:
+    """Repeat the items until the list has the given size."""
+    return (items * (size // len(items) + 1))[:size]
+
+
+def ops_per_second(func: Callable[[], object], ops: int, *, repeat: int = 5) -> float:
+    """Run `func` (which does `ops` operations) a few times and return the best throughput."""
+    best = min(_elapsed(func) for _ in range(repeat))
+    return ops / best
+
+
+def _elapsed(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
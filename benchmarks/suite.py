@@ -0,0 +1,179 @@
+"""
+Benchmark suite for the validation and serialization of the main models, for every version package.
+
+For each version package, model and dataset (recorded responses and synthetic scaled ones), it
+measures the throughput (items per second) and the peak memory of:
+
+- model_validate: from Python objects (as returned by json.loads)
+- model_validate_json: from the raw JSON of each item
+- model_dump: to Python objects
+- model_dump_json: to JSON
+
+GroupAuditEventInfo is a tagged union and not a class, so it uses the equivalent TypeAdapter
+methods (validate_python, validate_json, dump_python, dump_json).
+
+The results are printed as JSON, to be stored and compared between runs:
+
+    python -m benchmarks.suite --output results.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass
+from importlib import import_module
+from typing import Any
+
+import pydantic
+from pydantic import BaseModel, TypeAdapter
+
+from benchmarks.bench_import_time import version_packages
+from benchmarks.helpers import load_response
+from tests import synthetic
+
+OPERATIONS = ('model_validate', 'model_validate_json', 'model_dump', 'model_dump_json')
+
+
+@dataclass
+class Dataset:
+    name: str
+    model: str  # the model name, to be found in each version package
+    items: list[Any]  # the JSON-like data of each item
+
+
+@dataclass
+class Result:
+    package: str
+    model: str
+    dataset: str
+    operation: str
+    items: int
+    ops_per_sec: float
+    peak_memory_bytes: int
+
+
+def datasets(scale: float) -> list[Dataset]:
+    """The recorded responses, and synthetic ones sized by the scale (1.0 is the full size)."""
+
+    def scaled(size: int) -> int:
+        return max(1, int(size * scale))
+
+    recorded_members = load_response('groups-with-members.json')
+    groups, accounts, events = scaled(10_000), scaled(10_000), scaled(100_000)
+    depth = 7 if scale >= 1 else 3
+    return [
+        Dataset('recorded groups', 'GroupInfo', list(load_response('groups.json').values())),
+        Dataset('recorded groups-with-members', 'GroupInfo', list(recorded_members.values())),
+        Dataset(
+            'recorded groups-with-includes', 'GroupInfo', list(load_response('groups-with-includes.json').values())
+        ),
+        Dataset(
+            'recorded accounts', 'AccountInfo', [x for group in recorded_members.values() for x in group['members']]
+        ),
+        Dataset('recorded audit events', 'GroupAuditEventInfo', load_response('group-audit-event-info.jsonl')),
+        Dataset(f'{groups} groups with members', 'GroupInfo', list(synthetic.groups_with_members(groups).values())),
+        Dataset(f'includes tree (depth {depth}, fanout 4)', 'GroupInfo', [synthetic.includes_tree(depth, 4)]),
+        Dataset(f'{accounts} accounts', 'AccountInfo', [synthetic.account(i) for i in range(accounts)]),
+        Dataset(f'{events} audit events', 'GroupAuditEventInfo', synthetic.audit_events(events)),
+    ]
+
+
+def operations(type_: Any) -> dict[str, Callable[[Any], Any]]:  # noqa: ANN401
+    """The benchmarked operations for a model class or, for other types, their TypeAdapter equivalents."""
+    if isinstance(type_, type) and issubclass(type_, BaseModel):
+        return {
+            'model_validate': type_.model_validate,
+            'model_validate_json': type_.model_validate_json,
+            'model_dump': lambda x: x.model_dump(),
+            'model_dump_json': lambda x: x.model_dump_json(),
+        }
+    adapter: TypeAdapter[Any] = TypeAdapter(type_)
+    return {
+        'model_validate': adapter.validate_python,
+        'model_validate_json': adapter.validate_json,
+        'model_dump': adapter.dump_python,
+        'model_dump_json': adapter.dump_json,
+    }
+
+
+def measure(func: Callable[[Any], Any], inputs: list[Any], *, repeat: int) -> tuple[float, int]:
+    """Return the best throughput of `func` over the inputs, and its peak memory keeping all the outputs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in inputs:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+
+    # Separate run for the memory, since tracemalloc slows everything down
+    gc.collect()
+    tracemalloc.start()
+    outputs = [func(item) for item in inputs]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del outputs
+    return len(inputs) / best, peak
+
+
+def run(packages: list[str], scale: float, repeat: int) -> Iterator[Result]:
+    for dataset in datasets(scale):
+        raw_items = [json.dumps(x).encode() for x in dataset.items]
+        for package in packages:
+            type_ = getattr(import_module(f'pydantic_gerrit.{package}'), dataset.model)
+            ops = operations(type_)
+            validated = [ops['model_validate'](x) for x in dataset.items]  # also builds the deferred schemas
+            inputs = {
+                'model_validate': dataset.items,
+                'model_validate_json': raw_items,
+                'model_dump': validated,
+                'model_dump_json': validated,
+            }
+            for operation in OPERATIONS:
+                ops_per_sec, peak = measure(ops[operation], inputs[operation], repeat=repeat)
+                yield Result(package, dataset.model, dataset.name, operation, len(dataset.items), ops_per_sec, peak)
+
+
+def environment() -> dict[str, str]:
+    return {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'pydantic': pydantic.VERSION,
+        'platform': platform.platform(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--scale', type=float, default=1.0, help='size of the synthetic datasets (default: %(default)s)'
+    )
+    parser.add_argument('--repeat', type=int, default=3, help='best of N runs (default: %(default)s)')
+    parser.add_argument('--package', action='append', help='only this version package (can be repeated)')
+    parser.add_argument('--output', help='write the JSON results to this file, instead of stdout')
+    args = parser.parse_args()
+
+    results = []
+    for result in run(args.package or version_packages(), args.scale, args.repeat):
+        print(
+            f'{result.package:>7} {result.model:>19} {result.operation:>19} {result.ops_per_sec:12,.0f}/s'
+            f' {result.peak_memory_bytes / 2**20:8.1f} MiB  {result.dataset}',
+            file=sys.stderr,
+        )
+        results.append(asdict(result))
+
+    output = json.dumps({'environment': environment(), 'results': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:  # noqa: PTH123
+            file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
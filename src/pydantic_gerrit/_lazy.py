@@ -0,0 +1,29 @@
+from collections.abc import Callable
+from importlib import import_module
+from typing import Any
+
+
+def lazy_attributes(
+    package: str, submodules: dict[str, list[str]]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Return the module `__getattr__` and `__dir__` functions for a package exposing the given
+    attributes from its submodules, which are imported only on first access (PEP 562).
+
+        __getattr__, __dir__ = lazy_attributes(__name__, {'groups': ['GroupInfo']})
+    """
+    origin = {name: submodule for submodule, names in submodules.items() for name in names}
+    namespace = import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:  # noqa: ANN401, N807
+        if name not in origin:
+            msg = f'module {package!r} has no attribute {name!r}'
+            raise AttributeError(msg)
+        value = getattr(import_module(f'{package}.{origin[name]}'), name)
+        namespace[name] = value  # next accesses won't even call __getattr__
+        return value
+
+    def __dir__() -> list[str]:  # noqa: N807
+        return sorted({*namespace, *origin})
+
+    return __getattr__, __dir__
@@ -0,0 +1,30 @@
+"""Rebuilding type annotations, like `dict[str, GroupInfo]`, with some of their types replaced."""
+
+import types
+from collections.abc import Callable
+from typing import Annotated, Any, Literal, Union, get_args, get_origin
+
+
+def replace_types(type_: Any, replace: Callable[[Any], Any]) -> Any:  # noqa: ANN401
+    """
+    Return the type with replace() applied to each of its leaf types (the ones without arguments).
+
+    The generic types are rebuilt with their own origin: `Sequence[X]` stays a Sequence, `X | None`
+    a union, and so on. The Annotated metadata, the Literal values and the `...` of `tuple[X, ...]`
+    are kept as they are. A type without any replaced part is returned itself.
+    """
+    origin = get_origin(type_)
+    args = get_args(type_)
+    if not args:
+        return replace(type_)
+    if origin is Literal:
+        return type_
+    if origin is Annotated:
+        replaced = replace_types(args[0], replace)
+        return type_ if replaced is args[0] else Annotated[(replaced, *type_.__metadata__)]
+    new_args = tuple(x if x is Ellipsis else replace_types(x, replace) for x in args)
+    if all(x is y for x, y in zip(new_args, args, strict=True)):
+        return type_
+    if origin is Union or origin is types.UnionType:
+        return Union[new_args]  # noqa: UP007
+    return origin[new_args]
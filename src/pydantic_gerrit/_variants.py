@@ -0,0 +1,120 @@
+"""
+Variants of the models, like the interned or the lossless ones.
+
+A variant is created from the fields of a model, with the models in their types (members,
+includes, avatars, the audit event members) replaced by their own variants, of the same kind.
+"""
+
+import sys
+import types
+from collections.abc import Callable
+from typing import Any, ForwardRef, cast
+
+from pydantic import BaseModel
+from pydantic.fields import FieldInfo
+
+from pydantic_gerrit._types import replace_types
+
+# The fields of a variant, as create_model() takes them: (annotation, FieldInfo) tuples by field name
+Fields = dict[str, Any]
+
+
+class ModelVariants:
+    """
+    The variants of one kind, each created only once.
+
+    create(model, fields) returns the variant of the model, given its fields with their types
+    replaced. replace(leaf) can also replace the types that are not models, like datetime.
+    """
+
+    def __init__(
+        self,
+        create: Callable[[type[BaseModel], Fields], type[BaseModel]],
+        replace: Callable[[Any], Any] | None = None,
+    ) -> None:
+        self._create = create
+        self._replace = replace
+        self._variants: dict[type[BaseModel], type[BaseModel]] = {}
+        self._types: dict[Any, Any] = {}
+        # The variants by their unique name, to resolve the references between them
+        self._namespace: dict[str, type[BaseModel]] = {}
+
+    def for_model(self, model: type[BaseModel]) -> type[BaseModel]:
+        """Return the variant of the model."""
+        variant = self._variants.get(model)
+        if variant is None:
+            created: list[type[BaseModel]] = []
+            variant = self._create_variant(model, created)
+            # Only now all the referenced variants exist
+            for x in created:
+                x.model_rebuild(_types_namespace=self._namespace)
+        return variant
+
+    def for_type(self, type_: Any) -> Any:  # noqa: ANN401
+        """Return the type with all its models replaced by their variants: `dict[str, GroupInfo]`, etc."""
+        # Cached, so the same TypeAdapter is used every time, see pydantic_gerrit.parsing.get_type_adapter()
+        replaced = self._types.get(type_)
+        if replaced is None:
+            replaced = self._types[type_] = self._replace_types(type_, None)
+        return replaced
+
+    def _create_variant(self, model: type[BaseModel], created: list[type[BaseModel]]) -> type[BaseModel]:
+        pending: list[type[BaseModel]] = []
+        fields: Fields = {
+            # The FieldInfo keeps the alias, the default and the description
+            name: (self._replace_types(field.annotation, model, pending), FieldInfo.merge_field_infos(field))
+            for name, field in model.model_fields.items()
+        }
+        variant = self._create(model, fields)
+        self._variants[model] = self._namespace[_variant_name(model)] = variant
+        created.append(variant)
+        for nested in pending:
+            if nested not in self._variants:
+                self._create_variant(nested, created)
+        return variant
+
+    def _replace_types(
+        self,
+        type_: Any,  # noqa: ANN401
+        owner: type[BaseModel] | None,
+        pending: list[type[BaseModel]] | None = None,
+    ) -> Any:  # noqa: ANN401
+        """
+        Replace the models in the type by their variants.
+
+        Inside a model being created (owner), the nested models are referenced by name, since they
+        may not exist yet (or be the model itself, like in GroupInfo.includes). They are added to
+        pending.
+        """
+
+        def replace(leaf: Any) -> Any:  # noqa: ANN401
+            if isinstance(leaf, (str, ForwardRef)) and owner is not None:
+                # Forward references are resolved in the module of the model that uses them
+                name = leaf.__forward_arg__ if isinstance(leaf, ForwardRef) else leaf
+                leaf = getattr(sys.modules[owner.__module__], name)
+            if not (isinstance(leaf, type) and issubclass(leaf, BaseModel)):
+                return leaf if self._replace is None else self._replace(leaf)
+            if pending is None:
+                return self.for_model(leaf)
+            pending.append(leaf)
+            return _variant_name(leaf)
+
+        return replace_types(type_, replace)
+
+
+def subclass(model: type[BaseModel], name: str, fields: Fields, namespace: dict[str, Any]) -> type[BaseModel]:
+    """A subclass of the model with the fields redefined, and the namespace (like validators) added."""
+    body = {
+        '__module__': namespace.get('__module__', model.__module__),
+        '__qualname__': name,
+        '__doc__': model.__doc__,
+        '__annotations__': {x: annotation for x, (annotation, _) in fields.items()},
+        **{x: field for x, (_, field) in fields.items()},
+        **namespace,
+    }
+    return cast('type[BaseModel]', types.new_class(name, (model,), exec_body=lambda x: x.update(body)))
+
+
+def _variant_name(model: type[BaseModel]) -> str:
+    # Different version packages may have different models with the same name
+    return f'{model.__name__}_{id(model):x}'
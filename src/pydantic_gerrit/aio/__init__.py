@@ -0,0 +1,11 @@
+"""
+asyncio client for the Gerrit REST API.
+
+    from pydantic_gerrit.aio import AsyncGerritClient
+"""
+
+from pydantic_gerrit.errors import GerritAPIError
+
+from .client import AsyncGerritClient
+
+__all__ = ['AsyncGerritClient', 'GerritAPIError']
@@ -0,0 +1,110 @@
+"""
+A minimal HTTP/1.1 client on top of asyncio streams, with a pool of keep-alive connections.
+
+It implements only what is needed to talk to the Gerrit REST API, so the package does not depend
+on any HTTP library.
+"""
+
+import asyncio
+import ssl
+from collections import deque
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+MAX_LINE_SIZE = 64 * 1024  # for the status line, headers and chunk sizes
+
+
+@dataclass
+class Response:
+    status: int
+    headers: dict[str, str]  # the names are lowercase
+    body: bytes
+
+
+class Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+
+    async def request(self, method: str, target: str, headers: dict[str, str], body: bytes) -> Response:
+        head = [f'{method} {target} HTTP/1.1', *(f'{name}: {value}' for name, value in headers.items())]
+        self.writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        await self.writer.drain()
+
+        status_line = await self._read_line()
+        version, status = status_line.split(' ', 2)[:2]
+        response_headers = await self._read_headers()
+        response_body = b'' if method == 'HEAD' or status in {'204', '304'} else await self._read_body(response_headers)
+
+        connection = response_headers.get('connection', '').lower()
+        if connection == 'close' or (version == 'HTTP/1.0' and connection != 'keep-alive'):
+            self.reusable = False
+        return Response(int(status), response_headers, response_body)
+
+    def close(self) -> None:
+        self.reusable = False
+        self.writer.close()
+
+    async def _read_line(self) -> str:
+        line = await self.reader.readuntil(b'\r\n')  # limited to MAX_LINE_SIZE by the reader
+        return line[:-2].decode('latin-1')
+
+    async def _read_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        while line := await self._read_line():
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        return headers
+
+    async def _read_body(self, headers: dict[str, str]) -> bytes:
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while size := int((await self._read_line()).split(';')[0], 16):
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)  # the CRLF after each chunk
+            while await self._read_line():  # trailers, if any
+                pass
+            return b''.join(chunks)
+        if 'content-length' in headers:
+            return await self.reader.readexactly(int(headers['content-length']))
+        # No length information, the body goes until the server closes the connection
+        self.reusable = False
+        return await self.reader.read()
+
+
+class ConnectionPool:
+    """
+    Keep idle connections to a single host, to be reused by the next requests.
+
+    The pool does not limit the number of open connections, this is up to the caller.
+    """
+
+    def __init__(self, url: str) -> None:
+        parts = urlsplit(url)
+        self.host = parts.hostname or 'localhost'
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == 'https' else None
+        self.host_header = parts.netloc.rpartition('@')[2]
+        self._idle: deque[Connection] = deque()
+
+    async def acquire(self) -> Connection:
+        while self._idle:
+            connection = self._idle.pop()
+            if not connection.reader.at_eof():  # the server may have closed it in the meantime
+                return connection
+            connection.close()
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl, limit=MAX_LINE_SIZE)
+        return Connection(reader, writer)
+
+    def release(self, connection: Connection) -> None:
+        if connection.reusable:
+            self._idle.append(connection)
+        else:
+            connection.close()
+
+    async def close(self) -> None:
+        while self._idle:
+            connection = self._idle.pop()
+            connection.close()
+            await connection.writer.wait_closed()
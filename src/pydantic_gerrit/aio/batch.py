@@ -0,0 +1,154 @@
+"""
+Batched lookups: resolve many groups or accounts with a few query requests, instead of one request each.
+
+    async with AsyncGerritClient(url) as client:
+        groups = await get_groups(client, ['Administrators', 'Service Users', group_uuid])
+        accounts = await get_accounts(client, [1000000, 1000001])
+
+The identifiers are OR'ed in queries (`name:"Administrators" OR uuid:...`), in chunks small enough
+for the URL length and the query limit of the server, and the chunks are fetched concurrently.
+
+The results are the same as the ones of the per-item calls (get_group(), get_group_detail() and
+get_account()), by the given identifiers. The identifiers that can't be queried (legacy numeric
+group IDs, external groups, account usernames or emails), or that are not in the query results for
+any other reason, are fetched with the per-item calls. The ones that do not exist are left out.
+"""
+
+import asyncio
+import re
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TypeVar
+from urllib.parse import quote
+
+from pydantic_gerrit.errors import GerritAPIError
+from pydantic_gerrit.latest.accounts import AccountInfo
+from pydantic_gerrit.latest.groups import GroupInfo
+
+from .client import AsyncGerritClient
+
+K = TypeVar('K')
+T = TypeVar('T')
+
+MAX_TERMS = 100  # identifiers in a query, below the default query limit of Gerrit (500)
+MAX_QUERY_LENGTH = 4000  # URL-encoded, well below the URL length limits of the usual servers
+
+UUID_PATTERN = re.compile(r'[0-9a-f]{40}')
+
+
+def plan_queries(terms: Iterable[str], *, max_terms: int = MAX_TERMS, max_length: int = MAX_QUERY_LENGTH) -> list[str]:
+    """OR the query terms together, in as few queries as possible within the limits."""
+    queries: list[str] = []
+    chunk: list[str] = []
+    length = 0
+    separator = len(quote(' OR '))
+    for term in terms:
+        term_length = len(quote(term, safe=''))
+        if chunk and (len(chunk) == max_terms or length + separator + term_length > max_length):
+            queries.append(' OR '.join(chunk))
+            chunk, length = [], 0
+        length += term_length + (separator if chunk else 0)
+        chunk.append(term)
+    if chunk:
+        queries.append(' OR '.join(chunk))
+    return queries
+
+
+def group_term(group_id: str) -> str | None:
+    """The query term matching exactly this group UUID or name. None if there is none."""
+    if UUID_PATTERN.fullmatch(group_id):
+        return f'uuid:{group_id}'
+    if group_id.isdigit():  # legacy numeric ID, or a numeric name: can't tell
+        return None
+    # Gerrit query values can be in double quotes or in braces, with no escaping
+    if '"' not in group_id:
+        return f'name:"{group_id}"'
+    if '}' not in group_id:
+        return f'name:{{{group_id}}}'
+    return None
+
+
+async def get_groups(
+    client: AsyncGerritClient,
+    group_ids: Iterable[str],
+    *,
+    detail: bool = False,
+    max_terms: int = MAX_TERMS,
+    max_length: int = MAX_QUERY_LENGTH,
+) -> dict[str, GroupInfo]:
+    """
+    The groups by the given names or UUIDs, like get_group() or, with detail, get_group_detail()
+    (with the direct members and subgroups).
+    """
+    pending = dict.fromkeys(group_ids)
+    terms = [term for x in pending if (term := group_term(x))]
+    options = ['MEMBERS', 'INCLUDES'] if detail else []
+    pages = await asyncio.gather(
+        *(
+            client.query_groups(query, options=options, limit=query.count(' OR ') + 1)
+            for query in plan_queries(terms, max_terms=max_terms, max_length=max_length)
+        )
+    )
+
+    found: dict[str, GroupInfo] = {}
+    for page in pages:
+        for group in page:
+            if group.more_groups is not None:
+                continue  # truncated page: the flag is not in the per-item result, fetch it again
+            for key in (group.id, group.name):
+                if key in pending:
+                    found[key] = group
+
+    async def get_group(group_id: str) -> GroupInfo | None:
+        fetch = client.get_group_detail if detail else client.get_group
+        return await _none_if_not_found(fetch(group_id))
+
+    return await _complete(pending, found, get_group)
+
+
+async def get_accounts(
+    client: AsyncGerritClient,
+    account_ids: Iterable[int | str],
+    *,
+    max_terms: int = MAX_TERMS,
+    max_length: int = MAX_QUERY_LENGTH,
+) -> dict[int | str, AccountInfo]:
+    """The accounts by the given IDs (numeric IDs, or anything accepted by get_account()), like get_account()."""
+    pending = dict.fromkeys(account_ids)
+    terms = [str(x) for x in pending if str(x).isdigit()]
+    pages = await asyncio.gather(
+        *(
+            client.query_accounts(query, options=['DETAILS'], limit=query.count(' OR ') + 1)
+            for query in plan_queries(terms, max_terms=max_terms, max_length=max_length)
+        )
+    )
+
+    found: dict[int | str, AccountInfo] = {}
+    for page in pages:
+        for account in page:
+            if account.more_accounts is not None:
+                continue  # truncated page: the flag is not in the per-item result, fetch it again
+            for key in (account.account_id, str(account.account_id)):
+                if key in pending:
+                    found[key] = account
+
+    async def get_account(account_id: int | str) -> AccountInfo | None:
+        return await _none_if_not_found(client.get_account(account_id))
+
+    return await _complete(pending, found, get_account)
+
+
+async def _none_if_not_found(coroutine: Awaitable[T]) -> T | None:
+    try:
+        return await coroutine
+    except GerritAPIError as error:
+        if error.status == 404:  # noqa: PLR2004
+            return None
+        raise
+
+
+async def _complete(pending: dict[K, None], found: dict[K, T], fetch: Callable[[K], Awaitable[T | None]]) -> dict[K, T]:
+    """Fetch the missing items one by one, returning all of them in the order of the identifiers."""
+    missing = [x for x in pending if x not in found]
+    fetched = await asyncio.gather(*(fetch(x) for x in missing))
+    found.update({key: item for key, item in zip(missing, fetched, strict=True) if item is not None})
+    return {x: found[x] for x in pending if x in found}
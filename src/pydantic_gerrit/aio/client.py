@@ -0,0 +1,278 @@
+import asyncio
+import random
+from base64 import b64encode
+from collections.abc import Iterable
+from types import TracebackType
+from typing import TypeVar
+from urllib.parse import quote, urlencode, urlsplit
+
+from pydantic import BaseModel
+
+from pydantic_gerrit.cache import ResponseCache
+from pydantic_gerrit.errors import GerritAPIError
+from pydantic_gerrit.latest.accounts import AccountInfo
+from pydantic_gerrit.latest.groups import (
+    GroupAuditEventInfo,
+    GroupInfo,
+    GroupInput,
+    GroupOptionsInfo,
+    GroupOptionsInput,
+    GroupsInput,
+    MembersInput,
+)
+from pydantic_gerrit.parsing import parse_response
+
+from ._http import Connection, ConnectionPool, Response
+
+T = TypeVar('T')
+
+# Responses worth retrying: the server did not process the request, but may do it later
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class AsyncGerritClient:
+    """
+    asyncio client for the Gerrit REST API, returning the pydantic_gerrit models.
+
+    Use it as an async context manager, so the connections are closed at the end:
+
+        async with AsyncGerritClient('https://gerrit.example.com/a', auth=('user', 'password')) as client:
+            groups = await asyncio.gather(*(client.get_group(x) for x in group_ids))
+
+    The connections are kept alive and reused between requests. At most `max_concurrency` requests
+    are in flight at any time, the others wait for their turn.
+
+    Failed requests (connection errors, timeouts and HTTP 429, 502, 503 and 504) are retried up
+    to `retries` times, waiting an exponential backoff with jitter between the attempts. Note that
+    all the wrapped endpoints are idempotent, except create_group(): when retried after the group
+    was actually created, it fails with HTTP 409.
+
+    With a `cache` (see pydantic_gerrit.cache), the GET responses are reused. Any other
+    request to `groups/...` invalidates all the cached groups responses, since a group can be
+    referenced by name, UUID or number, and is listed in the subgroups of other groups.
+    Likewise for `accounts/...`.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        url: str,
+        *,
+        auth: tuple[str, str] | None = None,
+        max_concurrency: int = 10,
+        timeout: float = 30.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 10.0,
+        cache: ResponseCache | None = None,
+    ) -> None:
+        """
+        The `url` is the REST API root, including the `/a` prefix for authenticated access.
+        The `auth` is the username and HTTP password, sent using HTTP basic authentication.
+        The `timeout` is in seconds, for each attempt of a request.
+        """
+        if max_concurrency < 1:
+            msg = f'max_concurrency must be positive, got {max_concurrency}'
+            raise ValueError(msg)
+
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.cache = cache
+
+        self._path = urlsplit(self.url).path
+        self._pool = ConnectionPool(self.url)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._headers = {'Host': self._pool.host_header, 'Accept': 'application/json'}
+        if auth:
+            credentials = b64encode(':'.join(auth).encode()).decode()
+            self._headers['Authorization'] = f'Basic {credentials}'
+
+    async def __aenter__(self) -> 'AsyncGerritClient':
+        return self
+
+    async def __aexit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self._pool.close()
+
+    # Transport
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        params: Iterable[tuple[str, str]] = (),
+        data: BaseModel | None = None,
+    ) -> bytes:
+        """
+        Call an endpoint (relative to the REST API root, e.g. `groups/`), returning the raw response body.
+
+        Raises GerritAPIError if the response status is not successful.
+        """
+        target = f'{self._path}/{endpoint}'
+        if query := urlencode(list(params)):
+            target = f'{target}?{query}'
+        headers = dict(self._headers)
+        body = b''
+        if data is not None:
+            body = data.model_dump_json().encode()
+            headers['Content-Type'] = 'application/json; charset=UTF-8'
+        headers['Content-Length'] = str(len(body))
+
+        try:
+            return await self._request(method, target, headers, body)
+        finally:
+            if self.cache is not None and method != 'GET':
+                # Even on errors: the change may have been made, e.g. on a timeout
+                self.cache.invalidate(endpoint.partition('/')[0] + '/')
+
+    async def _request(self, method: str, target: str, headers: dict[str, str], body: bytes) -> bytes:
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            try:
+                # Only while sending: the requests waiting to be retried let the others go first
+                async with self._semaphore:
+                    response = await self._send(method, target, headers, body)
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                if last_attempt:
+                    raise
+                await asyncio.sleep(self._backoff_delay(attempt))
+                continue
+
+            if response.status in RETRY_STATUSES and not last_attempt:
+                await asyncio.sleep(self._backoff_delay(attempt, response.headers.get('retry-after')))
+                continue
+            if response.status >= 400:  # noqa: PLR2004
+                raise GerritAPIError(response.status, response.body.decode(errors='replace'))
+            return response.body
+
+        msg = 'unreachable'  # the last attempt always returns or raises
+        raise AssertionError(msg)
+
+    async def get(self, endpoint: str, type_: type[T], *, params: Iterable[tuple[str, str]] = ()) -> T:
+        """GET an endpoint, validating the response as the given type. Cached, if the client has a cache."""
+        if self.cache is None:
+            return parse_response(await self.request('GET', endpoint, params=params), type_)
+        params = list(params)
+        key = self.cache.key(endpoint, params)
+        content = self.cache.get(key)
+        if content is None:
+            generation = self.cache.generation(key)
+            content = await self.request('GET', endpoint, params=params)
+            # Unless invalidated meanwhile: the response may predate a change made during the request
+            if self.cache.generation(key) == generation:
+                self.cache.set(key, content)
+        return parse_response(content, type_)
+
+    async def _send(self, method: str, target: str, headers: dict[str, str], body: bytes) -> Response:
+        """One attempt, within the timeout: getting a connection from the pool, and the request."""
+        return await asyncio.wait_for(self._attempt(method, target, headers, body), self.timeout)
+
+    async def _attempt(self, method: str, target: str, headers: dict[str, str], body: bytes) -> Response:
+        connection: Connection | None = None
+        try:
+            connection = await self._pool.acquire()
+            response = await connection.request(method, target, headers, body)
+        except BaseException:
+            # Including the cancellation on timeout: the connection is left in an unknown state
+            if connection is not None:
+                connection.close()
+            raise
+        self._pool.release(connection)
+        return response
+
+    def _backoff_delay(self, attempt: int, retry_after: str | None = None) -> float:
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.backoff * 2**attempt, self.max_backoff))  # noqa: S311
+
+    # Groups
+    # https://gerrit-review.googlesource.com/Documentation/rest-api-groups.html
+
+    async def query_groups(
+        self, query: str, *, options: Iterable[str] = (), limit: int | None = None, start: int | None = None
+    ) -> list[GroupInfo]:
+        """The options are the extra group options, e.g. `MEMBERS` and `INCLUDES`."""
+        params = [('query', query), *_list_params(options, limit, start)]
+        return await self.get('groups/', list[GroupInfo], params=params)
+
+    async def list_groups(
+        self, *, options: Iterable[str] = (), limit: int | None = None, start: int | None = None
+    ) -> dict[str, GroupInfo]:
+        """The groups by name. The options are the extra group options, e.g. `MEMBERS` and `INCLUDES`."""
+        return await self.get('groups/', dict[str, GroupInfo], params=_list_params(options, limit, start))
+
+    async def get_group(self, group_id: str) -> GroupInfo:
+        return await self.get(f'groups/{_quote(group_id)}', GroupInfo)
+
+    async def get_group_detail(self, group_id: str) -> GroupInfo:
+        """The group, including its direct members and subgroups."""
+        return await self.get(f'groups/{_quote(group_id)}/detail', GroupInfo)
+
+    async def create_group(self, name: str, input_: GroupInput | None = None) -> GroupInfo:
+        content = await self.request('PUT', f'groups/{_quote(name)}', data=input_ or GroupInput())
+        return parse_response(content, GroupInfo)
+
+    async def list_members(self, group_id: str, *, recursive: bool = False) -> list[AccountInfo]:
+        params = [('recursive', '')] if recursive else []
+        return await self.get(f'groups/{_quote(group_id)}/members/', list[AccountInfo], params=params)
+
+    async def add_members(self, group_id: str, input_: MembersInput) -> list[AccountInfo]:
+        content = await self.request('POST', f'groups/{_quote(group_id)}/members', data=input_)
+        return parse_response(content, list[AccountInfo])
+
+    async def remove_members(self, group_id: str, input_: MembersInput) -> None:
+        await self.request('POST', f'groups/{_quote(group_id)}/members.delete', data=input_)
+
+    async def list_subgroups(self, group_id: str) -> list[GroupInfo]:
+        return await self.get(f'groups/{_quote(group_id)}/groups/', list[GroupInfo])
+
+    async def add_subgroups(self, group_id: str, input_: GroupsInput) -> list[GroupInfo]:
+        content = await self.request('POST', f'groups/{_quote(group_id)}/groups', data=input_)
+        return parse_response(content, list[GroupInfo])
+
+    async def remove_subgroups(self, group_id: str, input_: GroupsInput) -> None:
+        await self.request('POST', f'groups/{_quote(group_id)}/groups.delete', data=input_)
+
+    async def get_group_options(self, group_id: str) -> GroupOptionsInfo:
+        return await self.get(f'groups/{_quote(group_id)}/options', GroupOptionsInfo)
+
+    async def set_group_options(self, group_id: str, input_: GroupOptionsInput) -> GroupOptionsInfo:
+        content = await self.request('PUT', f'groups/{_quote(group_id)}/options', data=input_)
+        return parse_response(content, GroupOptionsInfo)
+
+    async def get_audit_log(self, group_id: str) -> list[GroupAuditEventInfo]:
+        return await self.get(f'groups/{_quote(group_id)}/log.audit', list[GroupAuditEventInfo])
+
+    # Accounts
+    # https://gerrit-review.googlesource.com/Documentation/rest-api-accounts.html
+
+    async def get_account(self, account_id: str | int) -> AccountInfo:
+        return await self.get(f'accounts/{_quote(str(account_id))}', AccountInfo)
+
+    async def query_accounts(
+        self, query: str, *, options: Iterable[str] = (), limit: int | None = None, start: int | None = None
+    ) -> list[AccountInfo]:
+        """The options are the extra account options, e.g. `DETAILS` and `ALL_EMAILS`."""
+        params = [('q', query), *_list_params(options, limit, start)]
+        return await self.get('accounts/', list[AccountInfo], params=params)
+
+
+def _quote(id_: str) -> str:
+    """IDs and names are URL encoded in the endpoint path."""
+    return quote(id_, safe='')
+
+
+def _list_params(options: Iterable[str], limit: int | None, start: int | None) -> list[tuple[str, str]]:
+    params = [('o', option) for option in options]
+    if limit is not None:
+        params.append(('n', str(limit)))
+    if start is not None:
+        params.append(('S', str(start)))
+    return params
@@ -0,0 +1,102 @@
+"""
+Make the direct members and subgroups of many groups match a desired state, with the fewest calls.
+
+    desired = {
+        'Developers': DesiredMembership(members={1000000, 1000001}),
+        'Reviewers': DesiredMembership(members={1000002}, subgroups={developers_uuid}),
+    }
+    async with AsyncGerritClient(url) as client:
+        for group_id, diff in (await reconcile(client, desired)).items():
+            print(group_id, diff)
+
+The current state of all the groups is fetched with batched queries (see pydantic_gerrit.aio.batch).
+Then, for each group, only the differences are sent: the members to add in one `members` call and
+the members to remove in one `members.delete` call (likewise for the subgroups), split into chunks
+of at most `chunk_size` IDs. The calls of all the groups run concurrently, within the concurrency
+limit of the client.
+
+If a call fails, its exception is raised, but the other calls may have been made already. The
+calls only add or remove the differences, so running the reconciliation again completes it.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Collection, Mapping
+from dataclasses import dataclass
+
+from pydantic_gerrit.latest.groups import GroupInfo, GroupsInput, MembersInput
+from pydantic_gerrit.sync import MembershipDiff
+
+from .batch import get_groups
+from .client import AsyncGerritClient
+
+CHUNK_SIZE = 100
+
+
+@dataclass(frozen=True)
+class DesiredMembership:
+    """The desired direct members (account IDs) and subgroups (group UUIDs) of a group. None keeps the current ones."""
+
+    members: Collection[int] | None = None
+    subgroups: Collection[str] | None = None
+
+
+def membership_diff(group: GroupInfo, desired: DesiredMembership) -> MembershipDiff:
+    """The changes to make the group (with its members and includes) match the desired state."""
+    members = {x.account_id for x in group.members or []}
+    subgroups = {x.id for x in group.includes or []}
+    desired_members = members if desired.members is None else set(desired.members)
+    desired_subgroups = subgroups if desired.subgroups is None else set(desired.subgroups)
+    return MembershipDiff(
+        group.id,
+        added_members=frozenset(desired_members - members),
+        removed_members=frozenset(members - desired_members),
+        added_subgroups=frozenset(desired_subgroups - subgroups),
+        removed_subgroups=frozenset(subgroups - desired_subgroups),
+    )
+
+
+async def reconcile(
+    client: AsyncGerritClient,
+    desired: Mapping[str, DesiredMembership],
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    dry_run: bool = False,
+) -> dict[str, MembershipDiff]:
+    """
+    Reconcile the groups (by name or UUID) with their desired state, returning what changed in each.
+
+    With dry_run, nothing is changed: only the changes that would be made are returned.
+    Raises ValueError, before changing anything, if any of the groups does not exist.
+    """
+    if chunk_size < 1:
+        msg = f'chunk_size must be positive, got {chunk_size}'
+        raise ValueError(msg)
+    groups = await get_groups(client, desired, detail=True)
+    missing = [x for x in desired if x not in groups]
+    if missing:
+        msg = f'Groups not found: {", ".join(missing)}'
+        raise ValueError(msg)
+
+    diffs = {group_id: membership_diff(groups[group_id], state) for group_id, state in desired.items()}
+    if not dry_run:
+        await asyncio.gather(*(call for diff in diffs.values() for call in _calls(client, diff, chunk_size)))
+    return diffs
+
+
+def _calls(client: AsyncGerritClient, diff: MembershipDiff, chunk_size: int) -> list[Awaitable[object]]:
+    group_id = diff.group_id
+    return [
+        *(client.add_members(group_id, MembersInput(members=x)) for x in _chunks(diff.added_members, chunk_size)),
+        *(client.remove_members(group_id, MembersInput(members=x)) for x in _chunks(diff.removed_members, chunk_size)),
+        *(client.add_subgroups(group_id, GroupsInput(groups=x)) for x in _chunks(diff.added_subgroups, chunk_size)),
+        *(
+            client.remove_subgroups(group_id, GroupsInput(groups=x))
+            for x in _chunks(diff.removed_subgroups, chunk_size)
+        ),
+    ]
+
+
+def _chunks(ids: Collection[int | str], size: int) -> list[list[str]]:
+    """The IDs as strings, sorted (for reproducible requests), in lists of at most `size`."""
+    ordered = [str(x) for x in sorted(ids)]
+    return [ordered[i : i + size] for i in range(0, len(ordered), size)]
@@ -0,0 +1,135 @@
+"""
+A cache of responses, so repeated requests skip the HTTP round trip.
+
+    cache = ResponseCache(ttl=300, max_entries=10_000, path='gerrit-cache.sqlite')
+    async with AsyncGerritClient(url, cache=cache) as client:
+        group = await client.get_group(group_id)  # only the first call hits the server
+
+The entries are the raw response bodies (JSON bytes), keyed by the endpoint and the query
+parameters. They expire after `ttl` seconds, and only the `max_entries` most recently used are kept.
+
+The cache skips the requests, not the validation: the client validates the cached body on each
+use, so every caller gets its own models, which it can modify. Copying validated models instead
+(`copy.deepcopy()`, `model_copy(deep=True)`) was measured to be slower than validating the JSON
+again, and the bodies are smaller than the models.
+
+With a `path`, the entries are also stored in a SQLite database, so the next runs (warm starts)
+reuse them, without any request, but they are validated again too. The database keeps the
+`max_entries` that expire last.
+
+Each key prefix (like `groups/`) has a generation, increased by invalidate(). A response requested
+before an invalidation may predate the change, so the client does not cache it if the generation
+changed meanwhile.
+"""
+
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from urllib.parse import urlencode
+
+
+class ResponseCache:
+    """Response bodies, with TTL and LRU eviction, optionally persisted to a SQLite file."""
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 300.0,
+        max_entries: int = 1024,
+        path: str | os.PathLike[str] | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        The `ttl` is in seconds. The `clock` returns the current time in seconds, and must be
+        the wall-clock time when using a `path`, since the expiration times are stored there.
+        """
+        if max_entries < 1:
+            msg = f'max_entries must be positive, got {max_entries}'
+            raise ValueError(msg)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()  # key -> (expiration, content)
+        self._generations: dict[str, int] = {}  # key prefix -> number of invalidations
+        self._db: sqlite3.Connection | None = None
+        if path is not None:
+            self._db = sqlite3.connect(path)
+            with self._db:
+                self._db.execute(
+                    'CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, expires REAL, value BLOB)'
+                )
+                self._db.execute('CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires)')
+                self._db.execute('DELETE FROM responses WHERE expires <= ?', (self.clock(),))
+
+    def __len__(self) -> int:
+        """The number of entries in memory."""
+        return len(self._entries)
+
+    def close(self) -> None:
+        """Close the database, if any. The entries in memory are kept."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    @staticmethod
+    def key(endpoint: str, params: Iterable[tuple[str, str]]) -> str:
+        """The key of a response: `groups/?o=MEMBERS`."""
+        return f'{endpoint}?{urlencode(list(params))}'
+
+    def get(self, key: str) -> bytes | None:
+        """The cached content, or None if there is none or it has expired. The expired entries are removed."""
+        now = self.clock()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= now:
+            del self._entries[key]
+            entry = None
+        if entry is None and self._db is not None:
+            row = self._db.execute('SELECT expires, value FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is not None and row[0] > now:
+                entry = (row[0], bytes(row[1]))
+                self._remember(key, entry)
+            elif row is not None:
+                with self._db:
+                    self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, content: bytes) -> None:
+        entry = (self.clock() + self.ttl, content)
+        self._remember(key, entry)
+        if self._db is not None:
+            with self._db:
+                self._db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?)', (key, *entry))
+                # Keep the max_entries that expire last (nothing to delete when there are fewer)
+                self._db.execute(
+                    'DELETE FROM responses WHERE expires <= '
+                    '(SELECT expires FROM responses ORDER BY expires DESC LIMIT 1 OFFSET ?)',
+                    (self.max_entries,),
+                )
+
+    def generation(self, key: str) -> int:
+        """Increases every time the key is invalidated, see invalidate()."""
+        return sum(count for prefix, count in self._generations.items() if key.startswith(prefix))
+
+    def invalidate(self, prefix: str = '') -> None:
+        """Remove the entries whose key starts with the prefix, like `groups/`. All of them by default."""
+        self._generations[prefix] = self._generations.get(prefix, 0) + 1
+        for key in [x for x in self._entries if x.startswith(prefix)]:
+            del self._entries[key]
+        if self._db is not None:
+            with self._db:
+                self._db.execute('DELETE FROM responses WHERE substr(key, 1, ?) = ?', (len(prefix), prefix))
+
+    def _remember(self, key: str, entry: tuple[float, bytes]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
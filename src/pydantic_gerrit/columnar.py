@@ -0,0 +1,170 @@
+"""
+Column-oriented tables of groups, accounts and audit events, for analytics over large responses.
+
+A table is a dict of columns, all of the same length: `array('q')` for the integers (IDs, dates) and
+lists for the rest (strings, booleans). The nested members and includes of the groups, and the
+members of the audit events (accounts or groups), are flattened into separate columns or edge tables.
+
+The tables are built from validated models, or from the raw JSON of a response (the `*_json`
+functions) without creating any model instance. The raw JSON is only parsed, not validated, so it
+must come from a trusted server.
+
+    table = audit_event_table_json(content)  # groups/<id>/log.audit
+    per_user_per_day = Counter(zip(table['user_id'], [x // NANOSECONDS_PER_DAY for x in table['date']]))
+
+The dates are nanoseconds since the Unix epoch (UTC), keeping all the precision of the Gerrit
+timestamps. Missing integers (like the date of a group with no `created_on`) are MISSING (-1).
+"""
+
+from array import array
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
+
+from pydantic_core import from_json
+
+from pydantic_gerrit.parsing import response_json
+from pydantic_gerrit.timestamps import Timestamp, parse_timestamp
+
+if TYPE_CHECKING:
+    from pydantic_gerrit.latest.accounts import AccountInfo
+    from pydantic_gerrit.latest.groups import GroupAuditEventInfo, GroupInfo
+
+Table = dict[str, Any]  # column name -> array('q') or list
+
+MISSING = -1
+NANOSECONDS_PER_DAY = 86_400 * 10**9
+
+_EPOCH = datetime(1970, 1, 1)  # noqa: DTZ001, the timestamps are naive UTC datetimes
+_ALIASES = {'account_id': '_account_id'}  # the JSON keys that differ from the field names
+_ACCOUNT_COLUMNS = ('name', 'display_name', 'email', 'username', 'status', 'inactive')
+_GROUP_COLUMNS = ('name', 'description', 'owner', 'owner_id')
+
+Getter = Callable[[Any, str], Any]
+
+
+@dataclass
+class GroupTables:
+    """The groups, and the edges to their direct members and subgroups."""
+
+    groups: Table  # id, name, group_id, description, owner, owner_id, created_on, visible_to_all
+    members: Table  # group_id (UUID), account_id
+    includes: Table  # group_id (UUID), subgroup_id (UUID)
+    accounts: Table  # the members of all the groups, once each, see account_table()
+
+
+def group_tables(groups: 'Mapping[str, GroupInfo] | Iterable[GroupInfo]') -> GroupTables:
+    """The tables of the groups, as a list or as a map by name (like the groups/ response)."""
+    return _group_tables(groups, getattr)
+
+
+def group_tables_json(content: bytes | bytearray | memoryview) -> GroupTables:
+    """The tables of the groups in the raw JSON of a groups/ response (a map by name, or a list)."""
+    return _group_tables(_parse(content), _get_key)
+
+
+def account_table(accounts: 'Iterable[AccountInfo]') -> Table:
+    """The columns: account_id, name, display_name, email, username, status, inactive."""
+    return _account_table(accounts, getattr)
+
+
+def account_table_json(content: bytes | bytearray | memoryview) -> Table:
+    """The account table of the raw JSON of an accounts/ response (a list)."""
+    return _account_table(_parse(content), _get_key)
+
+
+def audit_event_table(events: 'Iterable[GroupAuditEventInfo]', group_id: str | None = None) -> Table:
+    """
+    The columns: date, type, user_id, and the member, either member_account_id (MISSING for the
+    group events) or member_group_id (None for the account events).
+
+    With a group_id, there's also a group_id column with it, to concatenate the tables of
+    different groups.
+    """
+    return _audit_event_table(events, getattr, group_id)
+
+
+def audit_event_table_json(content: bytes | bytearray | memoryview, group_id: str | None = None) -> Table:
+    """The audit event table of the raw JSON of a log.audit response."""
+    return _audit_event_table(_parse(content), _get_key, group_id)
+
+
+def nanoseconds(value: datetime | str | None) -> int:
+    """
+    A date (a Gerrit timestamp string, a Timestamp or a datetime) as nanoseconds since the epoch.
+
+    The naive datetimes are in UTC, like the Gerrit timestamps. The aware ones are converted to UTC.
+    """
+    if value is None:
+        return MISSING
+    if isinstance(value, str):
+        value = parse_timestamp(value)
+    extra = value.nanosecond if isinstance(value, Timestamp) else 0
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // timedelta(microseconds=1) * 1000 + extra
+
+
+def _parse(content: bytes | bytearray | memoryview) -> Any:  # noqa: ANN401
+    return from_json(response_json(content))
+
+
+def _get_key(data: Mapping[str, Any], name: str) -> Any:  # noqa: ANN401
+    return data.get(_ALIASES.get(name, name))
+
+
+def _group_tables(groups: Any, get: Getter) -> GroupTables:  # noqa: ANN401
+    items = groups.items() if isinstance(groups, Mapping) else ((None, x) for x in groups)
+    table: Table = {'id': [], 'group_id': array('q'), **{x: [] for x in _GROUP_COLUMNS}}
+    table |= {'created_on': array('q'), 'visible_to_all': []}
+    members: Table = {'group_id': [], 'account_id': array('q')}
+    includes: Table = {'group_id': [], 'subgroup_id': []}
+    accounts: dict[int, Any] = {}
+    for key, group in items:
+        uuid = get(group, 'id')
+        table['id'].append(uuid)
+        for column in _GROUP_COLUMNS:
+            table[column].append(get(group, column))
+        if table['name'][-1] is None:
+            table['name'][-1] = key
+        group_id = get(group, 'group_id')
+        table['group_id'].append(MISSING if group_id is None else group_id)
+        table['created_on'].append(nanoseconds(get(group, 'created_on')))
+        options = get(group, 'options')
+        table['visible_to_all'].append(bool(options and get(options, 'visible_to_all')))
+        for account in get(group, 'members') or []:
+            account_id = get(account, 'account_id')
+            members['group_id'].append(uuid)
+            members['account_id'].append(account_id)
+            accounts.setdefault(account_id, account)
+        for subgroup in get(group, 'includes') or []:
+            includes['group_id'].append(uuid)
+            includes['subgroup_id'].append(get(subgroup, 'id'))
+    return GroupTables(table, members, includes, _account_table(accounts.values(), get))
+
+
+def _account_table(accounts: Iterable[Any], get: Getter) -> Table:
+    table: Table = {'account_id': array('q'), **{x: [] for x in _ACCOUNT_COLUMNS}}
+    for account in accounts:
+        table['account_id'].append(get(account, 'account_id'))
+        for column in _ACCOUNT_COLUMNS:
+            table[column].append(get(account, column))
+    return table
+
+
+def _audit_event_table(events: Iterable[Any], get: Getter, group_id: str | None) -> Table:
+    table: Table = {'date': array('q'), 'type': [], 'user_id': array('q')}
+    table |= {'member_account_id': array('q'), 'member_group_id': []}
+    for event in events:
+        event_type = get(event, 'type')
+        member = get(event, 'member')
+        is_account = event_type in {'ADD_USER', 'REMOVE_USER'}
+        table['date'].append(nanoseconds(get(event, 'date')))
+        table['type'].append(event_type)
+        table['user_id'].append(get(get(event, 'user'), 'account_id'))
+        table['member_account_id'].append(get(member, 'account_id') if is_account else MISSING)
+        table['member_group_id'].append(None if is_account else get(member, 'id'))
+    if group_id is not None:
+        table['group_id'] = [group_id] * len(table['type'])
+    return table
@@ -0,0 +1,235 @@
+"""
+Compact read-only representations of accounts and groups, for keeping lots of them in memory.
+
+A pydantic model instance carries a `__dict__`, the set of its explicitly set fields and the
+private attributes, in addition to the values themselves. These are frozen dataclasses with
+`__slots__` instead, holding only the values, with tuples instead of lists:
+
+    accounts = {x.account_id: CompactAccount.from_model(x) for x in parse_response(content, list[AccountInfo])}
+    model = accounts[1000000].to_model()  # an AccountInfo again, not validated again
+
+They are equal, and hash, by their identity only: `account_id` for the accounts and `id` for the
+groups. So they can be put in sets or used as dict keys, but adding a changed account to a set (or
+as a dict key) where it already is keeps the old one: discard the old one first.
+
+The values come from validated models, so to_model() builds the models without validating them
+again, like `model_construct()` (but faster). to_data() returns the values as in the JSON. A
+conversion still creates a model for every nested account and avatar, which is most of its cost.
+
+The `_more_accounts` and `_more_groups` flags are not kept, since they are about the query that
+returned the models, not about the models themselves. See benchmarks/bench_compact.py for the
+memory saved.
+"""
+
+from collections.abc import Iterable, MutableMapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+from pydantic_gerrit.latest.accounts import AccountInfo, AvatarInfo
+from pydantic_gerrit.latest.groups import GroupInfo, GroupOptionsInfo
+
+T = TypeVar('T')
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+# The JSON keys that differ from the field names, like `_account_id`
+_ALIASES = {name: x.alias for model in (AccountInfo, GroupInfo) for name, x in model.model_fields.items() if x.alias}
+
+
+@dataclass(frozen=True, slots=True)
+class CompactAvatar:
+    """An AvatarInfo."""
+
+    url: str
+    height: int
+
+    @classmethod
+    def from_model(cls, avatar: AvatarInfo) -> 'CompactAvatar':
+        return cls(avatar.url, avatar.height)
+
+    def to_model(self) -> AvatarInfo:
+        return _construct(AvatarInfo, {'url': self.url, 'height': self.height})
+
+    def to_data(self) -> dict[str, Any]:
+        return {'url': self.url, 'height': self.height}
+
+
+@dataclass(frozen=True, slots=True)
+class CompactAccount:
+    """An AccountInfo, identified by its account_id."""
+
+    account_id: int
+    name: str | None = field(default=None, compare=False)
+    display_name: str | None = field(default=None, compare=False)
+    email: str | None = field(default=None, compare=False)
+    secondary_emails: tuple[str, ...] | None = field(default=None, compare=False)
+    username: str | None = field(default=None, compare=False)
+    avatars: tuple[CompactAvatar, ...] | None = field(default=None, compare=False)
+    status: str | None = field(default=None, compare=False)
+    inactive: bool | None = field(default=None, compare=False)
+    tags: tuple[str, ...] | None = field(default=None, compare=False)
+
+    @classmethod
+    def from_model(cls, account: AccountInfo) -> 'CompactAccount':
+        avatars = account.avatars
+        return cls(
+            account.account_id,
+            account.name,
+            account.display_name,
+            account.email,
+            _tuple(account.secondary_emails),
+            account.username,
+            None if avatars is None else tuple([CompactAvatar.from_model(x) for x in avatars]),
+            account.status,
+            account.inactive,
+            _tuple(account.tags),
+        )
+
+    def to_model(self) -> AccountInfo:
+        values = _values(self)
+        if self.avatars is not None:
+            values['avatars'] = [x.to_model() for x in self.avatars]
+        return _construct(AccountInfo, values)
+
+    def to_data(self) -> dict[str, Any]:
+        """The values of the account, by field alias, for validating an AccountInfo."""
+        data = _data(self)
+        if self.avatars is not None:
+            data['avatars'] = [x.to_data() for x in self.avatars]
+        return data
+
+
+@dataclass(frozen=True, slots=True)
+class CompactGroupOptions:
+    """A GroupOptionsInfo. There are only three, shared by all the groups."""
+
+    visible_to_all: bool | None = None
+
+    @classmethod
+    def from_model(cls, options: GroupOptionsInfo) -> 'CompactGroupOptions':
+        return _GROUP_OPTIONS[options.visible_to_all]
+
+    def to_model(self) -> GroupOptionsInfo:
+        return _construct(GroupOptionsInfo, _values(self))
+
+    def to_data(self) -> dict[str, Any]:
+        return _data(self)
+
+
+_GROUP_OPTIONS = {x: CompactGroupOptions(x) for x in (None, False, True)}
+
+
+@dataclass(frozen=True, slots=True)
+class CompactGroup:
+    """A GroupInfo, identified by its id (the group UUID)."""
+
+    id: str
+    options: CompactGroupOptions = field(default=_GROUP_OPTIONS[None], compare=False)
+    name: str | None = field(default=None, compare=False)
+    url: str | None = field(default=None, compare=False)
+    description: str | None = field(default=None, compare=False)
+    group_id: int | None = field(default=None, compare=False)
+    owner: str | None = field(default=None, compare=False)
+    owner_id: str | None = field(default=None, compare=False)
+    created_on: datetime | None = field(default=None, compare=False)  # or a Timestamp, kept as is
+    members: tuple[CompactAccount, ...] | None = field(default=None, compare=False)
+    includes: tuple['CompactGroup', ...] | None = field(default=None, compare=False)
+
+    @classmethod
+    def from_model(
+        cls, group: GroupInfo, accounts: MutableMapping[int, CompactAccount] | None = None
+    ) -> 'CompactGroup':
+        """
+        The compact group, with its members and subgroups.
+
+        With accounts (a dict by account_id), the members are shared with the accounts already
+        there, and the new ones are added to it. So each account is in memory only once, even when
+        it's a member of many groups, assuming all its occurrences are the same.
+        """
+        members = group.members
+        includes = group.includes
+        return cls(
+            group.id,
+            CompactGroupOptions.from_model(group.options),
+            group.name,
+            group.url,
+            group.description,
+            group.group_id,
+            group.owner,
+            group.owner_id,
+            group.created_on,
+            None if members is None else tuple([_compact_account(x, accounts) for x in members]),
+            None if includes is None else tuple([cls.from_model(x, accounts) for x in includes]),
+        )
+
+    def to_model(self) -> GroupInfo:
+        values = _values(self)
+        values['options'] = self.options.to_model()
+        if self.members is not None:
+            values['members'] = [x.to_model() for x in self.members]
+        if self.includes is not None:
+            values['includes'] = [x.to_model() for x in self.includes]
+        return _construct(GroupInfo, values)
+
+    def to_data(self) -> dict[str, Any]:
+        """The values of the group, by field alias, for validating a GroupInfo."""
+        data = _data(self)
+        data['options'] = self.options.to_data()
+        if self.members is not None:
+            data['members'] = [x.to_data() for x in self.members]
+        if self.includes is not None:
+            data['includes'] = [x.to_data() for x in self.includes]
+        return data
+
+
+def _compact_account(account: AccountInfo, accounts: MutableMapping[int, CompactAccount] | None) -> CompactAccount:
+    if accounts is None:
+        return CompactAccount.from_model(account)
+    compact = accounts.get(account.account_id)
+    if compact is None:
+        compact = accounts[account.account_id] = CompactAccount.from_model(account)
+    return compact
+
+
+def _tuple(values: Iterable[T] | None) -> tuple[T, ...] | None:
+    return None if values is None else tuple(values)
+
+
+_setattr = object.__setattr__  # the models may be frozen
+
+# The default values of the fields of the models, all immutable (None)
+_DEFAULTS: dict[type[BaseModel], dict[str, Any]] = {
+    model: {name: x.default for name, x in model.model_fields.items() if not x.is_required()}
+    for model in (AvatarInfo, AccountInfo, GroupOptionsInfo, GroupInfo)
+}
+
+
+def _construct(model: type[ModelT], values: dict[str, Any]) -> ModelT:
+    """
+    Like `model.model_construct(**values)`, with the values by field name, but without its generic
+    handling of aliases, default factories, private attributes and post-init hooks, that these
+    models don't have. model_construct() is slower than validating the data again, this is not.
+    """
+    instance = model.__new__(model)
+    _setattr(instance, '__dict__', _DEFAULTS[model] | values)
+    _setattr(instance, '__pydantic_fields_set__', set(values))
+    _setattr(instance, '__pydantic_extra__', None)
+    _setattr(instance, '__pydantic_private__', None)
+    return instance
+
+
+def _values(compact: Any) -> dict[str, Any]:  # noqa: ANN401
+    """The set values of the compact object, by field name (lists instead of tuples)."""
+    values = {}
+    for name in compact.__slots__:
+        value = getattr(compact, name)
+        if value is not None:
+            values[name] = list(value) if isinstance(value, tuple) else value
+    return values
+
+
+def _data(compact: Any) -> dict[str, Any]:  # noqa: ANN401
+    """The set values of the compact object, by their alias (lists instead of tuples)."""
+    return {_ALIASES.get(name, name): value for name, value in _values(compact).items()}
@@ -0,0 +1,11 @@
+class GerritAPIError(RuntimeError):
+    """
+    Custom exception for Gerrit API errors.
+
+    The arguments are the HTTP status code and the response text: GerritAPIError(404, 'Not found')
+    """
+
+    @property
+    def status(self) -> int:
+        status: int = self.args[0]
+        return status
@@ -0,0 +1,281 @@
+"""
+Streaming validation of huge responses and dumps, like the audit logs of all the groups of a site.
+
+The top-level JSON array (or map) is split into its items as it is read, and the items are
+validated in chunks. So only a few chunks are in memory at any time, instead of the
+whole document and all its models:
+
+    with open('groups.json', 'rb') as file:  # groups/?o=MEMBERS, with or without the )]}' prefix
+        for name, group in ingest(file, GroupInfo):
+            ...
+
+The chunks can also be validated in a pool of processes, one per core. But sending the models back
+to the main process (pickled) is slower than validating them there in the first place, so each
+process also runs a function on its validated chunk, and only the results of that function are sent
+back, in order. The function should return something small (counts, columnar tables, rows already
+written elsewhere) and it must be picklable, like a module-level function:
+
+    def events_per_user(events: list[GroupAuditEventInfo]) -> Counter[int]:
+        return Counter(x.user.account_id for x in events)
+
+    with open('log.audit.json', 'rb') as file:
+        total = sum(ingest_parallel(file, GroupAuditEventInfo, events_per_user), Counter())
+
+See benchmarks/bench_ingest.py for the numbers.
+"""
+
+import json
+import os
+import re
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import IO, Any, TypeVar
+
+from pydantic_gerrit import telemetry
+from pydantic_gerrit.parsing import GERRIT_RESPONSE_PREFIX, get_type_adapter
+
+R = TypeVar('R')
+
+CHUNK_SIZE = 1000  # items per chunk
+READ_SIZE = 1 << 20
+
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+# Everything up to the next bracket outside of the strings. It stops at the quote of an incomplete string.
+_TO_BRACKET = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*')
+_SCALAR = re.compile(rb'[^,\]}\s]*')
+_LITERAL = re.compile(rb'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|true|false|null')
+_CLOSING = {ord('['): ord(']'), ord('{'): ord('}')}
+_OPENING = b'[{'
+
+# The skeleton of the JSON data: only its quotes and brackets, without the escaped characters
+_NOT_SKELETON = bytes(x for x in range(256) if x not in b'"[]{}')
+_SKELETON_DEPTH = 8
+
+
+def _skeleton_value(depth: int) -> re.Pattern[bytes]:
+    """A regular expression for a value in a skeleton, nested up to `depth` levels."""
+    string = rb'"[^"]*"'  # in the skeleton, only the brackets remain in the strings
+    value = string
+    for _ in range(depth):
+        value = rb'(?:%s|\[%s*\]|\{%s*\})' % (string, value, value)
+    return re.compile(value)
+
+
+_SKELETON_VALUE = _skeleton_value(_SKELETON_DEPTH)
+
+
+def _skeleton(data: bytes) -> bytes:
+    if b'\\' in data:
+        data = data.replace(b'\\\\', b'').replace(b'\\"', b'')
+    return data.translate(None, _NOT_SKELETON)
+
+
+class JsonSplitter:
+    """
+    Split the top-level JSON array or map of a stream into its items, as they are read.
+
+    Each item is a `(key, value)` tuple: the key is None for arrays, and the value is the raw JSON
+    of the item, in bytes. The `container` is `[` or `{`, once known. Raises ValueError for
+    truncated JSON, or invalid JSON between the items. The items themselves are not decoded, only
+    delimited, so an invalid item is only reported when validated.
+
+    The items are delimited without decoding them. Scanning the JSON with regular expressions is
+    about as slow as decoding it, so they are matched in its skeleton instead: the data with only
+    its quotes and brackets, ten times smaller for the Gerrit entities. The end of an item is then
+    found in the data by counting its closing brackets. The items nested deeper than the regular
+    expression, or not read yet, are scanned bracket by bracket.
+    """
+
+    def __init__(self, stream: IO[bytes], *, read_size: int = READ_SIZE) -> None:
+        self.stream = stream
+        self.read_size = read_size
+        self.container: str | None = None
+        self._buffer = b''
+        self._eof = False
+        self._skeleton: bytes | None = None  # of the buffer, from the mark
+        self._mark = (0, 0)  # a position of the buffer and the same position in the skeleton
+
+    def __iter__(self) -> Iterator[tuple[str | None, bytes]]:
+        position = self._read_start()
+        if self._buffer[position : position + 1] not in (b'[', b'{'):
+            msg = 'No JSON array or map in the data'
+            raise ValueError(msg)
+        self.container = chr(self._buffer[position])
+        closing = _CLOSING[self._buffer[position]]
+        position = self._next(position + 1)
+        if self._buffer[position] == closing:
+            return
+
+        while True:
+            if position > self.read_size:
+                # Forget what was already split
+                self._buffer = self._buffer[position:]
+                self._skeleton = None
+                position = 0
+            key = None
+            if self.container == '{':
+                if self._buffer[position] != ord('"'):
+                    msg = f'Invalid JSON: expected a string key at {self._buffer[position : position + 20]!r}'
+                    raise ValueError(msg)
+                end = self._value_end(position)
+                key = json.loads(self._buffer[position:end])
+                position = self._expect(end, b':')
+            end = self._value_end(position)
+            yield key, self._buffer[position:end]
+            position = self._next(end)
+            if self._buffer[position] == closing:
+                return
+            position = self._expect(position, b',')
+
+    def _read_start(self) -> int:
+        """The position of the first character after the prefix and whitespace, or the end of the data."""
+        while len(self._buffer.lstrip()) < len(GERRIT_RESPONSE_PREFIX) and not self._eof:
+            self._read_more()
+        position = len(self._buffer) - len(self._buffer.lstrip())
+        if self._buffer.startswith(GERRIT_RESPONSE_PREFIX, position):
+            position += len(GERRIT_RESPONSE_PREFIX)
+        try:
+            return self._next(position)
+        except ValueError:
+            return len(self._buffer)
+
+    def _read_more(self) -> None:
+        if self._eof:
+            msg = 'Unexpected end of the JSON data'
+            raise ValueError(msg)
+        # Reading more and more, so a huge item is scanned only a few times
+        data = self.stream.read(max(self.read_size, len(self._buffer)))
+        self._eof = not data
+        self._buffer += data
+        self._skeleton = None
+
+    def _next(self, position: int) -> int:
+        """The position of the next non-whitespace character."""
+        while True:
+            match = _WHITESPACE.match(self._buffer, position)
+            position = match.end() if match else position
+            if position < len(self._buffer):
+                return position
+            self._read_more()
+
+    def _expect(self, position: int, character: bytes) -> int:
+        """The position after the expected character (and any whitespace)."""
+        position = self._next(position)
+        if self._buffer[position] != character[0]:
+            msg = f'Invalid JSON: expected {character.decode()!r} at {self._buffer[position : position + 20]!r}'
+            raise ValueError(msg)
+        return self._next(position + 1)
+
+    def _value_end(self, position: int) -> int:
+        """The end of the value at the position. A scalar can only be complete if something follows it."""
+        if self._buffer[position] in _OPENING:
+            return self._container_end(position)
+        if self._buffer[position] == ord('"'):
+            while not (match := _STRING.match(self._buffer, position)):
+                self._read_more()
+            return match.end()
+        while (end := _SCALAR.match(self._buffer, position).end()) == len(self._buffer) and not self._eof:  # type: ignore[union-attr]
+            self._read_more()
+        if not _LITERAL.fullmatch(self._buffer, position, end):
+            msg = f'Invalid JSON: unexpected {self._buffer[position : position + 20]!r}'
+            raise ValueError(msg)
+        return end
+
+    def _container_end(self, position: int) -> int:
+        """The end of the array or object at the position, matched in the skeleton of the buffer."""
+        if self._skeleton is None:
+            self._skeleton = _skeleton(self._buffer[position:])
+            self._mark = (position, 0)
+        mark, index = self._mark
+        index += len(_skeleton(self._buffer[mark:position]))
+        match = _SKELETON_VALUE.match(self._skeleton, index)
+        if not match:
+            return self._scan_end(position)
+        closing = self._skeleton[match.end() - 1]
+        end = position
+        for _ in range(self._skeleton.count(closing, index, match.end())):
+            end = self._buffer.index(closing, end) + 1
+        self._mark = (end, match.end())
+        return end
+
+    def _scan_end(self, position: int) -> int:
+        """The end of the array or object at the position, scanned bracket by bracket."""
+        depth = 0
+        end = position
+        while True:
+            end = _TO_BRACKET.match(self._buffer, end).end()  # type: ignore[union-attr]
+            if end == len(self._buffer) or self._buffer[end] == ord('"'):
+                self._read_more()  # an incomplete string, or no bracket yet
+                continue
+            depth += 1 if self._buffer[end] in _OPENING else -1
+            end += 1
+            if not depth:
+                return end
+
+
+def _validate_chunk(item_type: Any, keys: list[str | None], values: list[bytes]) -> list[Any]:  # noqa: ANN401
+    type_ = list[item_type]
+    content = b'[' + b','.join(values) + b']'
+    items = telemetry.call(type_, len(content), get_type_adapter(type_).validate_json, content)
+    return items if keys[0] is None else list(zip(keys, items, strict=True))
+
+
+def _process_chunk(
+    func: Callable[[list[Any]], R],
+    item_type: Any,  # noqa: ANN401
+    keys: list[str | None],
+    values: list[bytes],
+) -> R:
+    return func(_validate_chunk(item_type, keys, values))
+
+
+def _chunks(stream: IO[bytes], chunk_size: int) -> Iterator[tuple[list[str | None], list[bytes]]]:
+    """The keys and raw values of the items, in chunks."""
+    chunk: tuple[list[str | None], list[bytes]] = ([], [])
+    for key, value in JsonSplitter(stream):
+        chunk[0].append(key)
+        chunk[1].append(value)
+        if len(chunk[0]) == chunk_size:
+            yield chunk
+            chunk = ([], [])
+    if chunk[0]:
+        yield chunk
+
+
+def ingest(stream: IO[bytes], item_type: Any, *, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:  # noqa: ANN401
+    """
+    Validate the items of the top-level array of the stream as item_type, yielding them in order.
+
+    For a top-level map (like `groups/`), it yields `(key, item)` pairs.
+    Raises pydantic.ValidationError for invalid items, and ValueError for truncated JSON.
+    """
+    for keys, values in _chunks(stream, chunk_size):
+        yield from _validate_chunk(item_type, keys, values)
+
+
+def ingest_parallel(
+    stream: IO[bytes],
+    item_type: Any,  # noqa: ANN401
+    func: Callable[[list[Any]], R],
+    *,
+    workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[R]:
+    """
+    Validate the chunks of items in a pool of `workers` processes (one per core by default), and
+    yield the results of `func(chunk)`, in order.
+
+    The chunks are lists of items, or of `(key, item)` pairs for a top-level map, as in ingest().
+    At most two chunks per worker are pending at any time, so the memory used is bounded.
+    """
+    workers = workers or os.cpu_count() or 1
+    pending: deque[Future[R]] = deque()
+    with ProcessPoolExecutor(workers) as executor:
+        for keys, values in _chunks(stream, chunk_size):
+            pending.append(executor.submit(_process_chunk, func, item_type, keys, values))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
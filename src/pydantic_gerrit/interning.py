@@ -0,0 +1,114 @@
+"""
+Share a single instance between equal accounts during validation.
+
+Gerrit responses repeat the same accounts over and over: the `user` of every audit event, the
+members of every group. Validating them creates a new AccountInfo (plus its AvatarInfo list) for
+each occurrence. Validated as an interned type, with an InternPool in the validation context,
+equal accounts and avatars are validated only once, and all the occurrences share the same
+instance. Memory then grows with the number of unique accounts, not with the number of occurrences.
+
+    pool = InternPool()
+    events = parse_response(content, interned_type(list[GroupAuditEventInfo]), context=pool.context)
+
+The interned type has its models replaced by interned variants: subclasses of them, so the results
+are still instances of the original models (but not equal to them, like the instances of any other
+subclass). Only the variants of AccountInfo and AvatarInfo have the interning validator, and they
+are frozen, since their instances are shared. The lists in them (like the avatars) are shared too,
+and must not be changed. The original models have no such validator, so they don't pay for it.
+
+Reuse the same pool to share the instances between different responses.
+"""
+
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ConfigDict, ValidationInfo, model_validator
+
+from pydantic_gerrit._variants import Fields, ModelVariants, subclass
+
+INTERN_POOL_CONTEXT_KEY = 'pydantic_gerrit.intern_pool'
+
+# The models whose instances are shared, by their name in any version package
+INTERNED_MODELS = frozenset({'AccountInfo', 'AvatarInfo'})
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+
+class InternPool:
+    """The unique model instances, keyed by their type and input data."""
+
+    def __init__(self) -> None:
+        self._instances: dict[Hashable, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    @property
+    def context(self) -> dict[str, 'InternPool']:
+        """The validation context to activate this pool."""
+        return {INTERN_POOL_CONTEXT_KEY: self}
+
+    def intern(self, key: Hashable, factory: Callable[[], ModelT]) -> ModelT:
+        """Return the instance for the key, creating it with the factory only the first time."""
+        try:
+            instance: ModelT = self._instances[key]
+        except KeyError:
+            instance = self._instances[key] = factory()
+        return instance
+
+
+def interned_type(type_: Any) -> Any:  # noqa: ANN401
+    """Return the type with all its models replaced by their interned variants: `list[GroupAuditEventInfo]`, etc."""
+    return _VARIANTS.for_type(type_)
+
+
+def interned_model(model: type[ModelT]) -> type[ModelT]:
+    """Return the interned variant of the model, a subclass of it, creating it only once."""
+    return _VARIANTS.for_model(model)  # type: ignore[return-value]
+
+
+def _create_variant(model: type[BaseModel], fields: Fields) -> type[BaseModel]:
+    namespace: dict[str, Any] = {'__module__': __name__}
+    if model.__name__ in INTERNED_MODELS:
+        namespace['model_config'] = ConfigDict(frozen=True)
+        namespace['_intern'] = model_validator(mode='wrap')(_intern)
+    return subclass(model, f'Interned{model.__name__}', fields, namespace)
+
+
+def _intern(
+    cls: type[ModelT],
+    data: Any,  # noqa: ANN401
+    handler: Callable[[Any], ModelT],
+    info: ValidationInfo,
+) -> ModelT:
+    """
+    The wrap validator of the interned AccountInfo and AvatarInfo.
+
+    Without a pool in the context, this is a plain validation. Otherwise, the instance is keyed by
+    its input data, which includes `_account_id` and all the other fields. The avatars of a new
+    account are validated by their own validator, so they are interned too.
+    """
+    pool = info.context.get(INTERN_POOL_CONTEXT_KEY) if info.context else None
+    if pool is None or not isinstance(data, dict):
+        return handler(data)
+
+    try:
+        key = (cls, _freeze(data))
+        hash(key)
+    except TypeError:  # not JSON-like data, e.g. model instances as values
+        return handler(data)
+
+    interned: ModelT = pool.intern(key, lambda: handler(data))
+    return interned
+
+
+_VARIANTS = ModelVariants(_create_variant)
+
+
+def _freeze(value: Any) -> Any:  # noqa: ANN401
+    """Convert JSON-like data to a hashable equivalent."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
@@ -0,0 +1,34 @@
+"""
+Models for the most recent Gerrit version.
+
+The models are available from the endpoint modules (`.accounts`, `.groups`) and directly from this
+package. The endpoint modules are imported only when one of their models is first accessed.
+"""
+
+from typing import TYPE_CHECKING
+
+from pydantic_gerrit._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .accounts import *  # noqa: F403
+    from .groups import *  # noqa: F403
+
+# The models of this package, by endpoint module. Keep them in sync with the models of the modules.
+_MODELS = {
+    'accounts': ['AccountInfo', 'AvatarInfo'],
+    'groups': [
+        'GroupAuditAccountEventInfo',
+        'GroupAuditEventInfo',
+        'GroupAuditGroupEventInfo',
+        'GroupInfo',
+        'GroupInput',
+        'GroupOptionsInfo',
+        'GroupOptionsInput',
+        'GroupsInput',
+        'MembersInput',
+    ],
+}
+
+__all__ = [name for names in _MODELS.values() for name in names]
+
+__getattr__, __dir__ = lazy_attributes(__name__, _MODELS)
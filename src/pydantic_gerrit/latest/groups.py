@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Literal
+from typing import Annotated, Literal
 
 from pydantic import Field
 
@@ -8,9 +8,9 @@ from pydantic_gerrit.base import BaseModelGerrit
 from .accounts import AccountInfo
 
 
-class GroupAuditEventInfo(BaseModelGerrit):
+class _GroupAuditEventInfoBase(BaseModelGerrit):
     """
-    The GroupAuditEventInfo entity contains information about an audit event of a group.
+    The fields shared by all the GroupAuditEventInfo variants.
 
     https://gerrit-review.googlesource.com/Documentation/rest-api-groups.html#group-audit-event-info
     """
@@ -21,14 +21,51 @@ class GroupAuditEventInfo(BaseModelGerrit):
     user: AccountInfo = Field(
         description='The user that did the add/remove as detailed AccountInfo entity.',
     )
-    type: Literal['ADD_USER', 'REMOVE_USER', 'ADD_GROUP', 'REMOVE_GROUP'] = Field(
+
+
+class GroupAuditAccountEventInfo(_GroupAuditEventInfoBase):
+    """
+    A GroupAuditEventInfo whose member is an account (ADD_USER or REMOVE_USER).
+
+    https://gerrit-review.googlesource.com/Documentation/rest-api-groups.html#group-audit-event-info
+    """
+
+    type: Literal['ADD_USER', 'REMOVE_USER'] = Field(
         description='The event type.',
     )
-    member: 'AccountInfo | GroupInfo' = Field(
-        description='The group member that is added/removed. If type is ADD_USER or REMOVE_USER the member is returned as detailed AccountInfo entity, if type is ADD_GROUP or REMOVE_GROUP the member is returned as GroupInfo entity. Note that the name in GroupInfo will not be set if the member group is not available.'
+    member: AccountInfo = Field(
+        description='The account that is added/removed, as detailed AccountInfo entity.',
     )
 
 
+class GroupAuditGroupEventInfo(_GroupAuditEventInfoBase):
+    """
+    A GroupAuditEventInfo whose member is a group (ADD_GROUP or REMOVE_GROUP).
+
+    https://gerrit-review.googlesource.com/Documentation/rest-api-groups.html#group-audit-event-info
+    """
+
+    type: Literal['ADD_GROUP', 'REMOVE_GROUP'] = Field(
+        description='The event type.',
+    )
+    member: 'GroupInfo' = Field(
+        description='The group that is added/removed, as GroupInfo entity. Note that the name in GroupInfo will not be set if the member group is not available.',
+    )
+
+
+# The GroupAuditEventInfo entity contains information about an audit event of a group.
+# https://gerrit-review.googlesource.com/Documentation/rest-api-groups.html#group-audit-event-info
+#
+# The type of `member` depends on the event `type`, so instead of a single model with a
+# `AccountInfo | GroupInfo` member, we use a union tagged by `type` (like the TypeScript types in
+# polygerrit-ui). This way the validator goes straight to the right model, without trying both.
+# Validate it with a TypeAdapter: TypeAdapter(GroupAuditEventInfo).validate_python(data)
+GroupAuditEventInfo = Annotated[
+    GroupAuditAccountEventInfo | GroupAuditGroupEventInfo,
+    Field(discriminator='type'),
+]
+
+
 class GroupInfo(BaseModelGerrit):
     """
     Represents information about a Gerrit group.
@@ -0,0 +1,179 @@
+"""
+Transitive group membership, from a snapshot of all the groups with their members and subgroups.
+
+GroupInfo only has the direct members and the direct subgroups (includes) of a group. An account
+is effectively in a group if it is a direct member of it, or of any of its subgroups, recursively.
+The MembershipIndex precomputes those closures once, so each query is a lookup:
+
+    groups = parse_response(content, dict[str, GroupInfo])  # groups/?o=MEMBERS&o=INCLUDES
+    index = MembershipIndex(groups)
+    index.is_member(1000000, administrators_uuid)
+    index.groups_of(1000000)
+
+Groups are identified by their UUID (`GroupInfo.id`), since external groups may have no name.
+Subgroups that are not in the snapshot (external groups, like `ldap:...`, or groups not visible to
+the caller) are kept as groups with no known members, see MembershipIndex.external.
+
+Gerrit allows cycles in the subgroups (A includes B, B includes A). All the groups in a cycle have
+the same members, see MembershipIndex.cycles.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pydantic_gerrit.latest.groups import GroupInfo
+
+
+class MembershipIndex:
+    """The transitive members and subgroups of each group, and the groups of each account."""
+
+    def __init__(self, groups: 'Mapping[str, GroupInfo] | Iterable[GroupInfo]') -> None:
+        """Index the groups, as a list or as a map by name (like the groups/ response)."""
+        items = groups.items() if isinstance(groups, Mapping) else ((None, x) for x in groups)
+
+        self.names: dict[str, str | None] = {}  # group UUID -> name
+        direct_members: dict[str, list[int]] = {}
+        direct_subgroups: dict[str, list[str]] = {}
+        for key, group in items:
+            self.names[group.id] = group.name or key
+            direct_members[group.id] = [x.account_id for x in group.members or []]
+            direct_subgroups[group.id] = [x.id for x in group.includes or []]
+            for subgroup in group.includes or []:
+                if self.names.get(subgroup.id) is None:
+                    self.names[subgroup.id] = subgroup.name
+
+        self.external = frozenset(self.names.keys() - direct_members.keys())
+        self.cycles: list[frozenset[str]] = []
+        self._members: dict[str, frozenset[int]] = {}
+        self._subgroups: dict[str, frozenset[str]] = {}
+        # The strongly connected components come out with all their subgroups already done
+        for component in _strongly_connected_components(list(self.names), direct_subgroups):
+            self._add_component(component, direct_members, direct_subgroups)
+
+        # For the reverse queries: walk up from the groups that have the account as direct member
+        self._direct_groups: dict[int, list[str]] = {}
+        for group_id, account_ids in direct_members.items():
+            for account_id in account_ids:
+                self._direct_groups.setdefault(account_id, []).append(group_id)
+        self._parents: dict[str, list[str]] = {}
+        for group_id, subgroup_ids in direct_subgroups.items():
+            for subgroup_id in subgroup_ids:
+                self._parents.setdefault(subgroup_id, []).append(group_id)
+        self._by_name = {name: group_id for group_id, name in self.names.items() if name is not None}
+
+    def __len__(self) -> int:
+        """The number of groups, including the external ones."""
+        return len(self.names)
+
+    def __contains__(self, group_id: object) -> bool:
+        return group_id in self.names
+
+    def is_member(self, account_id: int, group_id: str) -> bool:
+        """Whether the account is a member of the group, directly or through its subgroups."""
+        members = self._members.get(group_id)
+        return members is not None and account_id in members
+
+    def members(self, group_id: str) -> frozenset[int]:
+        """The account IDs of all the members of the group. Raises KeyError for unknown groups."""
+        return self._members[group_id]
+
+    def subgroups(self, group_id: str) -> frozenset[str]:
+        """The UUIDs of all the subgroups of the group, recursively. Raises KeyError for unknown groups."""
+        return self._subgroups[group_id]
+
+    def groups_of(self, account_id: int) -> frozenset[str]:
+        """The UUIDs of all the groups that have the account as member, directly or not. O(result size)."""
+        found = set(self._direct_groups.get(account_id, []))
+        pending = list(found)
+        while pending:
+            for parent in self._parents.get(pending.pop(), []):
+                if parent not in found:
+                    found.add(parent)
+                    pending.append(parent)
+        return frozenset(found)
+
+    def group_id(self, name: str) -> str:
+        """The UUID of the group with this name. Raises KeyError if there is none."""
+        return self._by_name[name]
+
+    def _add_component(
+        self, component: list[str], direct_members: dict[str, list[int]], direct_subgroups: dict[str, list[str]]
+    ) -> None:
+        """Compute the closures of a group, or of a cycle of groups, from the ones of its subgroups."""
+        group_set = frozenset(component)
+        subgroups = {y for x in component for y in direct_subgroups.get(x, [])} - group_set
+        members = {y for x in component for y in direct_members.get(x, [])}
+        reachable = set(subgroups)
+        largest: frozenset[int] = frozenset()
+        for subgroup in subgroups:
+            members.update(self._members[subgroup])
+            reachable.update(self._subgroups[subgroup])
+            largest = max(largest, self._members[subgroup], key=len)
+        if len(component) > 1 or component[0] in direct_subgroups.get(component[0], []):
+            self.cycles.append(group_set)
+            # A group is its own subgroup only if it is in a cycle
+            reachable.update(group_set)
+        # Share the members of the subgroup when there's nothing else, to save memory
+        frozen_members = largest if len(members) == len(largest) else frozenset(members)
+        frozen_reachable = frozenset(reachable)
+        for group_id in component:
+            self._members[group_id] = frozen_members
+            self._subgroups[group_id] = frozen_reachable
+
+
+def _strongly_connected_components(nodes: list[str], edges: Mapping[str, list[str]]) -> list[list[str]]:
+    """
+    Tarjan's algorithm, without recursion (the subgroup chains can be deeper than the recursion limit).
+
+    A component is only returned after all the components reachable from it.
+    """
+    tarjan = _Tarjan(edges)
+    for node in nodes:
+        if node not in tarjan.index:
+            tarjan.run(node)
+    return tarjan.components
+
+
+class _Tarjan:
+    def __init__(self, edges: Mapping[str, list[str]]) -> None:
+        self.edges = edges
+        self.index: dict[str, int] = {}
+        self.lowlink: dict[str, int] = {}
+        self.stack: list[str] = []
+        self.on_stack: set[str] = set()
+        self.components: list[list[str]] = []
+
+    def visit(self, node: str) -> Iterator[str]:
+        self.index[node] = self.lowlink[node] = len(self.index)
+        self.stack.append(node)
+        self.on_stack.add(node)
+        return iter(self.edges.get(node, []))
+
+    def run(self, root: str) -> None:
+        work = [(root, self.visit(root))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in self.index:
+                    work.append((child, self.visit(child)))
+                    break
+                if child in self.on_stack:
+                    self.lowlink[node] = min(self.lowlink[node], self.index[child])
+            else:
+                # All the children are done
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    self.lowlink[parent] = min(self.lowlink[parent], self.lowlink[node])
+                if self.lowlink[node] == self.index[node]:
+                    self.components.append(self.pop_component(node))
+
+    def pop_component(self, root: str) -> list[str]:
+        component = []
+        while True:
+            node = self.stack.pop()
+            self.on_stack.discard(node)
+            component.append(node)
+            if node == root:
+                return component
@@ -0,0 +1,154 @@
+"""
+Iterate over the results of the groups and accounts queries, one page at a time.
+
+Gerrit limits the number of results with the `n` (limit) query parameter, and skips results with
+`S` (start). For queries, the last returned entity has `_more_groups` / `_more_accounts` set when
+there are more results available. The iterators here request one page at a time, so even huge
+result sets are processed in bounded memory, and the caller can stop at any time.
+
+The HTTP layer is up to the caller, just provide a `fetch` function. For example, with requests:
+
+    def fetch(endpoint: str, params: list[tuple[str, str]]) -> bytes:
+        response = session.get(f'https://gerrit.example.com/a/{endpoint}', params=params)
+        response.raise_for_status()
+        return response.content
+
+    for group in iter_groups(fetch, query='inname:team', page_size=500):
+        ...
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from itertools import chain
+
+from pydantic_gerrit.latest.accounts import AccountInfo
+from pydantic_gerrit.latest.groups import GroupInfo
+from pydantic_gerrit.parsing import parse_response
+
+# GET the endpoint (relative to the REST API root, e.g. `groups/`) with the given query parameters,
+# returning the raw response body.
+Fetch = Callable[[str, list[tuple[str, str]]], bytes]
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def iter_group_pages(
+    fetch: Fetch,
+    *,
+    query: str | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    start: int = 0,
+    options: Iterable[str] = (),
+) -> Iterator[list[GroupInfo]]:
+    """
+    Yield pages of groups, as lists of GroupInfo.
+
+    Without a query, all the visible groups are listed (`groups/`). In this case Gerrit returns
+    a map, and the group name (the map key) is set in the `name` field of each GroupInfo.
+
+    With a query, only the matching groups are listed (`groups/?query=...`).
+    See https://gerrit-review.googlesource.com/Documentation/user-search-groups.html
+
+    The options are the extra group options, e.g. `MEMBERS` and `INCLUDES`.
+    """
+    # Checked now, not only when the first page is requested
+    _check_page_size(page_size)
+    base_params = [('o', option) for option in options]
+    if query is not None:
+        base_params.append(('query', query))
+    return _group_pages(fetch, base_params, query=query, page_size=page_size, start=start)
+
+
+def _group_pages(
+    fetch: Fetch, base_params: list[tuple[str, str]], *, query: str | None, page_size: int, start: int
+) -> Iterator[list[GroupInfo]]:
+    while True:
+        params = [*base_params, ('n', str(page_size)), ('S', str(start))]
+        content = fetch('groups/', params)
+        if query is None:
+            groups = parse_response(content, dict[str, GroupInfo])
+            for name, group in groups.items():
+                group.name = name
+            page = list(groups.values())
+        else:
+            page = parse_response(content, list[GroupInfo])
+
+        if page:
+            yield page
+
+        # Only queries set _more_groups, the plain list must be paged until a partial page
+        if not page or not (page[-1].more_groups or (query is None and len(page) == page_size)):
+            return
+        start += len(page)
+
+
+def iter_groups(
+    fetch: Fetch,
+    *,
+    query: str | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    start: int = 0,
+    options: Iterable[str] = (),
+) -> Iterator[GroupInfo]:
+    """
+    Yield the groups one by one, fetching a new page only when the previous one is consumed.
+
+    See iter_group_pages() for the arguments.
+    """
+    return chain.from_iterable(iter_group_pages(fetch, query=query, page_size=page_size, start=start, options=options))
+
+
+def iter_account_pages(
+    fetch: Fetch,
+    query: str,
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    start: int = 0,
+    options: Iterable[str] = (),
+) -> Iterator[list[AccountInfo]]:
+    """
+    Yield pages of the accounts matching the query (`accounts/?q=...`), as lists of AccountInfo.
+
+    See https://gerrit-review.googlesource.com/Documentation/user-search-accounts.html
+
+    The options are the extra account options, e.g. `DETAILS` and `ALL_EMAILS`.
+    """
+    _check_page_size(page_size)
+    base_params = [('q', query), *(('o', option) for option in options)]
+    return _account_pages(fetch, base_params, page_size=page_size, start=start)
+
+
+def _account_pages(
+    fetch: Fetch, base_params: list[tuple[str, str]], *, page_size: int, start: int
+) -> Iterator[list[AccountInfo]]:
+    while True:
+        params = [*base_params, ('n', str(page_size)), ('S', str(start))]
+        page = parse_response(fetch('accounts/', params), list[AccountInfo])
+
+        if page:
+            yield page
+
+        if not page or not page[-1].more_accounts:
+            return
+        start += len(page)
+
+
+def iter_accounts(
+    fetch: Fetch,
+    query: str,
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    start: int = 0,
+    options: Iterable[str] = (),
+) -> Iterator[AccountInfo]:
+    """
+    Yield the accounts one by one, fetching a new page only when the previous one is consumed.
+
+    See iter_account_pages() for the arguments.
+    """
+    return chain.from_iterable(iter_account_pages(fetch, query, page_size=page_size, start=start, options=options))
+
+
+def _check_page_size(page_size: int) -> None:
+    if page_size < 1:
+        msg = f'page_size must be positive, got {page_size}'
+        raise ValueError(msg)
@@ -0,0 +1,85 @@
+"""
+Parse raw Gerrit REST API responses directly into models.
+
+Gerrit prefixes every JSON response with a magic string, to prevent XSSI attacks:
+https://gerrit-review.googlesource.com/Documentation/rest-api.html#output
+
+The functions here take the raw response bytes and validate them with the pydantic-core JSON
+parser, so there are no intermediate `str` or `dict` objects, nor a second parsing pass.
+
+    from pydantic_gerrit.latest.groups import GroupInfo
+
+    groups = parse_response(response.content, dict[str, GroupInfo])
+"""
+
+from typing import Any, TypeVar
+
+from pydantic import TypeAdapter
+
+from pydantic_gerrit import telemetry
+
+GERRIT_RESPONSE_PREFIX = b")]}'"
+
+T = TypeVar('T')
+
+_TYPE_ADAPTERS: dict[Any, TypeAdapter[Any]] = {}
+
+
+def get_type_adapter(type_: Any) -> TypeAdapter[Any]:  # noqa: ANN401
+    """
+    Return a TypeAdapter for the given type, creating it only once.
+
+    Building a TypeAdapter compiles a new validator, so it should never be done per response.
+    The type must be hashable, as all the usual types are: `GroupInfo`, `list[GroupInfo]`,
+    `dict[str, GroupInfo]`, `list[GroupAuditEventInfo]`, etc.
+    """
+    adapter = _TYPE_ADAPTERS.get(type_)
+    if adapter is None:
+        adapter = _TYPE_ADAPTERS[type_] = TypeAdapter(type_)
+    return adapter
+
+
+def strip_response_prefix(content: bytes | bytearray | memoryview) -> memoryview:
+    """
+    Return a view of the response content without the leading XSSI prefix, if any.
+
+    This is a view into the original buffer, no data is copied.
+    """
+    view = content if isinstance(content, memoryview) else memoryview(content)
+    if view[: len(GERRIT_RESPONSE_PREFIX)] == GERRIT_RESPONSE_PREFIX:
+        return view[len(GERRIT_RESPONSE_PREFIX) :]
+    return view
+
+
+def response_json(content: bytes | bytearray | memoryview) -> bytes | bytearray:
+    """
+    The JSON of the response content, without the XSSI prefix, for the pydantic-core JSON parser
+    (like `pydantic_core.from_json()`). The content is returned as is when it has no prefix.
+    """
+    view = strip_response_prefix(content)
+    # The pydantic-core JSON parser does not accept a memoryview, only a contiguous bytes-like
+    # object. When there's a prefix to skip, the remaining bytes are copied once (a plain memcpy),
+    # which is way cheaper than decoding to `str` and creating the intermediate Python objects.
+    if isinstance(content, memoryview) or view.nbytes != len(content):
+        return view.tobytes()
+    return content
+
+
+def parse_response(
+    content: bytes | bytearray | memoryview, type_: type[T], *, context: dict[str, Any] | None = None
+) -> T:
+    """
+    Validate the raw content of a Gerrit response, returning an instance of the given type.
+
+    The type can be a model (`GroupInfo`) or any container of them (`dict[str, GroupInfo]`).
+    The context is the pydantic validation context, e.g. `InternPool().context`.
+    Raises pydantic.ValidationError if the content does not match the type.
+    """
+    data = response_json(content)
+    adapter = get_type_adapter(type_)
+    recorder = telemetry.active()
+    if recorder is None:  # not through telemetry.call(), it's measurable on the small responses
+        result: T = adapter.validate_json(data, context=context)
+    else:
+        result = recorder.call(type_, len(data), adapter.validate_json, data, context=context)
+    return result
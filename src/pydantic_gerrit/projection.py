@@ -0,0 +1,120 @@
+"""
+Projections: read-only variants of the models, with only the fields the caller needs.
+
+The full models validate and keep every field of a response, like the avatars of every member of
+every group. A projection has only the selected fields, and it ignores the other keys (instead of
+rejecting them, like the full models do), so the rest of the response is never turned into Python
+objects:
+
+    GroupRef = projection(GroupInfo, 'id', 'name', 'owner_id')
+    groups = parse_response(content, dict[str, GroupRef])
+
+Nested models are projected too, by giving their fields as keyword arguments. The fields of
+the nested model, or a projection of it:
+
+    GroupMembers = projection(GroupInfo, 'id', 'name', members=('account_id', 'email'))
+    GroupTree = projection(GroupInfo, 'id', includes=GroupRef)
+
+A nested model selected only by name (`projection(GroupInfo, 'id', 'members')`) is the full model.
+
+The projections are cached, so asking again for the same one returns the same class, and its
+validator is built only once. Like for the full models, the fields are selected by their Python
+names (`account_id`), not by their aliases (`_account_id`).
+"""
+
+import sys
+from collections.abc import Sequence
+from typing import Any, ForwardRef, cast, get_args, get_origin
+
+from pydantic import BaseModel, ConfigDict, create_model
+from pydantic.fields import FieldInfo
+
+from pydantic_gerrit._types import replace_types
+
+_PROJECTIONS: dict[tuple[Any, ...], type[BaseModel]] = {}
+
+
+def projection(model: type[BaseModel], *fields: str, **nested: Sequence[str] | type[BaseModel]) -> type[BaseModel]:
+    """
+    Return the projection of the model with only the given fields, creating it only once.
+
+    The projection is a new model, not a subclass of the model: its instances are not instances of
+    the model, and only the selected fields exist.
+    """
+    nested_models = {
+        name: spec if isinstance(spec, type) else projection(_nested_model(model, name), *spec)
+        for name, spec in nested.items()
+    }
+    selected = {*fields, *nested_models}
+    key = (model, tuple(sorted(selected)), tuple(sorted(nested_models.items())))
+    result = _PROJECTIONS.get(key)
+    if result is None:
+        result = _PROJECTIONS[key] = _create_projection(model, selected, nested_models)
+    return result
+
+
+def _create_projection(
+    model: type[BaseModel], selected: set[str], nested_models: dict[str, type[BaseModel]]
+) -> type[BaseModel]:
+    unknown = sorted(selected - model.model_fields.keys())
+    if unknown:
+        msg = f'{model.__name__} has no fields {", ".join(unknown)}'
+        raise ValueError(msg)
+
+    definitions: dict[str, Any] = {}
+    for name, field in model.model_fields.items():
+        if name not in selected:
+            continue
+        replacement = nested_models.get(name)
+        original = _nested_model(model, name) if replacement else None
+        annotation = _resolve(field.annotation, model, original, replacement)
+        # The FieldInfo keeps the alias, the default and the description
+        definitions[name] = (annotation, FieldInfo.merge_field_infos(field))
+    config = ConfigDict(**{**model.model_config, 'extra': 'ignore', 'frozen': True, 'defer_build': False})
+    result = create_model(f'{model.__name__}Projection', __config__=config, __doc__=model.__doc__, **definitions)
+    result.__qualname__ = result.__name__
+    return result
+
+
+def _nested_model(model: type[BaseModel], name: str) -> type[BaseModel]:
+    """The model in the type of a field, like AccountInfo for `members: list[AccountInfo] | None`."""
+    if name not in model.model_fields:
+        msg = f'{model.__name__} has no field {name}'
+        raise ValueError(msg)
+    found = [x for x in _flatten(_resolve(model.model_fields[name].annotation, model)) if _is_model(x)]
+    if len(found) != 1:
+        msg = f'{model.__name__}.{name} is not a nested model field'
+        raise ValueError(msg)
+    return cast('type[BaseModel]', found[0])
+
+
+def _is_model(type_: Any) -> bool:  # noqa: ANN401
+    return isinstance(type_, type) and get_origin(type_) is None and issubclass(type_, BaseModel)
+
+
+def _flatten(type_: Any) -> list[Any]:  # noqa: ANN401
+    return [type_, *(y for x in get_args(type_) for y in _flatten(x))]
+
+
+def _resolve(
+    type_: Any,  # noqa: ANN401
+    owner: type[BaseModel],
+    original: type[BaseModel] | None = None,
+    replacement: type[BaseModel] | None = None,
+) -> Any:  # noqa: ANN401
+    """
+    Resolve the forward references in the type, replacing the original model by the replacement.
+
+    The forward references are resolved in the module of the model that uses them, since the
+    projections are created elsewhere.
+    """
+
+    def replace(leaf: Any) -> Any:  # noqa: ANN401
+        if isinstance(leaf, (str, ForwardRef)):
+            name = leaf.__forward_arg__ if isinstance(leaf, ForwardRef) else leaf
+            leaf = getattr(sys.modules[owner.__module__], name)
+        if original is not None and leaf is original:
+            return replacement
+        return leaf
+
+    return replace_types(type_, replace)
@@ -0,0 +1,155 @@
+"""
+Record responses (or their items) to a JSON Lines file, for capturing test fixtures or samples of
+production-shaped data, and replay them later.
+
+    recorder = ResponseRecorder('audit-events.jsonl', max_records=1000)
+    recorder.record_all(loads(content.removeprefix(b")]}'")))  # only the new events are written
+    recorder.close()
+
+    for event in replay('audit-events.jsonl', GroupAuditEventInfo):
+        ...
+
+Each record is a line of canonical JSON (sorted keys, no spaces), so recording only appends the new
+lines: the cost is proportional to the new data, not to the whole file. Identical records are
+written only once, by the hash of their line.
+
+With `max_records` or `max_bytes`, the file is compacted to the newest records within those limits,
+once it is a quarter over them. So the compaction rewrites are rare, and the file never grows
+beyond 1.25 times the limits. The records dropped by a compaction are forgotten: if they come
+again, they are recorded again, as new.
+
+The reading is lazy: the file is memory-mapped and each record is parsed only when reached.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, TypeVar
+
+from pydantic_gerrit import telemetry
+from pydantic_gerrit.parsing import get_type_adapter
+
+T = TypeVar('T')
+
+COMPACTION_SLACK = 0.25  # how much over the limits before compacting
+
+
+class ResponseRecorder:
+    """Append-only, deduplicated and size-bounded JSON Lines records."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        max_records: int | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self._hashes: set[bytes] = set()
+        self._size = 0
+        self._load()
+        self._file = self.path.open('ab')
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def record(self, data: Any) -> bool:  # noqa: ANN401
+        """Append the record, unless an identical one is already there. Returns whether it was appended."""
+        line = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode() + b'\n'
+        digest = _hash(line)
+        if digest in self._hashes:
+            return False
+        self._file.write(line)
+        self._file.flush()
+        self._hashes.add(digest)
+        self._size += len(line)
+        if self._over_limits(1 + COMPACTION_SLACK):
+            self.compact()
+        return True
+
+    def record_all(self, items: Iterable[Any]) -> int:
+        """Append the new records, returning how many."""
+        return sum(self.record(x) for x in items)
+
+    def compact(self) -> None:
+        """Rewrite the file with only the newest records within the limits."""
+        self._file.close()
+        lines = list(_lines(self.path))
+        size = 0
+        start = len(lines)
+        while start > 0:
+            size += len(lines[start - 1]) + 1
+            if (self.max_records is not None and len(lines) - start + 1 > self.max_records) or (
+                self.max_bytes is not None and size > self.max_bytes
+            ):
+                break
+            start -= 1
+        kept = lines[start:]
+        temporary = self.path.with_name(self.path.name + '.tmp')
+        temporary.write_bytes(b''.join(x + b'\n' for x in kept))
+        temporary.replace(self.path)
+        self._hashes = {_hash(x + b'\n') for x in kept}
+        self._size = sum(len(x) + 1 for x in kept)
+        self._file = self.path.open('ab')
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with self.path.open('rb+') as file:
+            content_size = file.seek(0, os.SEEK_END)
+            if content_size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    end = data.rfind(b'\n') + 1
+                if end < content_size:
+                    # An incomplete last line, from an interrupted write
+                    file.truncate(end)
+        for line in _lines(self.path):
+            self._hashes.add(_hash(line + b'\n'))
+            self._size += len(line) + 1
+
+    def _over_limits(self, factor: float) -> bool:
+        return (self.max_records is not None and len(self._hashes) > self.max_records * factor) or (
+            self.max_bytes is not None and self._size > self.max_bytes * factor
+        )
+
+
+def read_records(path: str | os.PathLike[str]) -> Iterator[Any]:
+    """The records of the file, parsed one at a time."""
+    for line in _lines(path):
+        yield json.loads(line)
+
+
+def replay(path: str | os.PathLike[str], type_: type[T]) -> Iterator[T]:
+    """The records of the file, validated as the type (like GroupAuditEventInfo) one at a time."""
+    adapter = get_type_adapter(type_)
+    for line in _lines(path):
+        result: T = telemetry.call(type_, len(line), adapter.validate_json, line)
+        yield result
+
+
+def _lines(path: str | os.PathLike[str]) -> Iterator[bytes]:
+    """The non-empty lines of the file, without the newline, read from a memory map."""
+    with Path(path).open('rb') as file:
+        if not os.fstat(file.fileno()).st_size:
+            return  # an empty file can't be mapped
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = 0
+            while start < len(data):
+                end = data.find(b'\n', start)
+                if end == -1:
+                    end = len(data)
+                if end > start:
+                    yield data[start:end]
+                start = end + 1
+
+
+def _hash(line: bytes) -> bytes:
+    return hashlib.blake2b(line, digest_size=16).digest()
@@ -0,0 +1,142 @@
+"""
+The version packages, and the models to use for a given Gerrit server version.
+
+    server_version = await client.get('config/server/version', str)  # like '3.12.1'
+    groups = parse_versioned_response(content, server_version, dict[str, GroupInfo])
+
+The types are written with the `latest` models, and their models are replaced by the ones of the
+version package for the server: the package of its major.minor version, or else the oldest package
+newer than it (a newer API mostly adds optional fields), or else `latest`.
+
+The models are shared between the versions: a version package only defines the models that differ
+from `latest`, and imports the others from there. So a model that did not change is the same class
+in all the versions, with a single validator and serializer, built once. duplicated_models() finds
+the models that a version package redefines exactly as in `latest`, which should be imported instead.
+"""
+
+import pkgutil
+import re
+import sys
+from collections.abc import Iterable
+from functools import cache
+from importlib import import_module
+from typing import Any, ForwardRef, TypeVar, get_args, get_origin
+
+from pydantic import BaseModel
+
+import pydantic_gerrit
+from pydantic_gerrit._types import replace_types
+from pydantic_gerrit.parsing import parse_response
+
+T = TypeVar('T')
+
+LATEST = 'latest'
+
+_PACKAGE_NAME = re.compile(r'v(\d+)_(\d+)')
+_SERVER_VERSION = re.compile(r'v?(\d+)\.(\d+)')
+
+
+@cache
+def version_packages() -> dict[tuple[int, int], str]:
+    """The version packages (like `v3_12`), by their (major, minor) version, oldest first."""
+    packages = {}
+    for module in pkgutil.iter_modules(pydantic_gerrit.__path__):
+        match = _PACKAGE_NAME.fullmatch(module.name)
+        if module.ispkg and match:
+            packages[int(match[1]), int(match[2])] = module.name
+    return dict(sorted(packages.items()))
+
+
+def package_for(server_version: str) -> str:
+    """The version package for the server version, like `v3_12` for `3.12.1` (or for `3.12.1-rc2`)."""
+    match = _SERVER_VERSION.match(server_version.strip())
+    if not match:
+        msg = f'Invalid Gerrit version: {server_version!r}'
+        raise ValueError(msg)
+    version = (int(match[1]), int(match[2]))
+    return next((name for key, name in version_packages().items() if key >= version), LATEST)
+
+
+def model_for(server_version: str, name: str) -> Any:  # noqa: ANN401
+    """The model (or type, like GroupAuditEventInfo) with the name, in the package for the server version."""
+    return getattr(import_module(f'pydantic_gerrit.{package_for(server_version)}'), name)
+
+
+def type_for(server_version: str, type_: Any) -> Any:  # noqa: ANN401
+    """The type (like `dict[str, GroupInfo]`) with its models replaced by the ones for the server version."""
+    return _replace_models(type_, import_module(f'pydantic_gerrit.{package_for(server_version)}'))
+
+
+def parse_versioned_response(content: bytes | bytearray | memoryview, server_version: str, type_: type[T]) -> T:
+    """Like pydantic_gerrit.parsing.parse_response(), with the models for the server version."""
+    result: T = parse_response(content, type_for(server_version, type_))
+    return result
+
+
+def duplicated_models(packages: Iterable[str] | None = None) -> list[tuple[str, str]]:
+    """
+    The (package, model name) of the models that a version package redefines exactly as in `latest`.
+    By default, it checks all the version packages.
+    """
+    latest = import_module(f'pydantic_gerrit.{LATEST}')
+    duplicated = []
+    for package in version_packages().values() if packages is None else packages:
+        module = import_module(f'pydantic_gerrit.{package}')
+        for name in module.__all__:
+            model = getattr(module, name)
+            original = getattr(latest, name, model)
+            redefined = model is not original and _is_model(model) and _is_model(original)
+            if redefined and _signature(model) == _signature(original):
+                duplicated.append((package, name))
+    return duplicated
+
+
+def _is_model(value: Any) -> bool:  # noqa: ANN401
+    return isinstance(value, type) and issubclass(value, BaseModel)
+
+
+def _signature(model: type[BaseModel], parents: tuple[type[BaseModel], ...] = ()) -> tuple[Any, ...]:
+    """
+    What defines the schema of the model: its fields, its configuration and its validators.
+
+    The nested models are compared by their own signatures, so a redefined GroupInfo that uses a
+    different AccountInfo is different too. Only a model that nests itself (like GroupInfo in its
+    includes) is compared by name.
+    """
+    parents = (*parents, model)
+    fields = tuple(
+        (name, info.alias, _type_signature(info.annotation, parents), repr(info.default), info.is_required())
+        for name, info in model.model_fields.items()
+    )
+    decorators = model.__pydantic_decorators__
+    validators = tuple(
+        sorted(
+            name
+            for group in (decorators.validators, decorators.field_validators, decorators.model_validators)
+            for name in group
+        )
+    )
+    return fields, tuple(sorted(model.model_config.items(), key=lambda x: x[0])), validators
+
+
+def _type_signature(type_: Any, parents: tuple[type[BaseModel], ...]) -> Any:  # noqa: ANN401
+    """The type, with its models replaced by their signatures, so the same field in different versions is equal."""
+    if isinstance(type_, (str, ForwardRef)):
+        # Forward references are resolved in the module of the model that uses them
+        name = type_.__forward_arg__ if isinstance(type_, ForwardRef) else type_
+        type_ = getattr(sys.modules.get(parents[-1].__module__), name, name)
+    if _is_model(type_):
+        return type_.__name__ if type_ in parents else _signature(type_, parents)
+    args = get_args(type_)
+    if not args:
+        return repr(type_)
+    return repr(get_origin(type_)), tuple(_type_signature(x, parents) for x in args)
+
+
+def _replace_models(type_: Any, package: Any) -> Any:  # noqa: ANN401
+    def replace(leaf: Any) -> Any:  # noqa: ANN401
+        if _is_model(leaf) and leaf.__module__.startswith(f'pydantic_gerrit.{LATEST}.'):
+            return getattr(package, leaf.__name__, leaf)
+        return leaf
+
+    return replace_types(type_, replace)
@@ -0,0 +1,215 @@
+"""
+Incremental group membership sync, replaying the audit log of each group since a checkpoint.
+
+Instead of fetching all the members of all the groups on every sync, the local membership state
+of each group is updated with the audit events (ADD_USER, REMOVE_USER, ADD_GROUP, REMOVE_GROUP)
+that happened since its last sync. The state and the checkpoint are persisted between runs:
+
+    store = CheckpointStore('membership.json')
+    sync = MembershipSync(fetch, store)  # fetch as in pydantic_gerrit.pagination
+    for diff in sync.sync(group_uuids):
+        if diff:
+            print(diff)
+
+The first sync of a group takes its current direct members and subgroups, and the checkpoint is
+the newest audit event. The next syncs apply only the newer events. Gerrit has no way to fetch only
+the newer events, so the whole audit log of the group is still downloaded and validated, but its
+size follows the activity of the group, not the size of the whole site.
+
+The audit events have only second precision, and the events of the same second come in no defined
+order. The checkpoint keeps the fingerprints of the events of its second, so none is applied twice
+or skipped. But if the same member is added and removed within the same second, the order used is
+the one returned by Gerrit.
+"""
+
+import json
+import os
+from collections import Counter
+from collections.abc import Generator, Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from hashlib import sha1
+from pathlib import Path
+from urllib.parse import quote
+
+from pydantic_gerrit.latest.accounts import AccountInfo
+from pydantic_gerrit.latest.groups import GroupAuditAccountEventInfo, GroupAuditEventInfo, GroupInfo
+from pydantic_gerrit.pagination import Fetch
+from pydantic_gerrit.parsing import parse_response
+from pydantic_gerrit.timestamps import format_timestamp, parse_timestamp
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+@dataclass
+class GroupState:
+    """The direct members and subgroups of a group, as of its checkpoint."""
+
+    members: set[int] = field(default_factory=set)  # account IDs
+    subgroups: set[str] = field(default_factory=set)  # group UUIDs
+    checkpoint: datetime | None = None  # the date of the newest event applied
+    seen: set[str] = field(default_factory=set)  # fingerprints of the events applied at that date
+
+
+@dataclass(frozen=True)
+class MembershipDiff:
+    """
+    The changes in the direct members and subgroups of a group, in one sync.
+
+    In the first sync of a group, all its members and subgroups are added.
+    """
+
+    group_id: str
+    added_members: frozenset[int] = frozenset()
+    removed_members: frozenset[int] = frozenset()
+    added_subgroups: frozenset[str] = frozenset()
+    removed_subgroups: frozenset[str] = frozenset()
+
+    def __bool__(self) -> bool:
+        """Whether anything changed."""
+        return bool(self.added_members or self.removed_members or self.added_subgroups or self.removed_subgroups)
+
+
+class CheckpointStore:
+    """The group states, persisted to a JSON file."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+
+    def load(self) -> dict[str, GroupState]:
+        """The saved states, by group UUID. Empty if the file does not exist yet."""
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        if data.get('version') != CHECKPOINT_FORMAT_VERSION:
+            msg = f'Unsupported checkpoint format version in {self.path}: {data.get("version")}'
+            raise ValueError(msg)
+        return {
+            group_id: GroupState(
+                members=set(state['members']),
+                subgroups=set(state['subgroups']),
+                checkpoint=parse_timestamp(state['checkpoint']) if state['checkpoint'] else None,
+                seen=set(state['seen']),
+            )
+            for group_id, state in data['groups'].items()
+        }
+
+    def save(self, states: dict[str, GroupState]) -> None:
+        """Save the states, replacing the file at once, so it is never left half written."""
+        data = {
+            'version': CHECKPOINT_FORMAT_VERSION,
+            'groups': {
+                group_id: {
+                    'members': sorted(state.members),
+                    'subgroups': sorted(state.subgroups),
+                    'checkpoint': format_timestamp(state.checkpoint) if state.checkpoint else None,
+                    'seen': sorted(state.seen),
+                }
+                for group_id, state in states.items()
+            },
+        }
+        temporary = self.path.with_name(self.path.name + '.tmp')
+        temporary.write_text(json.dumps(data, indent=1) + '\n')
+        temporary.replace(self.path)
+
+
+class MembershipSync:
+    """Keep the direct members and subgroups of groups up to date, from their audit logs."""
+
+    def __init__(self, fetch: Fetch, store: CheckpointStore) -> None:
+        self.fetch = fetch
+        self.store = store
+        self.states = store.load()
+
+    def sync(self, group_ids: Iterable[str]) -> Generator[MembershipDiff]:
+        """
+        Sync the groups, one at a time, and save the states to the store if any of them changed.
+
+        The store is saved once, at the end: when all the groups are synced, or when the iteration
+        stops early (an error, or the caller closing it), so the groups already synced are kept.
+        """
+        changed = False
+        try:
+            for group_id in group_ids:
+                before = self.states.get(group_id)
+                checkpoint = None if before is None else (before.checkpoint, frozenset(before.seen))
+                diff = self.sync_group(group_id)
+                after = self.states[group_id]
+                # The members and subgroups change only with new events, which move the checkpoint
+                changed = changed or checkpoint != (after.checkpoint, frozenset(after.seen))
+                yield diff
+        finally:
+            if changed:
+                self.store.save(self.states)
+
+    def sync_group(self, group_id: str) -> MembershipDiff:
+        """Sync the group, returning what changed. The state is not saved to the store."""
+        endpoint = f'groups/{quote(group_id, safe="")}'
+        # Newest first. Fetched before the members, so no event is missed between both requests.
+        events = parse_response(self.fetch(f'{endpoint}/log.audit', []), list[GroupAuditEventInfo])
+        state = self.states.get(group_id)
+        if state is None:
+            old = GroupState()
+            state = GroupState(
+                members={
+                    x.account_id for x in parse_response(self.fetch(f'{endpoint}/members', []), list[AccountInfo])
+                },
+                subgroups={x.id for x in parse_response(self.fetch(f'{endpoint}/groups', []), list[GroupInfo])},
+            )
+        else:
+            old = GroupState(members=set(state.members), subgroups=set(state.subgroups))
+            for event in reversed(_new_events(events, state)):
+                _apply(event, state)
+
+        if events:
+            state.checkpoint = events[0].date
+            state.seen = {x for x, event in _fingerprints(events) if event.date == state.checkpoint}
+        self.states[group_id] = state
+        return MembershipDiff(
+            group_id,
+            added_members=frozenset(state.members - old.members),
+            removed_members=frozenset(old.members - state.members),
+            added_subgroups=frozenset(state.subgroups - old.subgroups),
+            removed_subgroups=frozenset(old.subgroups - state.subgroups),
+        )
+
+
+def _new_events(events: list[GroupAuditEventInfo], state: GroupState) -> list[GroupAuditEventInfo]:
+    """The events after the checkpoint, newest first."""
+    if state.checkpoint is None:
+        return events
+    return [
+        event
+        for fingerprint, event in _fingerprints(events)
+        if event.date > state.checkpoint or (event.date == state.checkpoint and fingerprint not in state.seen)
+    ]
+
+
+def _fingerprints(events: list[GroupAuditEventInfo]) -> Iterator[tuple[str, GroupAuditEventInfo]]:
+    """
+    Identify each event, since they have no ID.
+
+    Identical events (the same member added twice in the same second, after being removed) are
+    told apart by their number of occurrences, counting from the oldest.
+    """
+    occurrences: Counter[str] = Counter()
+    fingerprints = []
+    for event in reversed(events):
+        member = event.member.account_id if isinstance(event, GroupAuditAccountEventInfo) else event.member.id
+        key = f'{format_timestamp(event.date)}|{event.type}|{member}|{event.user.account_id}'
+        occurrences[key] += 1
+        fingerprints.append((sha1(f'{key}|{occurrences[key]}'.encode()).hexdigest(), event))  # noqa: S324
+    return reversed(fingerprints)
+
+
+def _apply(event: GroupAuditEventInfo, state: GroupState) -> None:
+    if isinstance(event, GroupAuditAccountEventInfo):
+        if event.type == 'ADD_USER':
+            state.members.add(event.member.account_id)
+        else:
+            state.members.discard(event.member.account_id)
+    elif event.type == 'ADD_GROUP':
+        state.subgroups.add(event.member.id)
+    else:
+        state.subgroups.discard(event.member.id)
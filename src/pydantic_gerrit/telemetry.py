@@ -0,0 +1,280 @@
+"""
+Opt-in validation telemetry: how many validations of each type, how long they take, and which
+unknown fields make them fail.
+
+    recorder = telemetry.enable(sample_rate=0.1)
+    ...  # parse_response(), the client, ingest(), replay()
+    metrics.push(recorder.snapshot())
+
+The validations recorded are the ones made by this package with its TypeAdapters: parse_response()
+(and so the client), ingest() and replay(). The other validations, like `GroupInfo.model_validate()`
+or `TypeAdapter(GroupAuditEventInfo).validate_python()` in the caller code, are not recorded: use
+parse_response() or wrap them with call():
+
+    group = telemetry.call(GroupInfo, 0, GroupInfo.model_validate, data)
+
+Each validation is recorded by its type (`GroupInfo`, `list[GroupInfo]`, ...) and by the version
+package that defines its models: `latest`, unless a version package redefines them (the version
+packages import the unchanged models from `latest`). The metrics are the number of validations and
+of failures, the total time, the total size of the JSON input and the latency percentiles. The
+percentiles come from a bounded random sample of `max_samples` latencies per type, and only a
+`sample_rate` fraction of the validations enter that sample.
+
+The models forbid extra fields, so a Gerrit upgrade that adds fields makes the validations fail.
+The paths of those unknown fields (like `members.new_field`) are counted in every failure, and a
+few of their values are kept as samples, truncated.
+
+When disabled (the default), the only cost is checking for an active recorder on each parsed
+response (see benchmarks/bench_telemetry.py). The models themselves are not instrumented, so their
+methods have no overhead at all. The validations in other processes (like the workers of pydantic_gerrit.ingest.ingest_parallel) are
+not recorded either.
+"""
+
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from random import Random
+from types import UnionType
+from typing import Annotated, Any, Literal, TypeVar, Union, get_args, get_origin
+
+from pydantic import BaseModel, ValidationError
+
+R = TypeVar('R')
+
+MAX_SAMPLES = 1000  # latencies per type
+MAX_FIELD_SAMPLES = 5  # values per unknown field
+MAX_SAMPLE_LENGTH = 100  # characters of each value
+
+PERCENTILES = (50, 90, 99)
+
+Key = tuple[str, str]  # version, type name
+
+
+@dataclass
+class _Stats:
+    count: int = 0
+    errors: int = 0
+    bytes: int = 0
+    nanoseconds: int = 0
+    max_nanoseconds: int = 0
+    samples: list[int] = field(default_factory=list)  # latencies, in nanoseconds
+    sampled: int = 0  # latencies offered to the samples
+
+
+class Telemetry:
+    """The validation metrics, recorded while this is the active recorder (see enable())."""
+
+    def __init__(self, *, sample_rate: float = 1.0, max_samples: int = MAX_SAMPLES, seed: int | None = None) -> None:
+        if not 0 <= sample_rate <= 1:
+            msg = f'sample_rate must be between 0 and 1, got {sample_rate}'
+            raise ValueError(msg)
+        self.sample_rate = sample_rate
+        self.max_samples = max_samples
+        self._random = Random(seed)  # noqa: S311, not for security
+        self._lock = threading.Lock()
+        self._stats: dict[Key, _Stats] = {}
+        self._keys: dict[Any, Key] = {}
+        self._unknown_fields: Counter[tuple[Key, str]] = Counter()
+        self._field_samples: dict[tuple[Key, str], list[str]] = {}
+
+    def call(self, type_: Any, size: int, func: Callable[..., R], *args: Any, **kwargs: Any) -> R:  # noqa: ANN401
+        """Run the validation func(*args, **kwargs) of type_, with an input of size bytes (0 if not JSON)."""
+        start = time.perf_counter_ns()
+        try:
+            result = func(*args, **kwargs)
+        except ValidationError as error:
+            self._record(type_, time.perf_counter_ns() - start, size, error)
+            raise
+        self._record(type_, time.perf_counter_ns() - start, size, None)
+        return result
+
+    def snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        """The metrics so far, as plain JSON-serializable data, sorted by total time."""
+        with self._lock:
+            validations = [_stats_row(key, stats) for key, stats in self._stats.items()]
+            unknown_fields = [
+                {
+                    'version': key[0],
+                    'type': key[1],
+                    'field': path,
+                    'count': count,
+                    'samples': list(self._field_samples.get((key, path), [])),
+                }
+                for (key, path), count in self._unknown_fields.most_common()
+            ]
+        validations.sort(key=lambda x: x['seconds'], reverse=True)
+        return {'validations': validations, 'unknown_fields': unknown_fields}
+
+    def reset(self) -> None:
+        """Forget all the metrics."""
+        with self._lock:
+            self._stats.clear()
+            self._unknown_fields.clear()
+            self._field_samples.clear()
+
+    def _record(self, type_: Any, nanoseconds: int, size: int, error: ValidationError | None) -> None:  # noqa: ANN401
+        key = self._keys.get(type_)
+        if key is None:
+            key = self._keys[type_] = (_version(type_), _type_name(type_))
+        sample = self.sample_rate == 1 or self._random.random() < self.sample_rate
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _Stats()
+            stats.count += 1
+            stats.bytes += size
+            stats.nanoseconds += nanoseconds
+            stats.max_nanoseconds = max(stats.max_nanoseconds, nanoseconds)
+            if sample:
+                # Reservoir sampling: every latency offered has the same chance of being kept
+                stats.sampled += 1
+                if len(stats.samples) < self.max_samples:
+                    stats.samples.append(nanoseconds)
+                else:
+                    index = self._random.randrange(stats.sampled)
+                    if index < self.max_samples:
+                        stats.samples[index] = nanoseconds
+            if error is not None:
+                stats.errors += 1
+                self._record_unknown_fields(key, type_, error, sample=sample)
+
+    def _record_unknown_fields(self, key: Key, type_: Any, error: ValidationError, *, sample: bool) -> None:  # noqa: ANN401
+        for details in error.errors(include_url=False):
+            if details['type'] != 'extra_forbidden':
+                continue
+            path = _field_path(type_, details['loc'])
+            self._unknown_fields[key, path] += 1
+            samples = self._field_samples.setdefault((key, path), [])
+            if sample and len(samples) < MAX_FIELD_SAMPLES:
+                samples.append(repr(details['input'])[:MAX_SAMPLE_LENGTH])
+
+
+_active: Telemetry | None = None
+
+
+def enable(
+    recorder: Telemetry | None = None,
+    *,
+    sample_rate: float = 1.0,
+    max_samples: int = MAX_SAMPLES,
+) -> Telemetry:
+    """Start recording the validations, in the given recorder or in a new one, and return it."""
+    global _active  # noqa: PLW0603
+    _active = recorder or Telemetry(sample_rate=sample_rate, max_samples=max_samples)
+    return _active
+
+
+def disable() -> None:
+    """Stop recording the validations."""
+    global _active  # noqa: PLW0603
+    _active = None
+
+
+def active() -> Telemetry | None:
+    """The recorder enabled, if any."""
+    return _active
+
+
+def call(type_: Any, size: int, func: Callable[..., R], *args: Any, **kwargs: Any) -> R:  # noqa: ANN401
+    """Run the validation func(*args, **kwargs), recording it if enabled. See Telemetry.call()."""
+    recorder = _active
+    if recorder is None:
+        return func(*args, **kwargs)
+    return recorder.call(type_, size, func, *args, **kwargs)
+
+
+def _stats_row(key: Key, stats: _Stats) -> dict[str, Any]:
+    row: dict[str, Any] = {
+        'version': key[0],
+        'type': key[1],
+        'count': stats.count,
+        'errors': stats.errors,
+        'bytes': stats.bytes,
+        'seconds': stats.nanoseconds / 1e9,
+        'max_seconds': stats.max_nanoseconds / 1e9,
+    }
+    samples = sorted(stats.samples)
+    for percentile in PERCENTILES:
+        # Nearest rank
+        value = samples[max(0, -(-percentile * len(samples) // 100) - 1)] / 1e9 if samples else None
+        row[f'p{percentile}_seconds'] = value
+    return row
+
+
+def _models(type_: Any) -> list[type[BaseModel]]:  # noqa: ANN401
+    if isinstance(type_, type) and get_origin(type_) is None:
+        return [type_] if issubclass(type_, BaseModel) else []
+    return [model for arg in get_args(type_) for model in _models(arg)]
+
+
+def _version(type_: Any) -> str:  # noqa: ANN401
+    """The package that defines the models of the type, like `latest` for pydantic_gerrit.latest.groups."""
+    models = _models(type_)
+    if not models:
+        return ''
+    parts = models[0].__module__.split('.')
+    return parts[1] if parts[0] == 'pydantic_gerrit' and len(parts) > 2 else models[0].__module__  # noqa: PLR2004
+
+
+def _type_name(type_: Any) -> str:  # noqa: ANN401
+    origin = get_origin(type_)
+    if origin is Annotated:
+        return _type_name(get_args(type_)[0])
+    if origin in {Union, UnionType}:
+        return ' | '.join(_type_name(x) for x in get_args(type_))
+    if origin is not None:
+        return f'{_type_name(origin)}[{", ".join(_type_name(x) for x in get_args(type_))}]'
+    return getattr(type_, '__name__', repr(type_))
+
+
+def _unwrap(type_: Any) -> Any:  # noqa: ANN401
+    """The type without Annotated and None (as in `X | None`)."""
+    while True:
+        origin = get_origin(type_)
+        if origin is Annotated:
+            type_ = get_args(type_)[0]
+        elif origin in {Union, UnionType} and len(args := [x for x in get_args(type_) if x is not type(None)]) == 1:
+            type_ = args[0]
+        else:
+            return type_
+
+
+def _field_path(type_: Any, loc: tuple[int | str, ...]) -> str:  # noqa: ANN401
+    """
+    The field names of the error location, without the list indexes, the map keys and the union
+    tags: `members.new_field` for `('group-1', 'members', 0, 'new_field')` in a `dict[str, GroupInfo]`.
+    """
+    names: list[str] = []
+    for item in loc:
+        type_ = _unwrap(type_)
+        origin = get_origin(type_)
+        if isinstance(origin, type) and issubclass(origin, Mapping):
+            type_ = get_args(type_)[-1]
+        elif isinstance(origin, type) and issubclass(origin, Sequence | set | frozenset):
+            type_ = get_args(type_)[0]
+        elif origin in {Union, UnionType}:
+            type_ = _union_member(type_, str(item))
+        else:
+            names.append(str(item))
+            type_ = _field_type(type_, str(item))
+    return '.'.join(names)
+
+
+def _union_member(type_: Any, tag: str) -> Any:  # noqa: ANN401
+    """The model of the union with the tag: its class name, or its discriminator value."""
+    for model in _models(type_):
+        if model.__name__ == tag or any(
+            get_origin(x.annotation) is Literal and tag in get_args(x.annotation) for x in model.model_fields.values()
+        ):
+            return model
+    return Any
+
+
+def _field_type(type_: Any, name: str) -> Any:  # noqa: ANN401
+    if isinstance(type_, type) and issubclass(type_, BaseModel):
+        for field_name, info in type_.model_fields.items():
+            if name in {field_name, info.alias}:
+                return info.annotation
+    return Any
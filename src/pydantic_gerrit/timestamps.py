@@ -0,0 +1,159 @@
+"""
+The Gerrit timestamp type.
+
+Gerrit timestamps are UTC, with a space separator and nanoseconds: `2025-07-12 22:04:22.000000000`.
+https://gerrit-review.googlesource.com/Documentation/rest-api.html#timestamp
+
+The models use plain datetime fields, which drop the last three digits, so the value can't be
+sent back to Gerrit as it came. A Timestamp is a datetime that keeps them in its `nanosecond`
+attribute, and it is serialized to JSON in the exact Gerrit format. It is opt-in, since it is
+much slower than the pydantic-core datetime parsing (see benchmarks/bench_timestamps.py): the
+models get Timestamp fields with lossless_type().
+
+    events = parse_response(content, lossless_type(list[GroupAuditEventInfo]))
+    events[0].date.gerrit_format()  # like '2025-07-12 22:04:22.123456789'
+
+The date and time are parsed by the pydantic-core datetime parser: the validator only cuts the
+nanoseconds from the string before it, and adds them to the result. The results are cached by
+their string, since the events of an audit log often share their timestamps.
+
+Like the datetime fields, the timestamps are naive datetimes (no tzinfo), with the UTC date and
+time sent by Gerrit.
+"""
+
+from datetime import datetime
+from typing import Any, SupportsIndex, TypeVar, cast
+
+from pydantic import BaseModel, GetCoreSchemaHandler
+from pydantic_core import CoreSchema, SchemaValidator, core_schema
+
+from pydantic_gerrit._variants import Fields, ModelVariants, subclass
+from pydantic_gerrit.parsing import get_type_adapter
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+TIMESTAMP_PATTERN = r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{9}$'
+TIMESTAMP_LENGTH = len('2025-07-12 22:04:22.000000000')
+
+_NANOSECONDS = TIMESTAMP_LENGTH - 3  # where the digits after the microseconds start
+
+# The timestamps already parsed, by their string: the events of an audit log are often created in
+# bulk, sharing the same timestamps. Emptied when full, cheaper than tracking the least recently used.
+PARSED_CACHE_SIZE = 4096
+_parsed: dict[str, 'Timestamp'] = {}
+
+# Called only for the strings not in the cache: as a wrap validator, the models would pay for its
+# handler in every validation, even of the cached strings.
+_parse_datetime = SchemaValidator(core_schema.datetime_schema()).validate_python
+
+
+class Timestamp(datetime):
+    """
+    A datetime with nanoseconds, as sent by Gerrit.
+
+    The nanoseconds are only kept, not used: comparisons, hashing and arithmetic are the ones of
+    datetime, with microsecond precision.
+    """
+
+    __slots__ = ('_nanosecond',)
+    _nanosecond: int
+
+    @property
+    def nanosecond(self) -> int:
+        """The nanoseconds after the microsecond, 0 to 999."""
+        return getattr(self, '_nanosecond', 0)
+
+    def gerrit_format(self) -> str:
+        """The timestamp in the Gerrit format: `2025-07-12 22:04:22.000000000`."""
+        return format_timestamp(self)
+
+    def __reduce_ex__(self, protocol: SupportsIndex) -> tuple[Any, ...]:
+        # The datetime pickling only keeps the datetime fields
+        return _restore, (self.__class__, super().__reduce_ex__(protocol)[1], self.nanosecond)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> CoreSchema:  # noqa: ANN401
+        return core_schema.no_info_plain_validator_function(
+            _validate,
+            json_schema_input_schema=core_schema.str_schema(pattern=TIMESTAMP_PATTERN),
+            serialization=core_schema.plain_serializer_function_ser_schema(format_timestamp, when_used='json'),
+        )
+
+
+def _restore(cls: type[Timestamp], args: tuple[Any, ...], nanosecond: int) -> Timestamp:
+    timestamp = cls(*args)
+    timestamp._nanosecond = nanosecond
+    return timestamp
+
+
+def parse_timestamp(value: str) -> Timestamp:
+    """
+    Parse a Gerrit timestamp. Like in the validation of the models, the same recent string returns
+    the same instance.
+
+    Other ISO 8601 date and times, as accepted by the pydantic datetime fields, are accepted too.
+    Raises ValueError (a pydantic.ValidationError) for invalid values.
+    """
+    result: Timestamp = get_type_adapter(Timestamp).validate_python(value)
+    return result
+
+
+def lossless_type(type_: Any) -> Any:  # noqa: ANN401
+    """Return the type with its models replaced by their lossless variants: `list[GroupAuditEventInfo]`, etc."""
+    return _VARIANTS.for_type(type_)
+
+
+def lossless_model(model: type[ModelT]) -> type[ModelT]:
+    """Return the lossless variant of the model: a subclass of it, with Timestamp fields instead of datetime."""
+    return _VARIANTS.for_model(model)  # type: ignore[return-value]
+
+
+def _create_variant(model: type[BaseModel], fields: Fields) -> type[BaseModel]:
+    return subclass(model, f'Lossless{model.__name__}', fields, {'__module__': __name__})
+
+
+_VARIANTS = ModelVariants(_create_variant, lambda x: Timestamp if x is datetime else x)
+
+
+def format_timestamp(value: datetime) -> str:
+    """Format a datetime (or Timestamp, keeping its nanoseconds) in the Gerrit format."""
+    nanosecond = value.nanosecond if isinstance(value, Timestamp) else 0
+    return f'{value:%Y-%m-%d %H:%M:%S}.{value.microsecond:06d}{nanosecond:03d}'
+
+
+def _validate(value: Any) -> Timestamp:  # noqa: ANN401
+    if isinstance(value, str):
+        timestamp = _parsed.get(value)
+        if timestamp is None:
+            timestamp = _parse(value)
+            if len(_parsed) >= PARSED_CACHE_SIZE:
+                _parsed.clear()
+            _parsed[value] = timestamp
+        return timestamp
+    if isinstance(value, Timestamp):
+        return value
+    if isinstance(value, datetime):
+        return _timestamp(value)
+    # Not given to the parser, which would take a number, as a Unix time
+    msg = f'Expected a Gerrit timestamp string or a datetime, got {type(value).__name__}'
+    raise ValueError(msg)
+
+
+def _parse(value: str) -> Timestamp:
+    if len(value) == TIMESTAMP_LENGTH and value[_NANOSECONDS:].isdigit():
+        # datetime has no nanoseconds, so they are cut before the parser and kept apart
+        timestamp = _timestamp(_parse_datetime(value[:_NANOSECONDS]))
+        nanosecond = int(value[_NANOSECONDS:])
+        if nanosecond:
+            timestamp._nanosecond = nanosecond  # noqa: SLF001
+        return timestamp
+    if value[4:5] != '-':
+        # Not a date: the parser would take a number, as a Unix time
+        msg = f'Invalid timestamp: {value!r}'
+        raise ValueError(msg)
+    return _timestamp(_parse_datetime(value))
+
+
+def _timestamp(value: datetime) -> Timestamp:
+    # Created from the pickle state of the datetime, 3x faster than passing each of its fields
+    return Timestamp(*cast('tuple[Any, ...]', value.__reduce_ex__(4))[1])
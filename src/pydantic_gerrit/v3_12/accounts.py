@@ -1,4 +1,9 @@
-from pydantic_gerrit.latest.accounts import (  # noqa: F401
+from pydantic_gerrit.latest.accounts import (
     AccountInfo,
     AvatarInfo,
 )
+
+__all__ = [
+    'AccountInfo',
+    'AvatarInfo',
+]
@@ -1,5 +1,7 @@
-from pydantic_gerrit.latest.groups import (  # noqa: F401
+from pydantic_gerrit.latest.groups import (
+    GroupAuditAccountEventInfo,
     GroupAuditEventInfo,
+    GroupAuditGroupEventInfo,
     GroupInfo,
     GroupInput,
     GroupOptionsInfo,
@@ -7,3 +9,15 @@ from pydantic_gerrit.latest.groups import (  # noqa: F401
     GroupsInput,
     MembersInput,
 )
+
+__all__ = [
+    'GroupAuditAccountEventInfo',
+    'GroupAuditEventInfo',
+    'GroupAuditGroupEventInfo',
+    'GroupInfo',
+    'GroupInput',
+    'GroupOptionsInfo',
+    'GroupOptionsInput',
+    'GroupsInput',
+    'MembersInput',
+]
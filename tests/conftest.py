@@ -0,0 +1,12 @@
+from collections.abc import Generator
+
+import pytest
+
+from tests.fake_gerrit import FakeGerrit
+
+
+@pytest.fixture
+def gerrit() -> Generator[FakeGerrit]:
+    """A fake Gerrit serving the recorded groups. Some test modules override it, to serve other groups."""
+    with FakeGerrit() as gerrit:
+        yield gerrit
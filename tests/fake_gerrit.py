@@ -0,0 +1,452 @@
+"""
+A fake Gerrit server, for the tests that can't rely on a real Gerrit instance.
+
+It serves the groups and accounts recorded in `tests/responses/` (or synthetic ones, of any size),
+from a local HTTP server running in a background thread.
+
+For load tests and benchmarks, it can also add latency to the responses and fail a given ratio of
+the requests, reproducibly (the failures come from a seeded random generator).
+"""
+
+import re
+import time
+from copy import deepcopy
+from datetime import datetime, timezone
+from hashlib import sha1
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps, loads
+from random import Random
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+from urllib.request import urlopen
+
+from tests import synthetic
+from tests.helpers import GERRIT_RESPONSE_PREFIX, TESTS_RESPONSE_DIR
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+JsonObject = dict[str, Any]
+Params = list[tuple[str, str]]
+
+ADMIN_ACCOUNT_ID = 1000000  # the account making the requests, as in the recorded responses
+
+
+class FakeGerritError(Exception):
+    """Raised by the endpoints to send an error response."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(status, message)
+        self.status = status
+        self.message = message
+
+
+def recorded_groups() -> dict[str, JsonObject]:
+    """The recorded groups, by name, with all the fields activated by the MEMBERS and INCLUDES options."""
+    groups: dict[str, JsonObject] = loads((TESTS_RESPONSE_DIR / 'groups-with-members.json').read_text())
+    includes: dict[str, JsonObject] = loads((TESTS_RESPONSE_DIR / 'groups-with-includes.json').read_text())
+    for name, group in groups.items():
+        group['name'] = name
+        group['includes'] = includes[name]['includes']
+    return groups
+
+
+class FakeGerrit:
+    """
+    Serve the groups and accounts endpoints, like a real Gerrit would.
+
+    Use it as a context manager, the server runs only inside the `with` block:
+
+        with FakeGerrit() as gerrit:
+            gerrit.fetch('groups/', [('o', 'MEMBERS')])
+
+    To simulate failures, add HTTP status codes to `fail_next`: the next requests will fail with
+    them, in order. Or set `error_rate`, to fail that ratio of the requests with `error_status`.
+
+    Every response is delayed by `latency` seconds (plus a random `jitter`), without blocking the
+    other requests, like a remote server would.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        groups: dict[str, JsonObject] | None = None,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+    ) -> None:
+        self.groups = recorded_groups() if groups is None else groups
+        self.accounts: dict[int, JsonObject] = {
+            member['_account_id']: member for group in self.groups.values() for member in group.get('members', [])
+        }
+        self._groups_by_id = {group['id']: group for group in self.groups.values()}
+        self.audit: dict[str, list[JsonObject]] = {}  # by group id, newest first, like Gerrit
+        self.requests: list[str] = []  # the method, path and query string of every request received
+        self.connections = 0  # number of connections accepted
+        self.fail_next: list[int] = []
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = Random(seed)  # noqa: S311
+        self.lock = Lock()
+        self._server = _Server(self)
+        self._thread = Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+
+    @classmethod
+    def synthetic(
+        cls,
+        groups: int,
+        *,
+        members_per_group: int = 10,
+        accounts: int = 1000,
+        subgroups_per_group: int = 2,
+        audit_events_per_group: int = 0,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> 'FakeGerrit':
+        """
+        A server with synthetic groups, see tests/synthetic.py.
+
+        The groups form a hierarchy: each one includes the next `subgroups_per_group` groups of
+        the level below. Each group has `audit_events_per_group` events in its audit log.
+        The other arguments are the same as for the constructor.
+        """
+        data = synthetic.groups_with_members(groups, members_per_group=members_per_group, accounts=accounts)
+        for index, (name, group) in enumerate(data.items()):
+            group['name'] = name
+            first = index * subgroups_per_group + 1
+            group['includes'] = [synthetic.group(x) for x in range(first, min(groups, first + subgroups_per_group))]
+        gerrit = cls(data, **kwargs)
+        if audit_events_per_group:
+            for group in data.values():
+                gerrit.audit[group['id']] = synthetic.audit_events(audit_events_per_group)
+        return gerrit
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host!s}:{port}/a'
+
+    def __enter__(self) -> 'FakeGerrit':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def fetch(self, endpoint: str, params: list[tuple[str, str]]) -> bytes:
+        """GET an endpoint, returning the raw response body. Compatible with pydantic_gerrit.pagination.Fetch."""
+        with urlopen(f'{self.url}/{endpoint}?{urlencode(params)}') as response:  # noqa: S310
+            body: bytes = response.read()
+            return body
+
+    # Lookup helpers
+
+    def find_group(self, name_or_id: str) -> JsonObject:
+        group = self.groups.get(name_or_id) or self._groups_by_id.get(name_or_id)
+        if group is not None:
+            return group
+        for group in self.groups.values():
+            if name_or_id == str(group.get('group_id')):
+                return group
+        raise FakeGerritError(404, f'Not found: {name_or_id}')
+
+    def find_account(self, id_: str) -> JsonObject:
+        if id_ == 'self':
+            id_ = str(ADMIN_ACCOUNT_ID)
+        if id_.isdigit() and int(id_) in self.accounts:
+            return self.accounts[int(id_)]
+        for account in self.accounts.values():
+            if id_ in {str(account['_account_id']), account.get('email'), account.get('username')}:
+                return account
+        raise FakeGerritError(422, f'Account Not Found: {id_}')
+
+    def group_info(self, group: JsonObject, options: set[str] | frozenset[str] = frozenset()) -> JsonObject:
+        output = deepcopy(group)
+        if 'MEMBERS' not in options:
+            output.pop('members', None)
+        if 'INCLUDES' not in options:
+            output.pop('includes', None)
+        return output
+
+    def add_audit_event(self, group: JsonObject, type_: str, member: JsonObject) -> None:
+        event = {
+            'date': synthetic.gerrit_timestamp(datetime.now(timezone.utc)),
+            'member': member,
+            'type': type_,
+            'user': self.accounts[ADMIN_ACCOUNT_ID],
+        }
+        self.audit.setdefault(group['id'], []).insert(0, deepcopy(event))
+
+    # Endpoints
+
+    def list_groups(self, params: Params) -> Any:  # noqa: ANN401
+        options = {value for key, value in params if key == 'o'}
+        query = _param(params, 'query')
+        groups = [self.group_info(group, options) for group in self.groups.values() if _group_matches(group, query)]
+        page, more = _paginate(groups, params)
+
+        if query is None:  # a map, by name
+            return {group.pop('name'): group for group in page}
+        if more:
+            page[-1]['_more_groups'] = True
+        return page
+
+    def get_group(self, params: Params, group_id: str) -> JsonObject:  # noqa: ARG002
+        return self.group_info(self.find_group(group_id))
+
+    def get_group_detail(self, params: Params, group_id: str) -> JsonObject:  # noqa: ARG002
+        return self.group_info(self.find_group(group_id), {'MEMBERS', 'INCLUDES'})
+
+    def create_group(self, params: Params, name: str, data: JsonObject) -> tuple[int, JsonObject]:  # noqa: ARG002
+        if any(name == group['name'] for group in self.groups.values()):
+            raise FakeGerritError(409, f"group '{name}' already exists")
+        group_id = data.get('uuid') or sha1(name.encode()).hexdigest()  # noqa: S324
+        group = {
+            'created_on': synthetic.gerrit_timestamp(datetime.now(timezone.utc)),
+            'group_id': max((x.get('group_id', 0) for x in self.groups.values()), default=0) + 1,
+            'id': group_id,
+            'includes': [],
+            'members': [self.accounts[ADMIN_ACCOUNT_ID]],
+            'name': name,
+            'options': {'visible_to_all': True} if data.get('visible_to_all') else {},
+            'owner': name,
+            'owner_id': group_id,
+            'url': f'#/admin/groups/uuid-{group_id}',
+        }
+        if data.get('description'):
+            group['description'] = data['description']
+        self.groups[name] = self._groups_by_id[group_id] = group
+        return 201, self.group_info(group)
+
+    def list_members(self, params: Params, group_id: str) -> list[JsonObject]:  # noqa: ARG002
+        members: list[JsonObject] = self.find_group(group_id)['members']
+        return members
+
+    def add_members(self, params: Params, group_id: str, data: JsonObject) -> list[JsonObject]:  # noqa: ARG002
+        group = self.find_group(group_id)
+        accounts = [self.find_account(id_) for id_ in _input_ids(data, 'members', '_one_member')]
+        for account in accounts:
+            if account not in group['members']:
+                group['members'].append(account)
+                self.add_audit_event(group, 'ADD_USER', account)
+        return accounts
+
+    def remove_members(self, params: Params, group_id: str, data: JsonObject) -> tuple[int, None]:  # noqa: ARG002
+        group = self.find_group(group_id)
+        for account in [self.find_account(id_) for id_ in _input_ids(data, 'members', '_one_member')]:
+            if account in group['members']:
+                group['members'].remove(account)
+                self.add_audit_event(group, 'REMOVE_USER', account)
+        return 204, None
+
+    def list_subgroups(self, params: Params, group_id: str) -> list[JsonObject]:  # noqa: ARG002
+        includes: list[JsonObject] = self.find_group(group_id)['includes']
+        return includes
+
+    def add_subgroups(self, params: Params, group_id: str, data: JsonObject) -> list[JsonObject]:  # noqa: ARG002
+        group = self.find_group(group_id)
+        subgroups = [self.group_info(self.find_group(id_)) for id_ in _input_ids(data, 'groups', '_one_group')]
+        for subgroup in subgroups:
+            if all(x['id'] != subgroup['id'] for x in group['includes']):
+                group['includes'].append(subgroup)
+                self.add_audit_event(group, 'ADD_GROUP', subgroup)
+        return subgroups
+
+    def remove_subgroups(self, params: Params, group_id: str, data: JsonObject) -> tuple[int, None]:  # noqa: ARG002
+        group = self.find_group(group_id)
+        for id_ in _input_ids(data, 'groups', '_one_group'):
+            subgroup = self.group_info(self.find_group(id_))
+            if any(x['id'] == subgroup['id'] for x in group['includes']):
+                group['includes'] = [x for x in group['includes'] if x['id'] != subgroup['id']]
+                self.add_audit_event(group, 'REMOVE_GROUP', subgroup)
+        return 204, None
+
+    def get_group_options(self, params: Params, group_id: str) -> JsonObject:  # noqa: ARG002
+        options: JsonObject = self.find_group(group_id)['options']
+        return options
+
+    def set_group_options(self, params: Params, group_id: str, data: JsonObject) -> JsonObject:  # noqa: ARG002
+        group = self.find_group(group_id)
+        group['options'] = {'visible_to_all': True} if data.get('visible_to_all') else {}
+        options: JsonObject = group['options']
+        return options
+
+    def get_audit_log(self, params: Params, group_id: str) -> list[JsonObject]:  # noqa: ARG002
+        return self.audit.get(self.find_group(group_id)['id'], [])
+
+    def get_account(self, params: Params, account_id: str) -> JsonObject:  # noqa: ARG002
+        try:
+            account = self.find_account(account_id)
+        except FakeGerritError as error:
+            raise FakeGerritError(404, error.message) from None
+        return account
+
+    def query_accounts(self, params: Params) -> Any:  # noqa: ANN401
+        query = _param(params, 'q') or ''
+        accounts = [deepcopy(account) for account in self.accounts.values() if _account_matches(account, query)]
+        page, more = _paginate(accounts, params)
+        if more:
+            page[-1]['_more_accounts'] = True
+        return page
+
+
+def _param(params: Params, name: str) -> str | None:
+    return next((value for key, value in params if key == name), None)
+
+
+def _paginate(items: list[JsonObject], params: Params) -> tuple[list[JsonObject], bool]:
+    """Apply the `S` (start) and `n` (limit) parameters. Also returns whether there are more items."""
+    start = int(_param(params, 'S') or 0)
+    limit = int(_param(params, 'n') or len(items))
+    return items[start : start + limit], start + limit < len(items)
+
+
+def _input_ids(data: JsonObject, list_field: str, one_field: str) -> list[str]:
+    """The IDs from a MembersInput or GroupsInput."""
+    ids = list(data.get(list_field) or [])
+    if data.get(one_field):
+        ids.append(data[one_field])
+    return [str(x) for x in ids]
+
+
+def _group_matches(group: JsonObject, query: str | None) -> bool:
+    """Supports only `OR` of `inname:`, `name:`, `uuid:` and exact name or UUID matches."""
+    if query is None:
+        return True
+    return any(_group_term_matches(group, term) for term in query.split(' OR '))
+
+
+def _group_term_matches(group: JsonObject, term: str) -> bool:
+    if term.startswith('inname:'):
+        return term.removeprefix('inname:').lower() in group['name'].lower()
+    if term.startswith('name:'):
+        return bool(_unquote_term(term.removeprefix('name:')) == group['name'])
+    if term.startswith('uuid:'):
+        return bool(term.removeprefix('uuid:') == group['id'])
+    return term in {group['name'], group['id']}
+
+
+def _unquote_term(value: str) -> str:
+    """Gerrit query values can be in double quotes or braces, to include spaces."""
+    if len(value) > 1 and value[0] + value[-1] in {'""', '{}'}:
+        return value[1:-1]
+    return value
+
+
+def _account_matches(account: JsonObject, query: str) -> bool:
+    """Supports only `OR` of account IDs, `is:active` and substrings of the name, email or username."""
+    return any(_account_term_matches(account, term) for term in query.split(' OR '))
+
+
+def _account_term_matches(account: JsonObject, term: str) -> bool:
+    if term == 'is:active':
+        return not account.get('inactive', False)
+    if term.isdigit():
+        return bool(int(term) == account['_account_id'])
+    return any(term.lower() in str(account.get(field, '')).lower() for field in ('name', 'email', 'username'))
+
+
+# (method, path regex) -> FakeGerrit method name, called as endpoint(params, *path groups[, request data])
+ROUTES = [
+    (method, re.compile(f'/a/{path}'), endpoint)
+    for method, path, endpoint in [
+        ('GET', r'groups/', 'list_groups'),
+        ('GET', r'groups/([^/]+)', 'get_group'),
+        ('PUT', r'groups/([^/]+)', 'create_group'),
+        ('GET', r'groups/([^/]+)/detail', 'get_group_detail'),
+        ('GET', r'groups/([^/]+)/members/?', 'list_members'),
+        ('POST', r'groups/([^/]+)/members', 'add_members'),
+        ('POST', r'groups/([^/]+)/members\.delete', 'remove_members'),
+        ('GET', r'groups/([^/]+)/groups/?', 'list_subgroups'),
+        ('POST', r'groups/([^/]+)/groups', 'add_subgroups'),
+        ('POST', r'groups/([^/]+)/groups\.delete', 'remove_subgroups'),
+        ('GET', r'groups/([^/]+)/options', 'get_group_options'),
+        ('PUT', r'groups/([^/]+)/options', 'set_group_options'),
+        ('GET', r'groups/([^/]+)/log\.audit', 'get_audit_log'),
+        ('GET', r'accounts/', 'query_accounts'),
+        ('GET', r'accounts/([^/]+)', 'get_account'),
+    ]
+]
+
+
+class _Server(ThreadingHTTPServer):
+    request_queue_size = 1024  # the default (5) drops the connections of concurrent clients
+
+    def __init__(self, gerrit: FakeGerrit) -> None:
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.gerrit = gerrit
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    server: _Server
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.gerrit.lock:
+            self.server.gerrit.connections += 1
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.handle_request()
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.handle_request()
+
+    def do_PUT(self) -> None:  # noqa: N802
+        self.handle_request()
+
+    def handle_request(self) -> None:
+        gerrit = self.server.gerrit
+        url = urlsplit(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        data = loads(self.rfile.read(length)) if length else {}
+
+        with gerrit.lock:
+            gerrit.requests.append(f'{self.command} {self.path}')
+            delay = gerrit.latency + gerrit.random.uniform(0, gerrit.jitter)
+            if gerrit.fail_next:
+                status, output = gerrit.fail_next.pop(0), 'Injected failure'
+            elif gerrit.error_rate and gerrit.random.random() < gerrit.error_rate:
+                status, output = gerrit.error_status, 'Injected failure'
+            else:
+                try:
+                    status, output = self.route(url.path, parse_qsl(url.query, keep_blank_values=True), data)
+                except FakeGerritError as error:
+                    status, output = error.status, error.message
+                # Serialize while holding the lock, the output may be changed by the next requests
+                output = output if status >= 400 or status == 204 else dumps(output)  # noqa: PLR2004
+        if delay:
+            time.sleep(delay)  # outside the lock, so the requests are delayed concurrently
+        self.send_json(status, output)
+
+    def route(self, path: str, params: Params, data: JsonObject) -> tuple[int, Any]:
+        for method, pattern, name in ROUTES:
+            if method == self.command and (match := pattern.fullmatch(path)):
+                endpoint: Callable[..., Any] = getattr(self.server.gerrit, name)
+                args = [unquote(x) for x in match.groups()]
+                result = endpoint(params, *args, data) if method in {'POST', 'PUT'} else endpoint(params, *args)
+                return result if isinstance(result, tuple) else (200, result)
+        raise FakeGerritError(404, 'Not found')
+
+    def send_json(self, status: int, output: Any) -> None:  # noqa: ANN401
+        if status == 204:  # noqa: PLR2004
+            body = b''
+        elif status >= 400:  # noqa: PLR2004
+            body = str(output).encode()  # errors are plain text
+        else:
+            body = f'{GERRIT_RESPONSE_PREFIX}\n{output}'.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if status != 204:  # noqa: PLR2004
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        pass  # keep the test output clean
@@ -1,10 +1,17 @@
+import asyncio
 from json import dumps, loads
 from pathlib import Path
 from pprint import pprint
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import requests
 
+from pydantic_gerrit.aio import AsyncGerritClient
+from pydantic_gerrit.errors import GerritAPIError
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
+
 REPOSITORY_ROOT_DIR = Path(__file__).resolve().parent.parent
 TESTS_DIR = REPOSITORY_ROOT_DIR / 'tests'
 TESTS_RESPONSE_DIR = TESTS_DIR / 'responses'
@@ -14,10 +21,6 @@ GERRIT_URL = f'http://{GERRIT_HOST}/a'
 GERRIT_RESPONSE_PREFIX = ")]}'"
 
 
-class GerritAPIError(RuntimeError):
-    """Custom exception for Gerrit API errors."""
-
-
 def api_call(
     endpoint: str, method: str = 'GET', params: list[tuple[str, str]] | None = None, data: dict[str, Any] | None = None
 ) -> requests.Response:
@@ -39,5 +42,29 @@ def pretty_json(data: Any) -> None:  # noqa: ANN401
     pprint(data, indent=2, width=120)  # noqa: T203
 
 
+def recorded_response(name: str) -> bytes:
+    """The recorded response, as the raw bytes sent by Gerrit."""
+    return GERRIT_RESPONSE_PREFIX.encode() + b'\n' + read_recorded(name)
+
+
+def run(url: str, call: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+    """Run `call(client)` using a new client (with the given options), with no backoff delay between retries."""
+
+    async def main() -> Any:  # noqa: ANN401
+        async with AsyncGerritClient(url, backoff=0, **kwargs) as client:
+            coroutine: Coroutine[Any, Any, Any] = call(client)
+            return await coroutine
+
+    return asyncio.run(main())
+
+
+def read_recorded(name: str) -> bytes:
+    """The JSON of a recorded response file. The records of a JSON Lines file (.jsonl) become a JSON array."""
+    content = (TESTS_RESPONSE_DIR / name).read_bytes()
+    if name.endswith('.jsonl'):
+        return b'[' + b','.join(content.splitlines()) + b']'
+    return content
+
+
 def dump_json_to_file(data: Any, path: Path) -> None:  # noqa: ANN401
     path.write_text(dumps(data, indent=2, sort_keys=True))
@@ -0,0 +1,110 @@
+"""
+Synthetic Gerrit responses, shaped like the recorded ones in `tests/responses/`, but of any size.
+
+The data is deterministic: the same arguments always generate the same data.
+"""
+
+import itertools
+from datetime import datetime, timedelta
+from typing import Any
+
+JsonObject = dict[str, Any]
+
+FIRST_ACCOUNT_ID = 1000000
+FIRST_DATE = datetime(2025, 1, 1)  # noqa: DTZ001
+AVATAR_SIZES = (32, 56, 100, 120)
+
+
+def gerrit_timestamp(date: datetime) -> str:
+    """Format a date like Gerrit does: `2025-07-12 22:04:22.000000000`."""
+    return date.strftime('%Y-%m-%d %H:%M:%S.%f000')
+
+
+def group_uuid(index: int) -> str:
+    return f'{index:040x}'
+
+
+def account(index: int) -> JsonObject:
+    """A detailed AccountInfo, with avatars."""
+    avatar_hash = f'{index:032x}'
+    return {
+        '_account_id': FIRST_ACCOUNT_ID + index,
+        'avatars': [
+            {'height': size, 'url': f'http://www.gravatar.com/avatar/{avatar_hash}.jpg?d=identicon&r=pg&s={size}'}
+            for size in AVATAR_SIZES
+        ],
+        'email': f'user{index}@example.com',
+        'name': f'User {index}',
+        'username': f'user{index}',
+    }
+
+
+def group(
+    index: int, *, members: list[JsonObject] | None = None, includes: list[JsonObject] | None = None
+) -> JsonObject:
+    """A GroupInfo of an internal group, including the name."""
+    uuid = group_uuid(index)
+    data: JsonObject = {
+        'created_on': gerrit_timestamp(FIRST_DATE + timedelta(minutes=index)),
+        'description': f'Description of group {index}',
+        'group_id': index + 1,
+        'id': uuid,
+        'name': f'group-{index}',
+        'options': {'visible_to_all': True} if index % 2 else {},
+        'owner': 'Administrators',
+        'owner_id': group_uuid(0),
+        'url': f'#/admin/groups/uuid-{uuid}',
+    }
+    if members is not None:
+        data['members'] = members
+    if includes is not None:
+        data['includes'] = includes
+    return data
+
+
+def groups_with_members(count: int, *, members_per_group: int = 10, accounts: int = 1000) -> dict[str, JsonObject]:
+    """A `groups/?o=MEMBERS` response: groups by name (without the `name` field)."""
+    pool = [account(i) for i in range(accounts)]
+    groups = {}
+    for index in range(count):
+        data = group(index, members=[pool[(index + i) % accounts] for i in range(members_per_group)])
+        groups[data.pop('name')] = data
+    return groups
+
+
+def audit_events(count: int, *, accounts: int = 100, groups: int = 100) -> list[JsonObject]:
+    """A `groups/<id>/log.audit` response, newest first. One event in ten adds or removes a group."""
+    events = []
+    for index in range(count):
+        if index % 10:
+            event_type = 'ADD_USER' if index % 3 else 'REMOVE_USER'
+            member = account(index % accounts)
+        else:
+            event_type = 'ADD_GROUP' if index % 3 else 'REMOVE_GROUP'
+            member = group(index % groups)
+        events.append(
+            {
+                'date': gerrit_timestamp(FIRST_DATE + timedelta(seconds=count - index)),
+                'member': member,
+                'type': event_type,
+                'user': account(0),
+            }
+        )
+    return events
+
+
+def includes_tree(depth: int, fanout: int) -> JsonObject:
+    """A GroupInfo with nested `includes`, `depth` levels deep, each group with `fanout` subgroups."""
+    counter = itertools.count()
+
+    def build(level: int) -> JsonObject:
+        index = next(counter)
+        includes = [build(level + 1) for _ in range(fanout)] if level < depth else []
+        return group(index, includes=includes)
+
+    return build(0)
+
+
+def tree_size(depth: int, fanout: int) -> int:
+    """The number of groups in an includes_tree()."""
+    return sum(fanout**level for level in range(depth + 1))
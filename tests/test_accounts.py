@@ -1,5 +1,6 @@
+from pydantic_gerrit.errors import GerritAPIError
 from pydantic_gerrit.v3_12.accounts import AccountInfo
-from tests.helpers import GerritAPIError, api_call, parse_response_text
+from tests.helpers import api_call, parse_response_text
 
 
 def get_account(account_id: str) -> AccountInfo | None:
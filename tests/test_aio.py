@@ -0,0 +1,182 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from pydantic_gerrit.aio import AsyncGerritClient, GerritAPIError
+from pydantic_gerrit.aio._http import Connection, ConnectionPool
+from pydantic_gerrit.v3_12.accounts import AccountInfo
+from pydantic_gerrit.v3_12.groups import (
+    GroupAuditAccountEventInfo,
+    GroupAuditGroupEventInfo,
+    GroupInfo,
+    GroupInput,
+    GroupOptionsInput,
+    GroupsInput,
+    MembersInput,
+)
+from tests.fake_gerrit import ADMIN_ACCOUNT_ID, FakeGerrit
+from tests.helpers import run
+
+
+def test_get_group(gerrit: FakeGerrit) -> None:
+    group = run(gerrit.url, lambda client: client.get_group('Administrators'))
+    assert isinstance(group, GroupInfo)
+    assert group.name == 'Administrators'
+    assert group.members is None
+
+
+def test_get_group_detail(gerrit: FakeGerrit) -> None:
+    group = run(gerrit.url, lambda client: client.get_group_detail('test-group-4'))
+    assert group.members == [AccountInfo.model_validate(gerrit.accounts[ADMIN_ACCOUNT_ID])]
+    assert [x.name for x in group.includes] == ['Administrators', 'Service Users']
+
+
+def test_query_and_list_groups(gerrit: FakeGerrit) -> None:
+    groups = run(gerrit.url, lambda client: client.query_groups('inname:users', limit=1))
+    assert [x.name for x in groups] == ['Blocked Users']
+    assert groups[-1].more_groups is True
+
+    groups = run(gerrit.url, lambda client: client.list_groups(options=['MEMBERS']))
+    assert list(groups) == list(gerrit.groups)
+    assert all(x.members is not None for x in groups.values())
+
+
+def test_create_group(gerrit: FakeGerrit) -> None:
+    input_ = GroupInput(description='new group', visible_to_all=True)
+    group = run(gerrit.url, lambda client: client.create_group('new group', input_))
+    assert group.name == 'new group'
+    assert group.description == 'new group'
+    assert group.options.visible_to_all is True
+
+    with pytest.raises(GerritAPIError) as error:
+        run(gerrit.url, lambda client: client.create_group('new group'))
+    assert error.value.status == 409  # noqa: PLR2004
+
+
+def test_members(gerrit: FakeGerrit) -> None:
+    async def call(client: AsyncGerritClient) -> list[list[AccountInfo]]:
+        await client.remove_members('test-group-4', MembersInput(_one_member=str(ADMIN_ACCOUNT_ID)))
+        removed = await client.list_members('test-group-4')
+        added = await client.add_members('test-group-4', MembersInput(members=['admin@example.com']))
+        return [removed, added, await client.list_members('test-group-4')]
+
+    removed, added, members = run(gerrit.url, call)
+    assert removed == []
+    assert [x.account_id for x in added] == [ADMIN_ACCOUNT_ID]
+    assert members == added
+
+
+def test_subgroups(gerrit: FakeGerrit) -> None:
+    async def call(client: AsyncGerritClient) -> list[list[GroupInfo]]:
+        added = await client.add_subgroups('Administrators', GroupsInput(groups=['Service Users']))
+        await client.remove_subgroups('Administrators', GroupsInput(_one_group='Service Users'))
+        return [added, await client.list_subgroups('Administrators')]
+
+    added, subgroups = run(gerrit.url, call)
+    assert [x.name for x in added] == ['Service Users']
+    assert subgroups == []
+
+
+def test_options(gerrit: FakeGerrit) -> None:
+    async def call(client: AsyncGerritClient) -> list[Any]:
+        options = await client.set_group_options('Administrators', GroupOptionsInput(visible_to_all=True))
+        return [options, await client.get_group_options('Administrators')]
+
+    options, current = run(gerrit.url, call)
+    assert options.visible_to_all is True
+    assert current == options
+
+
+def test_audit_log(gerrit: FakeGerrit) -> None:
+    async def call(client: AsyncGerritClient) -> Any:  # noqa: ANN401
+        await client.add_subgroups('Administrators', GroupsInput(groups=['Service Users']))
+        await client.remove_members('Administrators', MembersInput(members=['admin']))
+        return await client.get_audit_log('Administrators')
+
+    events = run(gerrit.url, call)
+    assert [type(x) for x in events] == [GroupAuditAccountEventInfo, GroupAuditGroupEventInfo]
+    assert [x.type for x in events] == ['REMOVE_USER', 'ADD_GROUP']
+
+
+def test_accounts(gerrit: FakeGerrit) -> None:
+    account = run(gerrit.url, lambda client: client.get_account('self'))
+    assert account.account_id == ADMIN_ACCOUNT_ID
+
+    accounts = run(gerrit.url, lambda client: client.query_accounts('admin', options=['DETAILS']))
+    assert accounts == [account]
+
+    with pytest.raises(GerritAPIError) as error:
+        run(gerrit.url, lambda client: client.get_account(123))
+    assert error.value.status == 404  # noqa: PLR2004
+
+
+def test_connections_are_reused(gerrit: FakeGerrit) -> None:
+    max_concurrency = 3
+
+    async def call(client: AsyncGerritClient) -> list[GroupInfo]:
+        return await asyncio.gather(*(client.get_group('Administrators') for _ in range(30)))
+
+    groups = run(gerrit.url, call, max_concurrency=max_concurrency)
+    assert len(groups) == len(gerrit.requests)
+    assert 1 <= gerrit.connections <= max_concurrency
+
+
+def test_retry(gerrit: FakeGerrit) -> None:
+    gerrit.fail_next = [503, 502]
+    group = run(gerrit.url, lambda client: client.get_group('Administrators'), retries=2)
+    assert group.name == 'Administrators'
+    assert len(gerrit.requests) == 3  # noqa: PLR2004
+
+
+def test_retry_gives_up(gerrit: FakeGerrit) -> None:
+    gerrit.fail_next = [503, 503, 503]
+    with pytest.raises(GerritAPIError) as error:
+        run(gerrit.url, lambda client: client.get_group('Administrators'), retries=2)
+    assert error.value.status == 503  # noqa: PLR2004
+
+
+def test_retries_wait_without_blocking_the_other_requests(gerrit: FakeGerrit, monkeypatch: pytest.MonkeyPatch) -> None:
+    gerrit.fail_next = [503]
+    monkeypatch.setattr(AsyncGerritClient, '_backoff_delay', lambda *_: 0.2)
+
+    async def call(client: AsyncGerritClient) -> tuple[GroupInfo, GroupInfo]:
+        return await asyncio.gather(client.get_group('Administrators'), client.get_group('Service Users'))
+
+    run(gerrit.url, call, max_concurrency=1, retries=1)
+    # The second request is sent while the first one waits to be retried
+    assert [x.split('/')[-1] for x in gerrit.requests] == ['Administrators', 'Service%20Users', 'Administrators']
+
+
+def test_timeout_covers_the_whole_attempt(gerrit: FakeGerrit, monkeypatch: pytest.MonkeyPatch) -> None:
+    gerrit.latency = 0.15
+    acquire = ConnectionPool.acquire
+
+    async def slow_acquire(pool: ConnectionPool) -> Connection:
+        await asyncio.sleep(0.15)
+        return await acquire(pool)
+
+    monkeypatch.setattr(ConnectionPool, 'acquire', slow_acquire)
+    # Each step alone is within the timeout, but not both
+    with pytest.raises(asyncio.TimeoutError):
+        run(gerrit.url, lambda client: client.get_group('Administrators'), timeout=0.2, retries=0)
+
+
+def test_no_retry_on_client_errors(gerrit: FakeGerrit) -> None:
+    gerrit.fail_next = [400]
+    with pytest.raises(GerritAPIError):
+        run(gerrit.url, lambda client: client.get_group('Administrators'))
+    assert len(gerrit.requests) == 1
+
+
+def test_connection_error_after_retries() -> None:
+    with FakeGerrit() as gerrit:
+        url = gerrit.url  # the server is stopped at the end of the block
+
+    with pytest.raises(OSError, match='Connect'):
+        run(url, lambda client: client.get_group('Administrators'), retries=1)
+
+
+def test_invalid_max_concurrency() -> None:
+    with pytest.raises(ValueError, match='max_concurrency'):
+        AsyncGerritClient('http://localhost', max_concurrency=0)
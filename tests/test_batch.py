@@ -0,0 +1,87 @@
+import asyncio
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+
+from pydantic_gerrit.aio import AsyncGerritClient
+from pydantic_gerrit.aio.batch import get_accounts, get_groups, group_term, plan_queries
+from tests import synthetic
+from tests.fake_gerrit import FakeGerrit
+from tests.helpers import run
+
+GROUPS = 30
+
+
+@pytest.fixture
+def gerrit() -> Generator[FakeGerrit]:
+    with FakeGerrit.synthetic(GROUPS, members_per_group=3, accounts=50) as gerrit:
+        yield gerrit
+
+
+def test_plan_queries() -> None:
+    assert plan_queries([]) == []
+    assert plan_queries(['a', 'b', 'c'], max_terms=2) == ['a OR b', 'c']
+    # 'a%20OR%20b' is 10 characters long
+    assert plan_queries(['a', 'b', 'c'], max_length=10) == ['a OR b', 'c']
+    assert plan_queries(['a', 'b', 'c'], max_length=9) == ['a', 'b', 'c']
+    assert plan_queries(['too long'], max_length=1) == ['too long']
+
+
+@pytest.mark.parametrize(
+    ('group_id', 'term'),
+    [
+        (synthetic.group_uuid(1), f'uuid:{synthetic.group_uuid(1)}'),
+        ('Service Users', 'name:"Service Users"'),
+        ('a "quoted" name', 'name:{a "quoted" name}'),
+        ('a "{quoted}" name', None),
+        ('123', None),
+    ],
+)
+def test_group_term(group_id: str, term: str | None) -> None:
+    assert group_term(group_id) == term
+
+
+@pytest.mark.parametrize('detail', [False, True])
+def test_get_groups_same_as_per_item_calls(gerrit: FakeGerrit, *, detail: bool) -> None:
+    ids = [f'group-{i}' for i in range(0, GROUPS, 2)] + [synthetic.group_uuid(i) for i in range(1, GROUPS, 2)]
+    groups = run(gerrit.url, lambda client: get_groups(client, ids, detail=detail, max_terms=10))
+    assert len(gerrit.requests) == 3  # noqa: PLR2004
+
+    async def per_item(client: AsyncGerritClient) -> list[Any]:
+        fetch = client.get_group_detail if detail else client.get_group
+        return list(await asyncio.gather(*(fetch(x) for x in ids)))
+
+    assert list(groups.values()) == run(gerrit.url, per_item)
+    assert list(groups) == ids
+
+
+def test_get_groups_falls_back_to_per_item_calls(gerrit: FakeGerrit) -> None:
+    ids = ['group-1', '3', 'group-1', 'unknown', 'group-2']  # 3 is a legacy numeric ID
+    groups = run(gerrit.url, lambda client: get_groups(client, ids))
+    assert {k: v.name for k, v in groups.items()} == {'group-1': 'group-1', '3': 'group-2', 'group-2': 'group-2'}
+    assert sorted(x.split('?')[0] for x in gerrit.requests) == [
+        'GET /a/groups/',
+        'GET /a/groups/3',
+        'GET /a/groups/unknown',
+    ]
+
+
+def test_get_groups_refetches_truncated_pages(gerrit: FakeGerrit) -> None:
+    ids = [f'group-{i}' for i in range(5)]
+    gerrit.groups['group-5']['name'] = 'group-0'  # same name: the query returns one more group than asked
+    groups = run(gerrit.url, lambda client: get_groups(client, ids))
+    assert all(x.more_groups is None for x in groups.values())
+    assert len(gerrit.requests) == 2  # noqa: PLR2004
+
+
+def test_get_accounts_same_as_per_item_calls(gerrit: FakeGerrit) -> None:
+    ids: list[int | str] = [synthetic.FIRST_ACCOUNT_ID + i for i in range(20)]
+    ids += [str(synthetic.FIRST_ACCOUNT_ID + 20), 'user21', 999]
+    accounts = run(gerrit.url, lambda client: get_accounts(client, ids, max_terms=10))
+
+    async def per_item(client: AsyncGerritClient) -> list[Any]:
+        return list(await asyncio.gather(*(client.get_account(x) for x in ids[:-1])))
+
+    assert list(accounts) == ids[:-1]
+    assert list(accounts.values()) == run(gerrit.url, per_item)
@@ -0,0 +1,177 @@
+import asyncio
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+from pydantic_gerrit.aio import AsyncGerritClient
+from pydantic_gerrit.cache import ResponseCache
+from pydantic_gerrit.latest.groups import GroupInfo, MembersInput
+from tests.fake_gerrit import FakeGerrit
+from tests.helpers import TESTS_RESPONSE_DIR, run
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl() -> None:
+    clock = Clock()
+    cache = ResponseCache(ttl=10, clock=clock)
+    cache.set('a', b'1')
+    clock.now += 9
+    assert cache.get('a') == b'1'
+    clock.now += 1
+    assert cache.get('a') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_expired_entries_are_removed() -> None:
+    clock = Clock()
+    cache = ResponseCache(ttl=10, clock=clock)
+    cache.set('a', b'1')
+    clock.now += 10
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction() -> None:
+    cache = ResponseCache(max_entries=2)
+    cache.set('a', b'1')
+    cache.set('b', b'2')
+    cache.get('a')
+    cache.set('c', b'3')
+    assert [cache.get(x) for x in 'abc'] == [b'1', None, b'3']
+    assert len(cache) == 2  # noqa: PLR2004
+
+
+def test_invalidate() -> None:
+    cache = ResponseCache()
+    for key in ('groups/a', 'groups/b', 'accounts/self'):
+        cache.set(key, key.encode())
+    cache.invalidate('groups/')
+    assert [cache.get(x) for x in ('groups/a', 'groups/b', 'accounts/self')] == [None, None, b'accounts/self']
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_generations() -> None:
+    cache = ResponseCache()
+    assert cache.generation('groups/a') == cache.generation('accounts/self') == 0
+    cache.invalidate('groups/')
+    assert (cache.generation('groups/a'), cache.generation('accounts/self')) == (1, 0)
+    cache.invalidate()
+    assert (cache.generation('groups/a'), cache.generation('accounts/self')) == (2, 1)
+
+
+def test_key() -> None:
+    assert ResponseCache.key('groups/', [('o', 'MEMBERS'), ('o', 'INCLUDES')]) == 'groups/?o=MEMBERS&o=INCLUDES'
+    assert ResponseCache.key('groups/x', []) == 'groups/x?'
+
+
+def test_persistence(tmp_path: Path) -> None:
+    path = tmp_path / 'cache.sqlite'
+    clock = Clock()
+    content = (TESTS_RESPONSE_DIR / 'groups-with-members.json').read_bytes()
+
+    cache = ResponseCache(ttl=10, path=path, clock=clock)
+    cache.set('groups', content)
+    cache.set('other', b'1')
+    cache.invalidate('other')
+    cache.close()
+
+    cache = ResponseCache(ttl=10, path=path, clock=clock)
+    assert cache.get('groups') == content
+    assert cache.get('other') is None
+    cache.close()
+
+    # The expired entries are removed when opening
+    clock.now += 10
+    cache = ResponseCache(ttl=10, path=path, clock=clock)
+    assert cache.get('groups') is None
+    cache.close()
+
+
+def test_persistence_expired_rows(tmp_path: Path) -> None:
+    path = tmp_path / 'cache.sqlite'
+    clock = Clock()
+    writer = ResponseCache(ttl=10, path=path, clock=clock)
+    reader = ResponseCache(ttl=10, max_entries=1, path=path, clock=clock)  # sharing the database
+    writer.set('old', b'1')
+    clock.now += 10
+    writer.set('live', b'2')
+    assert reader.get('live') == b'2'
+
+    # The expired row is deleted, and does not push the live entry out of memory
+    assert reader.get('old') is None
+    with closing(sqlite3.connect(path)) as db:
+        assert db.execute('SELECT key FROM responses').fetchall() == [('live',)]
+    writer.close()
+    reader.close()
+    assert reader.get('live') == b'2'
+
+
+def test_persistence_max_entries(tmp_path: Path) -> None:
+    path = tmp_path / 'cache.sqlite'
+    clock = Clock()
+    cache = ResponseCache(max_entries=2, path=path, clock=clock)
+    for key in 'abc':
+        clock.now += 1
+        cache.set(key, key.encode())
+    cache.close()
+
+    cache = ResponseCache(max_entries=2, path=path, clock=clock)
+    assert [cache.get(x) for x in 'abc'] == [None, b'b', b'c']
+    cache.close()
+
+
+def test_client_reuses_the_cached_responses(gerrit: FakeGerrit) -> None:
+    cache = ResponseCache()
+    first = run(gerrit.url, lambda client: client.get_group_detail('test-group-4'), cache=cache)
+    second = run(gerrit.url, lambda client: client.get_group_detail('test-group-4'), cache=cache)
+    assert second == first
+    assert second is not first  # each caller has its own models
+    assert len(gerrit.requests) == 1
+    run(gerrit.url, lambda client: client.list_groups(options=['MEMBERS']), cache=cache)
+    run(gerrit.url, lambda client: client.list_groups(), cache=cache)
+    assert len(gerrit.requests) == 3  # noqa: PLR2004
+
+
+def test_client_invalidates_on_mutations(gerrit: FakeGerrit) -> None:
+    cache = ResponseCache()
+
+    async def detail_add_detail(client: AsyncGerritClient) -> tuple[GroupInfo, GroupInfo]:
+        account = await client.get_account('self')
+        before = await client.get_group_detail('Service Users')
+        await client.add_members('Service Users', MembersInput(members=[str(account.account_id)]))
+        after = await client.get_group_detail('Service Users')
+        await client.get_account('self')
+        return before, after
+
+    before, after = run(gerrit.url, detail_add_detail, cache=cache)
+    assert len(after.members) == len(before.members or []) + 1
+    assert [x.split('?')[0] for x in gerrit.requests] == [
+        'GET /a/accounts/self',
+        'GET /a/groups/Service%20Users/detail',
+        'POST /a/groups/Service%20Users/members',
+        'GET /a/groups/Service%20Users/detail',
+    ]
+
+
+def test_client_does_not_cache_responses_older_than_a_change() -> None:
+    cache = ResponseCache()
+
+    async def detail_during_change(client: AsyncGerritClient) -> None:
+        detail = asyncio.create_task(client.get_group_detail('test-group-4'))
+        await asyncio.sleep(0.05)  # the GET is waiting for the response
+        cache.invalidate('groups/')  # like a change made by another task
+        await detail
+
+    with FakeGerrit(latency=0.2) as gerrit:
+        run(gerrit.url, detail_during_change, cache=cache)
+        assert len(cache) == 0
+        run(gerrit.url, lambda client: client.get_group_detail('test-group-4'), cache=cache)
+        assert len(cache) == 1
@@ -0,0 +1,90 @@
+from array import array
+from datetime import datetime, timedelta, timezone
+from json import dumps
+
+import pytest
+
+from pydantic_gerrit.columnar import (
+    MISSING,
+    NANOSECONDS_PER_DAY,
+    account_table,
+    account_table_json,
+    audit_event_table,
+    audit_event_table_json,
+    group_tables,
+    group_tables_json,
+    nanoseconds,
+)
+from pydantic_gerrit.parsing import parse_response
+from pydantic_gerrit.timestamps import parse_timestamp
+from pydantic_gerrit.v3_12.accounts import AccountInfo
+from pydantic_gerrit.v3_12.groups import GroupAuditEventInfo, GroupInfo
+from tests import synthetic
+from tests.helpers import recorded_response
+
+
+@pytest.mark.parametrize('name', ['groups.json', 'groups-with-members.json', 'groups-with-includes.json'])
+def test_group_tables_same_from_models_and_json(name: str) -> None:
+    content = recorded_response(name)
+    assert group_tables(parse_response(content, dict[str, GroupInfo])) == group_tables_json(content)
+
+
+def test_group_tables() -> None:
+    groups = [
+        synthetic.group(0, members=[synthetic.account(0), synthetic.account(1)], includes=[synthetic.group(1)]),
+        {**synthetic.group(1, members=[synthetic.account(1)]), 'created_on': None, 'group_id': None},
+    ]
+    tables = group_tables_json(dumps(groups).encode())
+    assert tables.groups['id'] == [synthetic.group_uuid(0), synthetic.group_uuid(1)]
+    assert tables.groups['name'] == ['group-0', 'group-1']
+    assert tables.groups['group_id'] == array('q', [1, MISSING])
+    assert tables.groups['created_on'][1] == MISSING
+    assert tables.groups['visible_to_all'] == [False, True]
+    assert tables.members == {
+        'group_id': [synthetic.group_uuid(0)] * 2 + [synthetic.group_uuid(1)],
+        'account_id': array('q', [synthetic.FIRST_ACCOUNT_ID + x for x in (0, 1, 1)]),
+    }
+    assert tables.includes == {'group_id': [synthetic.group_uuid(0)], 'subgroup_id': [synthetic.group_uuid(1)]}
+    assert tables.accounts['account_id'] == array('q', [synthetic.FIRST_ACCOUNT_ID, synthetic.FIRST_ACCOUNT_ID + 1])
+    assert tables.accounts['email'] == ['user0@example.com', 'user1@example.com']
+    assert group_tables([GroupInfo.model_validate(x) for x in groups]) == tables
+
+
+def test_account_table() -> None:
+    accounts = [synthetic.account(i) for i in range(3)]
+    content = dumps(accounts).encode()
+    table = account_table_json(content)
+    assert table['account_id'] == array('q', [synthetic.FIRST_ACCOUNT_ID + i for i in range(3)])
+    assert table['username'] == ['user0', 'user1', 'user2']
+    assert table['inactive'] == [None] * 3
+    assert account_table(parse_response(content, list[AccountInfo])) == table
+
+
+def test_audit_event_table() -> None:
+    content = dumps(synthetic.audit_events(20)).encode()
+    table = audit_event_table_json(content, group_id='g')
+    events = parse_response(content, list[GroupAuditEventInfo])
+    assert audit_event_table(events, group_id='g') == table
+    assert table['type'] == [x.type for x in events]
+    assert table['date'] == array('q', [nanoseconds(x.date) for x in events])
+    assert table['group_id'] == ['g'] * 20
+    # The first event (index 0) is a group event, the others account events
+    assert table['member_account_id'][0] == MISSING
+    assert table['member_group_id'][0] == synthetic.group_uuid(0)
+    assert table['member_account_id'][1] == synthetic.FIRST_ACCOUNT_ID + 1
+    assert table['member_group_id'][1] is None
+    assert set(table['user_id']) == {synthetic.FIRST_ACCOUNT_ID}
+    assert 'group_id' not in audit_event_table_json(content)
+
+
+def test_nanoseconds() -> None:
+    assert nanoseconds(None) == MISSING
+    assert nanoseconds('1970-01-02 00:00:00.000000001') == NANOSECONDS_PER_DAY + 1
+    assert nanoseconds(parse_timestamp('1970-01-01 00:00:01.000001999')) == 1_000_001_999  # noqa: PLR2004
+    assert nanoseconds(datetime(1970, 1, 1, 0, 0, 1)) == 10**9  # noqa: DTZ001
+
+
+def test_nanoseconds_of_aware_dates() -> None:
+    assert nanoseconds(datetime(1970, 1, 1, 0, 0, 1, tzinfo=timezone.utc)) == 10**9
+    assert nanoseconds(datetime(1970, 1, 1, 2, 0, 1, tzinfo=timezone(timedelta(hours=2)))) == 10**9
+    assert nanoseconds('1970-01-01T02:00:01.000001+02:00') == 1_000_001_000  # noqa: PLR2004
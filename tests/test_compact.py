@@ -0,0 +1,81 @@
+import dataclasses
+from json import dumps
+
+import pytest
+
+from pydantic_gerrit.compact import CompactAccount, CompactGroup, CompactGroupOptions
+from pydantic_gerrit.parsing import parse_response
+from pydantic_gerrit.timestamps import lossless_model
+from pydantic_gerrit.v3_12.accounts import AccountInfo
+from pydantic_gerrit.v3_12.groups import GroupInfo, GroupOptionsInfo
+from tests import synthetic
+from tests.helpers import TESTS_RESPONSE_DIR
+
+
+def test_account_round_trip() -> None:
+    account = AccountInfo.model_validate(
+        {**synthetic.account(0), 'secondary_emails': ['a@example.com'], 'tags': ['SERVICE_USER'], 'inactive': True}
+    )
+    compact = CompactAccount.from_model(account)
+    assert compact.secondary_emails == ('a@example.com',)
+    assert compact.avatars is not None
+    assert compact.avatars[0].height == synthetic.AVATAR_SIZES[0]
+    assert compact.to_model() == account
+    assert compact.to_model().model_dump(exclude_unset=True) == account.model_dump(exclude_unset=True)
+
+
+def test_group_round_trip() -> None:
+    content = (TESTS_RESPONSE_DIR / 'groups-with-members.json').read_bytes()
+    for group in parse_response(content, dict[str, GroupInfo]).values():
+        assert CompactGroup.from_model(group).to_model() == group
+
+    data = {'id': 'x', 'options': {}, 'created_on': '2025-01-01 00:00:00.123456789'}
+    group = lossless_model(GroupInfo).model_validate(data)
+    assert CompactGroup.from_model(group).to_model().created_on.nanosecond == 789  # type: ignore[union-attr]  # noqa: PLR2004
+
+    tree = GroupInfo.model_validate(synthetic.includes_tree(3, 2))
+    assert CompactGroup.from_model(tree).to_model() == tree
+
+
+def test_to_model_is_like_model_construct() -> None:
+    group = GroupInfo.model_validate(synthetic.group(0, members=[synthetic.account(0)]))
+    model = CompactGroup.from_model(group).to_model()
+    constructed = GroupInfo.model_construct(**{x: getattr(model, x) for x in model.model_fields_set})
+    for name in ('__dict__', '__pydantic_fields_set__', '__pydantic_extra__', '__pydantic_private__'):
+        assert getattr(model, name) == getattr(constructed, name)
+    assert model.members
+    assert model.members[0].model_fields_set == group.members[0].model_fields_set  # type: ignore[index]
+
+
+def test_not_kept_query_flags() -> None:
+    account = AccountInfo.model_validate({'_account_id': 1, '_more_accounts': True})
+    assert CompactAccount.from_model(account).to_model() == AccountInfo(_account_id=1)
+
+
+def test_identity() -> None:
+    first = CompactAccount.from_model(AccountInfo.model_validate(synthetic.account(0)))
+    renamed = dataclasses.replace(first, name='Renamed')
+    other = CompactAccount.from_model(AccountInfo.model_validate(synthetic.account(1)))
+    assert first == renamed
+    assert first != other
+    assert len({first, renamed, other}) == 2  # noqa: PLR2004
+    assert {first, renamed}.pop().name == first.name  # the set keeps the first one
+    assert CompactGroup('x', name='a') == CompactGroup('x', name='b')
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.name = 'x'  # type: ignore[misc]
+    assert not hasattr(first, '__dict__')
+
+
+def test_shared_options_and_accounts() -> None:
+    options = [CompactGroupOptions.from_model(GroupOptionsInfo(visible_to_all=True)) for _ in range(2)]
+    assert options[0] is options[1]
+
+    data = synthetic.groups_with_members(10, members_per_group=5, accounts=8)
+    groups = parse_response(dumps(data).encode(), dict[str, GroupInfo])
+    accounts: dict[int, CompactAccount] = {}
+    compact = [CompactGroup.from_model(x, accounts) for x in groups.values()]
+    assert len(accounts) == 8  # noqa: PLR2004
+    members = [member for group in compact for member in group.members or ()]
+    assert all(x is accounts[x.account_id] for x in members)
+    assert [x.to_model() for x in compact] == list(groups.values())
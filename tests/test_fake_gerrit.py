@@ -0,0 +1,87 @@
+import asyncio
+import time
+from urllib.error import HTTPError
+
+import pytest
+
+from pydantic_gerrit.aio import AsyncGerritClient, GerritAPIError
+from pydantic_gerrit.latest.groups import GroupAuditEventInfo, GroupInfo
+from pydantic_gerrit.parsing import parse_response
+from tests import synthetic
+from tests.fake_gerrit import FakeGerrit
+
+
+def test_synthetic_groups() -> None:
+    with FakeGerrit.synthetic(7, members_per_group=3, subgroups_per_group=2, audit_events_per_group=5) as gerrit:
+        groups = parse_response(gerrit.fetch('groups/', [('o', 'MEMBERS'), ('o', 'INCLUDES')]), dict[str, GroupInfo])
+        assert list(groups) == [f'group-{i}' for i in range(7)]
+        assert [len(x.members or []) for x in groups.values()] == [3] * 7
+        assert [[y.name for y in x.includes or []] for x in groups.values()][:4] == [
+            ['group-1', 'group-2'],
+            ['group-3', 'group-4'],
+            ['group-5', 'group-6'],
+            [],
+        ]
+
+        group = parse_response(gerrit.fetch(f'groups/{synthetic.group_uuid(3)}', []), GroupInfo)
+        assert group.name == 'group-3'
+        assert group.members is None
+
+        events = parse_response(gerrit.fetch('groups/group-3/log.audit', []), list[GroupAuditEventInfo])
+        assert len(events) == 5  # noqa: PLR2004
+
+
+def test_synthetic_paging() -> None:
+    with FakeGerrit.synthetic(25) as gerrit:
+        groups = parse_response(
+            gerrit.fetch('groups/', [('query', 'inname:group'), ('n', '10'), ('S', '20')]), list[GroupInfo]
+        )
+        assert [x.name for x in groups] == [f'group-{i}' for i in range(20, 25)]
+        assert groups[-1].more_groups is None
+
+
+def status(gerrit: FakeGerrit) -> int:
+    try:
+        gerrit.fetch('groups/group-0', [])
+    except HTTPError as error:
+        return error.code
+    return 200
+
+
+def test_error_rate_is_reproducible() -> None:
+    def statuses(seed: int) -> list[int]:
+        with FakeGerrit.synthetic(1, error_rate=0.5, seed=seed) as gerrit:
+            return [status(gerrit) for _ in range(20)]
+
+    assert statuses(1) == statuses(1)
+    assert set(statuses(1)) == {200, 503}
+
+
+def test_error_rate_is_retried_by_the_client() -> None:
+    async def main(url: str) -> list[GroupInfo]:
+        async with AsyncGerritClient(url, backoff=0, retries=10) as client:
+            return await asyncio.gather(*(client.get_group(f'group-{i}') for i in range(10)))
+
+    with FakeGerrit.synthetic(10, error_rate=0.3) as gerrit:
+        groups = asyncio.run(main(gerrit.url))
+        assert [x.name for x in groups] == [f'group-{i}' for i in range(10)]
+        assert len(gerrit.requests) > len(groups)
+
+    with FakeGerrit.synthetic(1, error_rate=1, error_status=500) as gerrit, pytest.raises(GerritAPIError) as error:
+        asyncio.run(main(gerrit.url))
+    assert error.value.status == 500  # noqa: PLR2004
+
+
+def test_latency_is_concurrent() -> None:
+    latency = 0.1
+    count = 10
+
+    async def main(url: str) -> None:
+        async with AsyncGerritClient(url, max_concurrency=count) as client:
+            await asyncio.gather(*(client.get_group(f'group-{i}') for i in range(count)))
+
+    with FakeGerrit.synthetic(count, latency=latency) as gerrit:
+        start = time.perf_counter()
+        asyncio.run(main(gerrit.url))
+        elapsed = time.perf_counter() - start
+    assert latency <= elapsed < latency * count / 2
@@ -2,10 +2,14 @@ from collections.abc import Generator
 from typing import Any, cast
 
 import pytest
+from pydantic import TypeAdapter
 
+from pydantic_gerrit.recorder import ResponseRecorder
 from pydantic_gerrit.v3_12.accounts import AccountInfo
 from pydantic_gerrit.v3_12.groups import (
+    GroupAuditAccountEventInfo,
     GroupAuditEventInfo,
+    GroupAuditGroupEventInfo,
     GroupInfo,
     GroupInput,
     GroupOptionsInfo,
@@ -214,12 +218,16 @@ def test_group_info_plus_includes() -> None:
 def test_group_audit_event_info() -> None:
     group_id = GROUP4.id
     response = api_call(f'groups/{group_id}/log.audit')
-    parsed_response: dict[str, Any] = parse_response_text(response.text)
+    parsed_response: list[dict[str, Any]] = parse_response_text(response.text)
 
-    # TODO(amj): This file just keeps growing every time pytest is executed :/
-    dump_json_to_file(parsed_response, TESTS_RESPONSE_DIR / 'group-audit-event-info.json')
+    # Every run adds new events, so only the newest ones are kept, oldest first
+    recorder = ResponseRecorder(TESTS_RESPONSE_DIR / 'group-audit-event-info.jsonl', max_records=100)
+    recorder.record_all(reversed(parsed_response))
+    recorder.close()
 
-    validated: list[GroupAuditEventInfo] = [GroupAuditEventInfo.model_validate(data) for data in parsed_response]
+    # GroupAuditEventInfo is a union tagged by `type`, so it is validated using a TypeAdapter
+    # direct validation: GroupAuditEventInfo
+    validated: list[GroupAuditEventInfo] = TypeAdapter(list[GroupAuditEventInfo]).validate_python(parsed_response)
 
     # Make sure our picked group has all the things we want to test
     assert any(x.type == 'ADD_GROUP' for x in validated)  # the group adding is present in the results
@@ -234,6 +242,11 @@ def test_group_audit_event_info() -> None:
     #
     # indirect validation: GroupInfo
     # indirect validation: AccountInfo
+    # indirect validation: GroupAuditAccountEventInfo
+    # indirect validation: GroupAuditGroupEventInfo
+    assert all(isinstance(x, GroupAuditGroupEventInfo) for x in validated if x.type == 'ADD_GROUP')
+    assert all(isinstance(x, GroupAuditAccountEventInfo) for x in validated if x.type == 'ADD_USER')
+    assert all(isinstance(x, GroupAuditAccountEventInfo) for x in validated if x.type == 'REMOVE_USER')
     assert all(isinstance(x.member, GroupInfo) for x in validated if x.type == 'ADD_GROUP')
     assert all(isinstance(x.member, AccountInfo) for x in validated if x.type == 'ADD_USER')
     assert all(isinstance(x.member, AccountInfo) for x in validated if x.type == 'REMOVE_USER')
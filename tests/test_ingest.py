@@ -0,0 +1,118 @@
+from collections import Counter
+from io import BytesIO
+from json import dumps, loads
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from pydantic_gerrit.ingest import JsonSplitter, ingest, ingest_parallel
+from pydantic_gerrit.parsing import parse_response
+from pydantic_gerrit.v3_12.groups import GroupAuditEventInfo, GroupInfo
+from tests import synthetic
+from tests.helpers import TESTS_RESPONSE_DIR
+
+TRICKY_ITEMS = [
+    'a string with [brackets], {braces}, "quotes" and a \\ backslash',
+    {'nested': [1, [2, {'x': ']'}]], 'empty': {}},
+    [],
+    12.5,
+    None,
+]
+
+
+def events_per_user(events: list[Any]) -> Counter[int]:
+    return Counter(x.user.account_id for x in events)
+
+
+@pytest.mark.parametrize('read_size', [1, 3, 7, 1 << 20])
+@pytest.mark.parametrize('prefix', [b'', b")]}'\n"])
+def test_split_array(read_size: int, prefix: bytes) -> None:
+    content = prefix + dumps(TRICKY_ITEMS, indent=2).encode()
+    splitter = JsonSplitter(BytesIO(content), read_size=read_size)
+    items = list(splitter)
+    assert [x[0] for x in items] == [None] * len(TRICKY_ITEMS)
+    assert [loads(x[1]) for x in items] == TRICKY_ITEMS
+    assert splitter.container == '['
+
+
+@pytest.mark.parametrize('read_size', [1, 5, 1 << 20])
+def test_split_map(read_size: int) -> None:
+    data = {f'key {i} ,:{{': item for i, item in enumerate(TRICKY_ITEMS)}
+    splitter = JsonSplitter(BytesIO(dumps(data).encode()), read_size=read_size)
+    assert [(key, loads(value)) for key, value in splitter] == list(data.items())
+    assert splitter.container == '{'
+
+
+def test_split_non_ascii() -> None:
+    # 'é' is two bytes, split between the reads
+    items = ['é' * 3, {'ação': 'ñ'}]
+    splitter = JsonSplitter(BytesIO(dumps(items, ensure_ascii=False).encode()), read_size=1)
+    assert [loads(x[1]) for x in splitter] == items
+
+
+def test_split_deep_and_escaped_items() -> None:
+    deep: Any = ['}']
+    for _ in range(12):  # deeper than the skeleton regular expression
+        deep = {'a': [deep, '\\', '\\"]', '\\\\']}
+    items = [deep, 'x', {'b': '\\\\"{'}, deep]
+    assert [loads(x[1]) for x in JsonSplitter(BytesIO(dumps(items).encode()))] == items
+
+
+def test_split_keeps_the_raw_items() -> None:
+    content = b'[ {"a" : [1, "\\"]"]} ,"x\\u00e9",-1.5e3,true, null]'
+    assert [x[1] for x in JsonSplitter(BytesIO(content), read_size=2)] == [
+        b'{"a" : [1, "\\"]"]}',
+        b'"x\\u00e9"',
+        b'-1.5e3',
+        b'true',
+        b'null',
+    ]
+
+
+@pytest.mark.parametrize('content', [b'[]', b'{}', b")]}'\n[ ]"])
+def test_split_empty(content: bytes) -> None:
+    assert list(JsonSplitter(BytesIO(content))) == []
+
+
+@pytest.mark.parametrize('content', [b'', b'  ', b'"string"'])
+def test_split_no_container(content: bytes) -> None:
+    with pytest.raises(ValueError, match='No JSON array or map'):
+        list(JsonSplitter(BytesIO(content)))
+
+
+@pytest.mark.parametrize('content', [b'[1, {"a": "]', b'[1, 2', b'[12', b'{"a"'])
+def test_split_truncated(content: bytes) -> None:
+    with pytest.raises(ValueError, match='Unexpected end|Invalid JSON'):
+        list(JsonSplitter(BytesIO(content), read_size=4))
+
+
+@pytest.mark.parametrize('content', [b'[1 2]', b'{"a" 1}', b'[1, x]', b'{1: 2}', b'[1,]', b'[tru]'])
+def test_split_invalid(content: bytes) -> None:
+    with pytest.raises(ValueError, match='Invalid JSON'):
+        list(JsonSplitter(BytesIO(content)))
+
+
+def test_ingest_same_as_parse_response() -> None:
+    content = b")]}'\n" + (TESTS_RESPONSE_DIR / 'groups-with-members.json').read_bytes()
+    groups = list(ingest(BytesIO(content), GroupInfo, chunk_size=2))
+    assert groups == list(parse_response(content, dict[str, GroupInfo]).items())
+
+    content = dumps(synthetic.audit_events(25)).encode()
+    events = list(ingest(BytesIO(content), GroupAuditEventInfo, chunk_size=10))
+    assert events == parse_response(content, list[GroupAuditEventInfo])
+
+
+@pytest.mark.parametrize('content', [dumps([synthetic.account(0), {'x': 1}]).encode(), b'[{"id": x}]'])
+def test_ingest_invalid_items(content: bytes) -> None:
+    with pytest.raises(ValidationError):
+        list(ingest(BytesIO(content), GroupInfo))
+
+
+def test_ingest_parallel() -> None:
+    events = synthetic.audit_events(100, accounts=7)
+    results = list(ingest_parallel(BytesIO(dumps(events).encode()), GroupAuditEventInfo, len, workers=2, chunk_size=30))
+    assert results == [30, 30, 30, 10]
+
+    counts = ingest_parallel(BytesIO(dumps(events).encode()), GroupAuditEventInfo, events_per_user, workers=2)
+    assert sum(counts, Counter()) == {synthetic.FIRST_ACCOUNT_ID: 100}
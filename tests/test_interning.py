@@ -0,0 +1,96 @@
+from json import loads
+from typing import Any
+
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+from pydantic_gerrit.interning import InternPool, interned_model, interned_type
+from pydantic_gerrit.parsing import parse_response
+from pydantic_gerrit.v3_12.accounts import AccountInfo, AvatarInfo
+from pydantic_gerrit.v3_12.groups import GroupAuditEventInfo, GroupInfo
+from tests.helpers import TESTS_RESPONSE_DIR, read_recorded
+
+EVENTS: list[dict[str, Any]] = loads(read_recorded('group-audit-event-info.jsonl'))
+
+events_adapter: TypeAdapter[list[GroupAuditEventInfo]] = TypeAdapter(list[GroupAuditEventInfo])
+interned_adapter: TypeAdapter[list[GroupAuditEventInfo]] = TypeAdapter(interned_type(list[GroupAuditEventInfo]))
+
+
+def test_no_interning_by_default() -> None:
+    events = events_adapter.validate_python(EVENTS)
+    assert events[0].user == events[1].user
+    assert events[0].user is not events[1].user
+
+    # Only the interned variants pay for the interning validator
+    assert not AccountInfo.__pydantic_decorators__.model_validators
+    assert interned_model(AccountInfo).__pydantic_decorators__.model_validators
+
+
+def test_interned_type_without_pool() -> None:
+    events = interned_adapter.validate_python(EVENTS)
+    assert isinstance(events[0].user, AccountInfo)
+    assert events[0].user is not events[1].user
+
+
+def test_equal_accounts_share_the_instance() -> None:
+    pool = InternPool()
+    events = interned_adapter.validate_python(EVENTS, context=pool.context)
+
+    # Instances of subclasses of the models, with the same data
+    assert issubclass(interned_model(AccountInfo), AccountInfo)
+    assert all(isinstance(x.user, AccountInfo) for x in events)
+    assert [x.model_dump() for x in events] == [x.model_dump() for x in events_adapter.validate_python(EVENTS)]
+    assert all(x.user is events[0].user for x in events)
+    assert all(x.member is events[0].user for x in events if isinstance(x.member, AccountInfo))
+    # The recorded events have a single account, the admin, with 4 avatars
+    assert len(pool) == 1 + 4
+
+
+def test_shared_instances_are_frozen() -> None:
+    events = interned_adapter.validate_python(EVENTS, context=InternPool().context)
+    with pytest.raises(ValidationError, match='frozen'):
+        events[0].user.name = 'Other name'
+    avatars = events[0].user.avatars
+    assert avatars
+    assert isinstance(avatars[0], AvatarInfo)
+    with pytest.raises(ValidationError, match='frozen'):
+        avatars[0].height = 1
+
+
+def test_different_accounts_are_not_shared() -> None:
+    admin = EVENTS[0]['user']
+    other = {**admin, 'name': 'Other name'}
+    accounts: list[AccountInfo] = TypeAdapter(interned_type(list[AccountInfo])).validate_python(
+        [admin, other, admin], context=InternPool().context
+    )
+
+    assert accounts[0] is accounts[2]
+    assert accounts[0] is not accounts[1]
+    assert accounts[1].name == 'Other name'
+    # The avatars are the same, so they are shared
+    assert accounts[1].avatars == accounts[0].avatars
+    assert all(x is y for x, y in zip(accounts[0].avatars or [], accounts[1].avatars or [], strict=True))
+
+
+def test_pool_is_shared_between_responses() -> None:
+    pool = InternPool()
+    content = (TESTS_RESPONSE_DIR / 'groups-with-members.json').read_bytes()
+    groups = parse_response(content, interned_type(dict[str, GroupInfo]), context=pool.context)
+    content = read_recorded('group-audit-event-info.jsonl')
+    events = parse_response(content, interned_type(list[GroupAuditEventInfo]), context=pool.context)
+
+    admin = groups['Administrators'].members
+    assert admin
+    assert admin[0] is events[0].user
+    assert groups['test-group-4'].members == admin
+    assert groups['test-group-4'].members[0] is admin[0]
+
+
+def test_interned_instances_as_input() -> None:
+    pool = InternPool()
+    account = interned_model(AccountInfo).model_validate(EVENTS[0]['user'], context=pool.context)
+    group = interned_model(GroupInfo).model_validate(
+        {'id': 'x', 'options': {}, 'members': [account, EVENTS[0]['user']]}, context=pool.context
+    )
+    assert group.members == [account, account]
+    assert group.members[1] is account
@@ -0,0 +1,115 @@
+from typing import Any
+
+import pytest
+
+from pydantic_gerrit.membership import MembershipIndex
+from pydantic_gerrit.parsing import parse_response
+from pydantic_gerrit.v3_12.groups import GroupInfo
+from tests import synthetic
+from tests.helpers import TESTS_RESPONSE_DIR
+
+ADMIN = 1000000
+
+
+def make_groups(includes: dict[int, list[int]], members: dict[int, list[int]]) -> list[GroupInfo]:
+    """Groups by index, with their subgroups and member accounts, also by index."""
+    indexes = set(includes) | set(members)
+    return [
+        GroupInfo.model_validate(
+            synthetic.group(
+                i,
+                members=[synthetic.account(x) for x in members.get(i, [])],
+                includes=[synthetic.group(x) for x in includes.get(i, [])],
+            )
+        )
+        for i in sorted(indexes)
+    ]
+
+
+def uuids(*indexes: int) -> frozenset[str]:
+    return frozenset(synthetic.group_uuid(x) for x in indexes)
+
+
+def accounts(*indexes: int) -> frozenset[int]:
+    return frozenset(synthetic.FIRST_ACCOUNT_ID + x for x in indexes)
+
+
+def test_recorded_groups() -> None:
+    groups: dict[str, Any] = {}
+    for name in ('groups-with-members.json', 'groups-with-includes.json'):
+        content = (TESTS_RESPONSE_DIR / name).read_bytes()
+        for key, group in parse_response(content, dict[str, GroupInfo]).items():
+            groups[key] = groups[key].model_copy(update={'includes': group.includes}) if key in groups else group
+    index = MembershipIndex(groups)
+
+    admins, test_group = index.group_id('Administrators'), index.group_id('test-group-4')
+    assert index.is_member(ADMIN, admins)
+    assert index.is_member(ADMIN, test_group)
+    assert index.groups_of(ADMIN) == {admins, test_group}
+    assert index.subgroups(test_group) == {admins, index.group_id('Service Users')}
+    assert index.names[test_group] == 'test-group-4'
+    assert not index.external
+    assert not index.cycles
+
+
+def test_transitive_members() -> None:
+    # 0 includes 1 and 2, 1 includes 3
+    index = MembershipIndex(make_groups({0: [1, 2], 1: [3]}, {0: [0], 1: [1], 2: [2], 3: [3]}))
+    assert index.members(synthetic.group_uuid(0)) == accounts(0, 1, 2, 3)
+    assert index.members(synthetic.group_uuid(1)) == accounts(1, 3)
+    assert index.subgroups(synthetic.group_uuid(0)) == uuids(1, 2, 3)
+    assert index.groups_of(synthetic.FIRST_ACCOUNT_ID + 3) == uuids(0, 1, 3)
+    assert index.groups_of(synthetic.FIRST_ACCOUNT_ID + 9) == frozenset()
+    assert not index.is_member(synthetic.FIRST_ACCOUNT_ID + 2, synthetic.group_uuid(1))
+    assert not index.is_member(ADMIN, 'unknown')
+
+
+def test_cycles() -> None:
+    # 0 -> 1 -> 2 -> 0 is a cycle, 2 also includes 3, 4 includes itself
+    index = MembershipIndex(make_groups({0: [1], 1: [2], 2: [0, 3], 4: [4]}, {1: [1], 3: [3]}))
+    assert sorted(index.cycles, key=len) == [uuids(4), uuids(0, 1, 2)]
+    for group in (0, 1, 2):
+        assert index.members(synthetic.group_uuid(group)) == accounts(1, 3)
+        assert index.subgroups(synthetic.group_uuid(group)) == uuids(0, 1, 2, 3)
+    assert index.subgroups(synthetic.group_uuid(3)) == frozenset()
+    assert index.subgroups(synthetic.group_uuid(4)) == uuids(4)
+
+
+def test_external_groups() -> None:
+    external = {'id': 'ldap:cn=devs', 'options': {}}  # no name: no backend can resolve it
+    group = GroupInfo.model_validate({**synthetic.group(0), 'includes': [external]})
+    index = MembershipIndex([group])
+    assert index.external == {'ldap:cn=devs'}
+    assert 'ldap:cn=devs' in index
+    assert len(index) == 2  # noqa: PLR2004
+    assert index.names['ldap:cn=devs'] is None
+    assert index.members('ldap:cn=devs') == frozenset()
+    assert index.subgroups(group.id) == {'ldap:cn=devs'}
+
+
+def test_unknown_group() -> None:
+    index = MembershipIndex([])
+    with pytest.raises(KeyError):
+        index.members('unknown')
+    with pytest.raises(KeyError):
+        index.group_id('unknown')
+
+
+def test_deep_includes_chain() -> None:
+    # Deeper than the recursion limit
+    depth = 5000
+    index = MembershipIndex(make_groups({i: [i + 1] for i in range(depth)}, {depth: [0]}))
+    assert index.groups_of(synthetic.FIRST_ACCOUNT_ID) == uuids(*range(depth + 1))
+
+
+def test_includes_tree() -> None:
+    tree = synthetic.includes_tree(3, 3)
+    groups = []
+    pending = [tree]
+    while pending:
+        group = pending.pop()
+        pending.extend(group['includes'])
+        # The includes of a groups/?o=INCLUDES response have no nested includes
+        groups.append({**group, 'includes': [synthetic.group(int(x['id'], 16)) for x in group['includes']]})
+    index = MembershipIndex([GroupInfo.model_validate(x) for x in groups])
+    assert len(index.subgroups(tree['id'])) == synthetic.tree_size(3, 3) - 1
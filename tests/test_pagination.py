@@ -0,0 +1,75 @@
+from itertools import islice
+
+import pytest
+
+from pydantic_gerrit.pagination import iter_account_pages, iter_accounts, iter_group_pages, iter_groups
+from tests.fake_gerrit import FakeGerrit
+
+
+@pytest.mark.parametrize('page_size', [1, 2, 3, 4, 100])
+def test_iter_groups_list_all(gerrit: FakeGerrit, page_size: int) -> None:
+    groups = list(iter_groups(gerrit.fetch, page_size=page_size))
+    assert [x.name for x in groups] == list(gerrit.groups)
+    assert all(x.members is None for x in groups)
+
+
+def test_iter_group_pages_sizes(gerrit: FakeGerrit) -> None:
+    pages = list(iter_group_pages(gerrit.fetch, page_size=3))
+    assert [len(page) for page in pages] == [3, 1]
+    assert gerrit.requests[-1].endswith('n=3&S=3')
+
+
+def test_iter_groups_with_query_uses_more_groups(gerrit: FakeGerrit) -> None:
+    pages = list(iter_group_pages(gerrit.fetch, query='inname:users', page_size=1))
+
+    assert [[x.name for x in page] for page in pages] == [['Blocked Users'], ['Service Users']]
+    assert pages[0][-1].more_groups is True
+    assert pages[1][-1].more_groups is None
+    assert len(gerrit.requests) == len(pages)  # no extra request after the last page
+
+
+def test_iter_groups_options(gerrit: FakeGerrit) -> None:
+    groups = list(iter_groups(gerrit.fetch, options=['MEMBERS', 'INCLUDES']))
+    assert all(x.members is not None for x in groups)
+    assert all(x.includes is not None for x in groups)
+
+
+def test_iter_groups_stop_early(gerrit: FakeGerrit) -> None:
+    page_size = 2
+    groups = list(islice(iter_groups(gerrit.fetch, page_size=page_size), page_size))
+    assert len(groups) == page_size
+    assert len(gerrit.requests) == 1  # the second page was never requested
+
+
+def test_iter_groups_start(gerrit: FakeGerrit) -> None:
+    groups = list(iter_groups(gerrit.fetch, start=3))
+    assert [x.name for x in groups] == list(gerrit.groups)[3:]
+
+
+def test_iter_groups_empty(gerrit: FakeGerrit) -> None:
+    assert list(iter_group_pages(gerrit.fetch, query='inname:nothing')) == []
+
+
+def test_iter_accounts(gerrit: FakeGerrit) -> None:
+    accounts = list(iter_accounts(gerrit.fetch, 'admin', page_size=1))
+    assert [x.account_id for x in accounts] == [1000000]
+
+
+def test_iter_account_pages_uses_more_accounts(gerrit: FakeGerrit) -> None:
+    gerrit.accounts[1000001] = {'_account_id': 1000001, 'name': 'Other admin'}
+    pages = list(iter_account_pages(gerrit.fetch, 'admin', page_size=1))
+
+    assert [[x.account_id for x in page] for page in pages] == [[1000000], [1000001]]
+    assert pages[0][-1].more_accounts is True
+    assert len(gerrit.requests) == len(pages)
+
+
+def test_invalid_page_size(gerrit: FakeGerrit) -> None:
+    # Raised by the call itself, before any iteration
+    for function in (iter_groups, iter_group_pages):
+        with pytest.raises(ValueError, match='page_size'):
+            function(gerrit.fetch, page_size=0)
+    for account_function in (iter_accounts, iter_account_pages):
+        with pytest.raises(ValueError, match='page_size'):
+            account_function(gerrit.fetch, 'admin', page_size=0)
+    assert not gerrit.requests
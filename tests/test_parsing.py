@@ -0,0 +1,59 @@
+from typing import Any
+
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+from pydantic_gerrit.parsing import get_type_adapter, parse_response, response_json, strip_response_prefix
+from pydantic_gerrit.v3_12.groups import GroupAuditEventInfo, GroupInfo, GroupOptionsInfo
+from tests.helpers import parse_response_text, recorded_response
+
+
+def test_strip_response_prefix_does_not_copy() -> None:
+    content = bytearray(b")]}'\n[]")
+    view = strip_response_prefix(content)
+    assert view.tobytes() == b'\n[]'
+    assert view.obj is content
+
+
+def test_strip_response_prefix_without_prefix() -> None:
+    assert strip_response_prefix(b'{}').tobytes() == b'{}'
+
+
+def test_response_json() -> None:
+    content = bytearray(b'{}')
+    assert response_json(content) is content
+    assert response_json(b")]}'\n{}") == b'\n{}'
+    assert response_json(memoryview(b'{}')) == b'{}'
+
+
+@pytest.mark.parametrize('wrapper', [bytes, bytearray, memoryview])
+def test_parse_response_buffer_types(wrapper: Any) -> None:  # noqa: ANN401
+    content = recorded_response('groups-with-members.json')
+    groups = parse_response(wrapper(content), dict[str, GroupInfo])
+
+    expected = {key: GroupInfo.model_validate(value) for key, value in parse_response_text(content.decode()).items()}
+    assert groups == expected
+
+
+def test_parse_response_audit_events() -> None:
+    content = recorded_response('group-audit-event-info.jsonl')
+    events = parse_response(content, list[GroupAuditEventInfo])
+
+    expected: list[GroupAuditEventInfo] = TypeAdapter(list[GroupAuditEventInfo]).validate_python(
+        parse_response_text(content.decode())
+    )
+    assert events == expected
+
+
+def test_parse_response_without_prefix() -> None:
+    options = parse_response(b'{"visible_to_all": true}', GroupOptionsInfo)
+    assert options == GroupOptionsInfo(visible_to_all=True)
+
+
+def test_parse_response_invalid() -> None:
+    with pytest.raises(ValidationError):
+        parse_response(b')]}\'\n{"unknown": 1}', GroupOptionsInfo)
+
+
+def test_get_type_adapter_is_cached() -> None:
+    assert get_type_adapter(dict[str, GroupInfo]) is get_type_adapter(dict[str, GroupInfo])
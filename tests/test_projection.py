@@ -0,0 +1,102 @@
+from json import dumps
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from pydantic_gerrit.base import BaseModelGerrit
+from pydantic_gerrit.parsing import parse_response
+from pydantic_gerrit.projection import projection
+from pydantic_gerrit.v3_12.accounts import AccountInfo
+from pydantic_gerrit.v3_12.groups import GroupInfo
+from tests import synthetic
+from tests.helpers import TESTS_RESPONSE_DIR
+
+
+class Team(BaseModelGerrit):
+    leads: tuple[AccountInfo, ...]
+    ids: frozenset[int] = frozenset()
+
+
+def test_projection_has_only_the_selected_fields() -> None:
+    group_ref = projection(GroupInfo, 'id', 'name', 'owner_id')
+    content = (TESTS_RESPONSE_DIR / 'groups-with-members.json').read_bytes()
+    groups: dict[str, Any] = parse_response(content, dict[str, group_ref])  # type: ignore[valid-type]
+    full = parse_response(content, dict[str, GroupInfo])
+    assert list(group_ref.model_fields) == ['id', 'name', 'owner_id']
+    assert not issubclass(group_ref, GroupInfo)
+    assert {k: v.model_dump() for k, v in groups.items()} == {
+        k: v.model_dump(include={'id', 'name', 'owner_id'}) for k, v in full.items()
+    }
+    with pytest.raises(AttributeError):
+        groups['Administrators'].members  # noqa: B018
+
+
+def test_projection_is_read_only() -> None:
+    group: Any = projection(GroupInfo, 'id').model_validate(synthetic.group(0))
+    with pytest.raises(ValidationError):
+        group.id = 'other'
+
+
+def test_projection_still_validates_the_selected_fields() -> None:
+    account_ref = projection(AccountInfo, 'account_id', 'email')
+    account: Any = account_ref.model_validate({'_account_id': 1, 'email': 'a@example.com', 'x': 1})
+    assert account.account_id == 1
+    with pytest.raises(ValidationError):
+        account_ref.model_validate({'email': 'a@example.com'})
+    with pytest.raises(ValidationError):
+        account_ref.model_validate({'_account_id': 'x'})
+
+
+def test_nested_projections() -> None:
+    account_ref = projection(AccountInfo, 'account_id')
+    group_tree = projection(GroupInfo, 'name', members=('account_id',), includes=projection(GroupInfo, 'name'))
+    data = synthetic.group(0, members=[synthetic.account(0)], includes=[synthetic.group(1, members=[])])
+    group: Any = group_tree.model_validate(data)
+    assert group.members == [account_ref.model_validate(synthetic.account(0))]
+    assert isinstance(group.members[0], account_ref)
+    assert group.includes
+    assert group.includes[0].model_dump() == {'name': 'group-1'}
+    assert group.model_dump_json() == dumps(
+        {
+            'name': 'group-0',
+            'members': [{'_account_id': synthetic.FIRST_ACCOUNT_ID}],
+            'includes': [{'name': 'group-1'}],
+        },
+        separators=(',', ':'),
+    )
+
+
+def test_nested_projections_keep_the_generic_types() -> None:
+    team: Any = projection(Team, 'ids', leads=('account_id',)).model_validate(
+        {'leads': [synthetic.account(0)], 'ids': [1, 1]}
+    )
+    assert team.ids == frozenset({1})
+    assert isinstance(team.leads, tuple)
+    assert team.leads[0].model_dump() == {'_account_id': synthetic.FIRST_ACCOUNT_ID}
+
+
+def test_nested_model_selected_by_name_is_the_full_model() -> None:
+    group: Any = projection(GroupInfo, 'id', 'members').model_validate(
+        synthetic.group(0, members=[synthetic.account(0)])
+    )
+    assert group.members == [AccountInfo.model_validate(synthetic.account(0))]
+
+
+def test_projections_are_cached() -> None:
+    first = projection(GroupInfo, 'id', 'name', members=('email', 'account_id'))
+    assert projection(GroupInfo, 'name', 'id', members=('account_id', 'email')) is first
+    assert projection(GroupInfo, 'id', 'name') is not first
+
+
+@pytest.mark.parametrize(
+    ('fields', 'nested', 'error'),
+    [
+        (('id', 'nope'), {}, 'GroupInfo has no fields nope'),
+        ((), {'nope': ('id',)}, 'GroupInfo has no field nope'),
+        ((), {'name': ('id',)}, 'GroupInfo.name is not a nested model field'),
+    ],
+)
+def test_invalid_projections(fields: tuple[str, ...], nested: dict[str, tuple[str, ...]], error: str) -> None:
+    with pytest.raises(ValueError, match=error):
+        projection(GroupInfo, *fields, **nested)
@@ -0,0 +1,78 @@
+from collections.abc import Generator
+
+import pytest
+
+from pydantic_gerrit.aio.reconcile import DesiredMembership, reconcile
+from pydantic_gerrit.sync import MembershipDiff
+from tests import synthetic
+from tests.fake_gerrit import FakeGerrit
+from tests.helpers import run
+
+ACCOUNTS = [synthetic.FIRST_ACCOUNT_ID + i for i in range(10)]
+
+
+@pytest.fixture
+def gerrit() -> Generator[FakeGerrit]:
+    # group-i has the accounts i, i+1 and i+2, and includes group-(2i+1) and group-(2i+2)
+    with FakeGerrit.synthetic(6, members_per_group=3, accounts=10) as gerrit:
+        yield gerrit
+
+
+def state(gerrit: FakeGerrit, name: str) -> tuple[set[int], set[str]]:
+    group = gerrit.groups[name]
+    return {x['_account_id'] for x in group['members']}, {x['id'] for x in group['includes']}
+
+
+def test_reconcile(gerrit: FakeGerrit) -> None:
+    desired = {
+        'group-0': DesiredMembership(members={ACCOUNTS[1], *ACCOUNTS[5:8]}, subgroups={synthetic.group_uuid(1)}),
+        'group-1': DesiredMembership(members=ACCOUNTS[1:4]),  # already there
+        synthetic.group_uuid(2): DesiredMembership(subgroups=[synthetic.group_uuid(0), synthetic.group_uuid(5)]),
+    }
+    diffs = run(gerrit.url, lambda client: reconcile(client, desired, chunk_size=2))
+    assert diffs == {
+        'group-0': MembershipDiff(
+            synthetic.group_uuid(0),
+            added_members=frozenset(ACCOUNTS[5:8]),
+            removed_members=frozenset({ACCOUNTS[0], ACCOUNTS[2]}),
+            removed_subgroups=frozenset({synthetic.group_uuid(2)}),
+        ),
+        'group-1': MembershipDiff(synthetic.group_uuid(1)),
+        synthetic.group_uuid(2): MembershipDiff(
+            synthetic.group_uuid(2), added_subgroups=frozenset({synthetic.group_uuid(0)})
+        ),
+    }
+    assert state(gerrit, 'group-0') == ({ACCOUNTS[1], *ACCOUNTS[5:8]}, {synthetic.group_uuid(1)})
+    assert state(gerrit, 'group-1') == (set(ACCOUNTS[1:4]), {synthetic.group_uuid(3), synthetic.group_uuid(4)})
+    assert state(gerrit, 'group-2') == (set(ACCOUNTS[2:5]), {synthetic.group_uuid(5), synthetic.group_uuid(0)})
+
+    # The query, then 3 added members in chunks of 2, and one call for each other change
+    calls = [x.split('?')[0] for x in gerrit.requests]
+    # (concurrent calls, in any order)
+    assert sorted(calls) == sorted(
+        [
+            'GET /a/groups/',
+            *[f'POST /a/groups/{synthetic.group_uuid(0)}/members'] * 2,
+            f'POST /a/groups/{synthetic.group_uuid(0)}/members.delete',
+            f'POST /a/groups/{synthetic.group_uuid(0)}/groups.delete',
+            f'POST /a/groups/{synthetic.group_uuid(2)}/groups',
+        ]
+    )
+
+    # Nothing left to do
+    diffs = run(gerrit.url, lambda client: reconcile(client, desired))
+    assert not any(diffs.values())
+
+
+def test_dry_run(gerrit: FakeGerrit) -> None:
+    diffs = run(gerrit.url, lambda client: reconcile(client, {'group-0': DesiredMembership(members=[])}, dry_run=True))
+    assert diffs['group-0'].removed_members == frozenset(ACCOUNTS[:3])
+    assert state(gerrit, 'group-0')[0] == set(ACCOUNTS[:3])
+    assert len(gerrit.requests) == 1
+
+
+def test_missing_groups_change_nothing(gerrit: FakeGerrit) -> None:
+    desired = {'group-0': DesiredMembership(members=[]), 'nope': DesiredMembership(members=[])}
+    with pytest.raises(ValueError, match='Groups not found: nope'):
+        run(gerrit.url, lambda client: reconcile(client, desired))
+    assert state(gerrit, 'group-0')[0] == set(ACCOUNTS[:3])
@@ -0,0 +1,72 @@
+from json import dumps
+from pathlib import Path
+from typing import Any
+
+from pydantic_gerrit.parsing import parse_response
+from pydantic_gerrit.recorder import ResponseRecorder, read_records, replay
+from pydantic_gerrit.v3_12.groups import GroupAuditEventInfo
+from tests import synthetic
+
+
+def test_appends_only_new_records(tmp_path: Path) -> None:
+    path = tmp_path / 'records.jsonl'
+    recorder = ResponseRecorder(path)
+    assert recorder.record({'b': 1, 'a': [1, 2]})
+    assert not recorder.record({'a': [1, 2], 'b': 1})  # same content, other key order
+    assert recorder.record_all([{'x': 'é'}, {'b': 1, 'a': [1, 2]}, None]) == 2  # noqa: PLR2004
+    recorder.close()
+    assert path.read_text() == '{"a":[1,2],"b":1}\n{"x":"é"}\nnull\n'
+
+    # The hashes of the existing records are loaded
+    recorder = ResponseRecorder(path)
+    assert len(recorder) == 3  # noqa: PLR2004
+    assert not recorder.record(None)
+    assert recorder.record(0)
+    recorder.close()
+    assert list(read_records(path)) == [{'a': [1, 2], 'b': 1}, {'x': 'é'}, None, 0]
+
+
+def test_incomplete_last_line(tmp_path: Path) -> None:
+    path = tmp_path / 'records.jsonl'
+    path.write_bytes(b'1\n2\n{"interrupt')
+    recorder = ResponseRecorder(path)
+    recorder.record(3)
+    recorder.close()
+    assert list(read_records(path)) == [1, 2, 3]
+
+
+def test_compaction(tmp_path: Path) -> None:
+    path = tmp_path / 'records.jsonl'
+    recorder = ResponseRecorder(path, max_records=4)
+    recorder.record_all(range(5))
+    assert list(read_records(path)) == [0, 1, 2, 3, 4]  # still within the slack
+    recorder.record(5)
+    assert list(read_records(path)) == [2, 3, 4, 5]
+    assert len(recorder) == 4  # noqa: PLR2004
+    recorder.record(6)
+    recorder.close()
+    assert list(read_records(path)) == [2, 3, 4, 5, 6]
+
+    recorder = ResponseRecorder(path, max_bytes=6)  # 3 records of 2 bytes
+    recorder.record(7)
+    recorder.record(8)
+    recorder.close()
+    assert list(read_records(path)) == [6, 7, 8]
+
+
+def test_replay(tmp_path: Path) -> None:
+    path = tmp_path / 'events.jsonl'
+    events = synthetic.audit_events(20)
+    recorder = ResponseRecorder(path)
+    recorder.record_all(events)
+    recorder.close()
+    assert list(read_records(path)) == events
+    replayed: list[Any] = list(replay(path, GroupAuditEventInfo))  # type: ignore[arg-type]
+    assert replayed == parse_response(dumps(events).encode(), list[GroupAuditEventInfo])
+
+
+def test_empty(tmp_path: Path) -> None:
+    path = tmp_path / 'records.jsonl'
+    ResponseRecorder(path).close()
+    assert path.read_bytes() == b''
+    assert list(read_records(path)) == []
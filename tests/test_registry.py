@@ -0,0 +1,117 @@
+import sys
+from collections.abc import Generator, Sequence
+from json import dumps
+from types import ModuleType
+from typing import Any, Optional
+
+import pytest
+from pydantic import BaseModel, Field, create_model
+from pydantic.fields import FieldInfo
+
+from pydantic_gerrit import latest, registry
+from pydantic_gerrit.base import BaseModelGerrit
+from pydantic_gerrit.parsing import parse_response
+from pydantic_gerrit.registry import (
+    duplicated_models,
+    model_for,
+    package_for,
+    parse_versioned_response,
+    type_for,
+    version_packages,
+)
+from pydantic_gerrit.v3_12.groups import GroupAuditEventInfo, GroupInfo
+from tests import synthetic
+
+
+@pytest.fixture
+def fake_package() -> Generator[ModuleType]:
+    """A version package redefining GroupOptionsInfo exactly as in latest, and GroupInfo with a new field."""
+    package = ModuleType('pydantic_gerrit.v3_99')
+    package.GroupOptionsInfo = create_model(  # type: ignore[attr-defined]
+        'GroupOptionsInfo', __base__=BaseModelGerrit, visible_to_all=(bool | None, Field(default=None))
+    )
+    package.GroupInfo = create_model('GroupInfo', __base__=GroupInfo, new_field=(int, 0))  # type: ignore[attr-defined]
+    package.AccountInfo = latest.AccountInfo  # type: ignore[attr-defined]
+    package.__all__ = ['AccountInfo', 'GroupInfo', 'GroupOptionsInfo']  # type: ignore[attr-defined]
+    sys.modules[package.__name__] = package
+    yield package
+    del sys.modules[package.__name__]
+
+
+def test_version_packages() -> None:
+    assert version_packages() == {(3, 12): 'v3_12'}
+
+
+@pytest.mark.parametrize(
+    ('server_version', 'package'),
+    [
+        ('3.12.1', 'v3_12'),
+        ('3.12', 'v3_12'),
+        (' v3.12.0-rc2 ', 'v3_12'),
+        ('3.12.1-123-gabcdef', 'v3_12'),
+        ('3.10.6', 'v3_12'),  # no package for it: the oldest newer one
+        ('3.13.0', 'latest'),
+    ],
+)
+def test_package_for(server_version: str, package: str) -> None:
+    assert package_for(server_version) == package
+
+
+def test_package_for_invalid_version() -> None:
+    with pytest.raises(ValueError, match='Invalid Gerrit version'):
+        package_for('unknown')
+
+
+def test_unchanged_models_are_shared() -> None:
+    assert model_for('3.12.1', 'GroupInfo') is latest.GroupInfo is model_for('3.13', 'GroupInfo')
+    assert type_for('3.12.1', dict[str, GroupInfo]) == dict[str, GroupInfo]
+    assert duplicated_models() == []
+
+
+def test_parse_versioned_response() -> None:
+    content = dumps(synthetic.audit_events(5)).encode()
+    events = parse_versioned_response(content, '3.12.1', list[GroupAuditEventInfo])
+    assert events == parse_response(content, list[GroupAuditEventInfo])
+
+
+def test_type_for_keeps_the_generic_types(fake_package: Any, monkeypatch: pytest.MonkeyPatch) -> None:  # noqa: ANN401
+    monkeypatch.setattr(registry, 'version_packages', lambda: {(3, 99): 'v3_99'})
+    assert type_for('3.99', tuple[GroupInfo, ...]) == tuple[fake_package.GroupInfo, ...]
+    assert type_for('3.99', Sequence[GroupInfo] | None) == Optional[Sequence[fake_package.GroupInfo]]  # noqa: UP045
+    assert type_for('3.99', set[str]) == set[str]
+
+
+def test_duplicated_models(fake_package: Any) -> None:  # noqa: ANN401
+    assert duplicated_models(['v3_99']) == [('v3_99', 'GroupOptionsInfo')]
+
+    assert fake_package.GroupInfo is not latest.GroupInfo  # it differs, so it is not reported
+    assert duplicated_models() == []
+
+
+def redefine(model: type[BaseModel], package: ModuleType, **annotations: Any) -> None:  # noqa: ANN401
+    """Redefine the model in the package, with the same fields, except for the given annotations (or new fields)."""
+    fields: dict[str, Any] = {
+        name: (info.annotation, FieldInfo.merge_field_infos(info)) for name, info in model.model_fields.items()
+    }
+    fields |= {
+        name: (annotation, fields[name][1] if name in fields else None) for name, annotation in annotations.items()
+    }
+    redefined = create_model(model.__name__, __base__=BaseModelGerrit, __module__=package.__name__, **fields)
+    setattr(package, model.__name__, redefined)
+    package.__all__ = [*getattr(package, '__all__', []), model.__name__]  # type: ignore[attr-defined]
+
+
+@pytest.mark.parametrize('new_field', [False, True])
+def test_duplicated_models_compare_the_nested_models(new_field: bool) -> None:
+    package = ModuleType('pydantic_gerrit.v3_98')
+    package.AvatarInfo = latest.AvatarInfo  # type: ignore[attr-defined]
+    package.GroupOptionsInfo = latest.GroupOptionsInfo  # type: ignore[attr-defined]
+    sys.modules[package.__name__] = package
+    try:
+        redefine(latest.AccountInfo, package, **({'new_field': int | None} if new_field else {}))
+        redefine(latest.GroupInfo, package, members=list[package.AccountInfo] | None)  # type: ignore[name-defined]
+        found = duplicated_models(['v3_98'])
+    finally:
+        del sys.modules[package.__name__]
+    # The GroupInfo is the same as in latest only if its AccountInfo is the same too
+    assert found == ([] if new_field else [('v3_98', 'AccountInfo'), ('v3_98', 'GroupInfo')])
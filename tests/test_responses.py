@@ -0,0 +1,62 @@
+"""
+Offline tests, using the responses recorded from a real Gerrit by the other tests.
+
+These run without a Gerrit instance, so they are also usable in CI.
+"""
+
+from json import loads
+from typing import Any
+
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+from pydantic_gerrit.v3_12.accounts import AccountInfo
+from pydantic_gerrit.v3_12.groups import (
+    GroupAuditAccountEventInfo,
+    GroupAuditEventInfo,
+    GroupAuditGroupEventInfo,
+    GroupInfo,
+)
+from tests.helpers import read_recorded
+
+
+def load_response(name: str) -> Any:  # noqa: ANN401
+    return loads(read_recorded(name))
+
+
+def test_group_audit_event_info_is_tagged_by_type() -> None:
+    events: list[dict[str, Any]] = load_response('group-audit-event-info.jsonl')
+    validated: list[GroupAuditEventInfo] = TypeAdapter(list[GroupAuditEventInfo]).validate_python(events)
+
+    assert len(validated) == len(events)
+    for data, event in zip(events, validated, strict=True):
+        if data['type'] in {'ADD_USER', 'REMOVE_USER'}:
+            assert isinstance(event, GroupAuditAccountEventInfo)
+            assert isinstance(event.member, AccountInfo)
+        else:
+            assert isinstance(event, GroupAuditGroupEventInfo)
+            assert isinstance(event.member, GroupInfo)
+
+
+@pytest.mark.parametrize('event_type', ['ADD_GROUP', 'REMOVE_GROUP'])
+def test_group_audit_event_info_rejects_account_member_for_group_event(event_type: str) -> None:
+    event: dict[str, Any] = next(
+        x for x in load_response('group-audit-event-info.jsonl') if x['type'] in {'ADD_USER', 'REMOVE_USER'}
+    )
+    event['type'] = event_type
+
+    with pytest.raises(ValidationError) as error:
+        TypeAdapter(GroupAuditEventInfo).validate_python(event)
+
+    # The error comes only from the GroupInfo branch, the AccountInfo branch is never tried
+    assert all(x['loc'][0] == event_type for x in error.value.errors())
+
+
+def test_group_audit_event_info_rejects_unknown_type() -> None:
+    event: dict[str, Any] = load_response('group-audit-event-info.jsonl')[0]
+    event['type'] = 'RENAME_GROUP'
+
+    with pytest.raises(ValidationError) as error:
+        TypeAdapter(GroupAuditEventInfo).validate_python(event)
+
+    assert error.value.errors()[0]['type'] == 'union_tag_invalid'
@@ -0,0 +1,111 @@
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from pydantic_gerrit.sync import CheckpointStore, MembershipDiff, MembershipSync
+from tests import synthetic
+from tests.fake_gerrit import FakeGerrit
+
+ACCOUNTS = [synthetic.FIRST_ACCOUNT_ID + i for i in range(5)]
+
+
+@pytest.fixture
+def gerrit() -> Generator[FakeGerrit]:
+    # group-1 has the first 3 accounts, group-2 has all of them (so all are known accounts)
+    groups = {
+        'group-1': synthetic.group(1, members=[synthetic.account(i) for i in range(3)], includes=[]),
+        'group-2': synthetic.group(2, members=[synthetic.account(i) for i in range(5)], includes=[]),
+    }
+    with FakeGerrit(groups) as gerrit:
+        yield gerrit
+
+
+def new_sync(gerrit: FakeGerrit, path: Path) -> MembershipSync:
+    return MembershipSync(gerrit.fetch, CheckpointStore(path / 'checkpoint.json'))
+
+
+def test_first_sync_takes_the_current_members(gerrit: FakeGerrit, tmp_path: Path) -> None:
+    gerrit.add_members([], 'group-1', {'members': [str(ACCOUNTS[3])]})
+    team = synthetic.group_uuid(1)
+    [diff] = new_sync(gerrit, tmp_path).sync([team])
+    assert diff == MembershipDiff(team, added_members=frozenset(ACCOUNTS[:4]))
+    assert gerrit.requests[-3:] == [
+        f'GET /a/groups/{team}/log.audit?',
+        f'GET /a/groups/{team}/members?',
+        f'GET /a/groups/{team}/groups?',
+    ]
+
+
+def test_sync_applies_only_the_new_events(gerrit: FakeGerrit, tmp_path: Path) -> None:
+    team, everyone = synthetic.group_uuid(1), synthetic.group_uuid(2)
+    gerrit.add_members([], 'group-1', {'members': [str(ACCOUNTS[3])]})
+    list(new_sync(gerrit, tmp_path).sync([team]))
+
+    gerrit.remove_members([], 'group-1', {'members': [str(ACCOUNTS[0])]})
+    gerrit.add_members([], 'group-1', {'members': [str(ACCOUNTS[4])]})
+    gerrit.add_subgroups([], 'group-1', {'groups': ['group-2']})
+
+    sync = new_sync(gerrit, tmp_path)  # a new run, from the saved checkpoint
+    assert sync.sync_group(team) == MembershipDiff(
+        team,
+        added_members=frozenset({ACCOUNTS[4]}),
+        removed_members=frozenset({ACCOUNTS[0]}),
+        added_subgroups=frozenset({everyone}),
+    )
+    assert sync.states[team].members == set(ACCOUNTS[1:])
+    assert sync.states[team].subgroups == {everyone}
+    assert not sync.sync_group(team)  # nothing new
+    assert gerrit.requests[-1] == f'GET /a/groups/{team}/log.audit?'  # only the audit log
+
+
+def test_sync_saves_the_store_once(gerrit: FakeGerrit, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    saved = []
+    monkeypatch.setattr(CheckpointStore, 'save', lambda _, states: saved.append(set(states)))
+    team, everyone = synthetic.group_uuid(1), synthetic.group_uuid(2)
+    sync = new_sync(gerrit, tmp_path)
+    list(sync.sync([team, everyone]))
+    assert saved == [{team, everyone}]
+    list(sync.sync([team, everyone]))
+    assert len(saved) == 1  # nothing changed
+
+    gerrit.add_members([], 'group-1', {'members': [str(ACCOUNTS[4])]})
+    diffs = sync.sync([team, everyone])
+    assert next(diffs)
+    diffs.close()  # stopped early: the groups already synced are saved
+    assert len(saved) == 2  # noqa: PLR2004
+
+
+def test_add_and_remove_cancel_out(gerrit: FakeGerrit, tmp_path: Path) -> None:
+    team = synthetic.group_uuid(1)
+    sync = new_sync(gerrit, tmp_path)
+    sync.sync_group(team)
+    gerrit.add_members([], 'group-1', {'members': [str(ACCOUNTS[4])]})
+    gerrit.remove_members([], 'group-1', {'members': [str(ACCOUNTS[4])]})
+    assert not sync.sync_group(team)
+
+
+def test_events_in_the_same_second_as_the_checkpoint(gerrit: FakeGerrit, tmp_path: Path) -> None:
+    team = synthetic.group_uuid(1)
+    second = '2025-07-12 22:04:22.000000000'
+    gerrit.add_members([], 'group-1', {'members': [str(ACCOUNTS[3])]})
+    gerrit.audit[team][0]['date'] = second
+    sync = new_sync(gerrit, tmp_path)
+    sync.sync_group(team)
+
+    # A later event recorded in the same second: it must be applied, the first one not again
+    gerrit.remove_members([], 'group-1', {'members': [str(ACCOUNTS[3])]})
+    gerrit.add_members([], 'group-1', {'members': [str(ACCOUNTS[4])]})
+    gerrit.audit[team][0]['date'] = gerrit.audit[team][1]['date'] = second
+    assert sync.sync_group(team) == MembershipDiff(
+        team, added_members=frozenset({ACCOUNTS[4]}), removed_members=frozenset({ACCOUNTS[3]})
+    )
+    assert len(sync.states[team].seen) == 3  # noqa: PLR2004
+
+
+def test_checkpoint_store(tmp_path: Path) -> None:
+    store = CheckpointStore(tmp_path / 'checkpoint.json')
+    assert store.load() == {}
+    (tmp_path / 'checkpoint.json').write_text('{"version": 0}')
+    with pytest.raises(ValueError, match='version'):
+        store.load()
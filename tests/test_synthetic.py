@@ -0,0 +1,52 @@
+import json
+from itertools import pairwise
+
+from pydantic import TypeAdapter
+
+from benchmarks.suite import OPERATIONS, datasets, run
+from pydantic_gerrit.v3_12.accounts import AccountInfo
+from pydantic_gerrit.v3_12.groups import GroupAuditEventInfo, GroupAuditGroupEventInfo, GroupInfo
+from tests import synthetic
+
+
+def test_synthetic_groups_with_members() -> None:
+    count, members = 20, 5
+    groups: dict[str, GroupInfo] = TypeAdapter(dict[str, GroupInfo]).validate_python(
+        synthetic.groups_with_members(count, members_per_group=members, accounts=15)
+    )
+    assert len(groups) == count
+    assert groups['group-3'].members
+    assert len(groups['group-3'].members) == members
+    assert groups['group-3'].members[0].account_id == synthetic.FIRST_ACCOUNT_ID + 3
+
+
+def test_synthetic_audit_events() -> None:
+    count = 30
+    events: list[GroupAuditEventInfo] = TypeAdapter(list[GroupAuditEventInfo]).validate_python(
+        synthetic.audit_events(count)
+    )
+    assert len(events) == count
+    assert sum(isinstance(x, GroupAuditGroupEventInfo) for x in events) == count // 10
+    assert all(x.date > y.date for x, y in pairwise(events))  # newest first
+
+
+def test_synthetic_includes_tree() -> None:
+    depth, fanout = 3, 2
+    tree = GroupInfo.model_validate(synthetic.includes_tree(depth, fanout))
+
+    def count(group: GroupInfo) -> int:
+        return 1 + sum(count(x) for x in group.includes or [])
+
+    assert count(tree) == synthetic.tree_size(depth, fanout) == 1 + 2 + 4 + 8
+
+
+def test_synthetic_data_is_deterministic() -> None:
+    assert json.dumps(synthetic.audit_events(50)) == json.dumps(synthetic.audit_events(50))
+    assert AccountInfo.model_validate(synthetic.account(1)) == AccountInfo.model_validate(synthetic.account(1))
+
+
+def test_benchmark_suite_runs() -> None:
+    results = list(run(['v3_12'], scale=0.001, repeat=1))
+    assert len(results) == len(datasets(0.001)) * len(OPERATIONS)
+    assert all(x.ops_per_sec > 0 for x in results)
+    assert {x.model for x in results} == {'GroupInfo', 'AccountInfo', 'GroupAuditEventInfo'}
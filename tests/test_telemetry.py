@@ -0,0 +1,121 @@
+from collections.abc import Generator
+from io import BytesIO
+from json import dumps, loads
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from pydantic_gerrit import telemetry
+from pydantic_gerrit.base import BaseModelGerrit
+from pydantic_gerrit.ingest import ingest
+from pydantic_gerrit.parsing import parse_response
+from pydantic_gerrit.recorder import replay
+from pydantic_gerrit.telemetry import Telemetry
+from pydantic_gerrit.v3_12.accounts import AccountInfo
+from pydantic_gerrit.v3_12.groups import GroupAuditEventInfo, GroupInfo
+from tests import synthetic
+
+
+@pytest.fixture
+def recorder() -> Generator[Telemetry]:
+    yield telemetry.enable(Telemetry(seed=0))
+    telemetry.disable()
+
+
+def rows(recorder: Telemetry) -> dict[tuple[str, str], dict[str, Any]]:
+    return {(x['version'], x['type']): x for x in recorder.snapshot()['validations']}
+
+
+def test_disabled_by_default() -> None:
+    assert telemetry.active() is None
+    AccountInfo.model_validate(synthetic.account(0))
+
+
+def test_counts_validations(recorder: Telemetry) -> None:
+    content = dumps(synthetic.groups_with_members(3)).encode()
+    parse_response(content, dict[str, GroupInfo])
+    parse_response(b")]}'" + content, dict[str, GroupInfo])
+    parse_response(dumps(synthetic.group(0)).encode(), GroupInfo)
+    telemetry.call(AccountInfo, 0, AccountInfo.model_validate, synthetic.account(0))
+    with pytest.raises(ValidationError):
+        telemetry.call(AccountInfo, 0, AccountInfo.model_validate, {})
+
+    found = rows(recorder)
+    # The v3_12 package uses the models of latest
+    assert set(found) == {('latest', 'dict[str, GroupInfo]'), ('latest', 'AccountInfo'), ('latest', 'GroupInfo')}
+    groups = found['latest', 'dict[str, GroupInfo]']
+    assert (groups['count'], groups['errors'], groups['bytes']) == (2, 0, 2 * len(content))
+    assert 0 < groups['p50_seconds'] <= groups['p99_seconds'] <= groups['max_seconds'] <= groups['seconds']
+    assert (found['latest', 'AccountInfo']['count'], found['latest', 'AccountInfo']['errors']) == (2, 1)
+    assert found['latest', 'AccountInfo']['bytes'] == 0  # not JSON
+
+    recorder.reset()
+    assert recorder.snapshot() == {'validations': [], 'unknown_fields': []}
+
+
+def test_unknown_fields(recorder: Telemetry) -> None:
+    groups = loads(dumps(synthetic.groups_with_members(3)))  # not sharing the members
+    for group in groups.values():
+        group['new_field'] = 'x' * 200
+        group['members'][0]['new_account_field'] = True
+    with pytest.raises(ValidationError):
+        parse_response(dumps(groups).encode(), dict[str, GroupInfo])
+
+    events = synthetic.audit_events(2)
+    events[1]['user']['tags'] = ['SERVICE_USER', 'NEW_TAG']
+    events[1]['user']['new_account_field'] = 1
+    with pytest.raises(ValidationError):
+        parse_response(dumps(events).encode(), list[GroupAuditEventInfo])
+
+    unknown = {(x['type'], x['field']): x for x in recorder.snapshot()['unknown_fields']}
+    assert {k: v['count'] for k, v in unknown.items()} == {
+        ('dict[str, GroupInfo]', 'new_field'): 3,
+        ('dict[str, GroupInfo]', 'members.new_account_field'): 3,
+        ('list[GroupAuditAccountEventInfo | GroupAuditGroupEventInfo]', 'user.new_account_field'): 1,
+    }
+    assert unknown['dict[str, GroupInfo]', 'new_field']['samples'] == ["'" + 'x' * 99] * 3
+    assert unknown['dict[str, GroupInfo]', 'members.new_account_field']['samples'] == ['True'] * 3
+
+
+def test_model_methods_are_not_instrumented(recorder: Telemetry) -> None:
+    # So they have no overhead, with telemetry enabled or not
+    assert BaseModelGerrit.model_validate.__func__ is BaseModel.model_validate.__func__  # type: ignore[attr-defined]
+    assert BaseModelGerrit.model_validate_json.__func__ is BaseModel.model_validate_json.__func__  # type: ignore[attr-defined]
+    AccountInfo.model_validate(synthetic.account(0))
+    GroupInfo.model_validate_json(dumps(synthetic.group(0)))
+    assert rows(recorder) == {}
+
+
+def test_package_type_adapters_are_recorded(recorder: Telemetry, tmp_path: Path) -> None:
+    events = synthetic.audit_events(4)
+    path = tmp_path / 'events.jsonl'
+    path.write_text(''.join(dumps(x) + '\n' for x in events))
+    list(replay(path, GroupAuditEventInfo))  # type: ignore[arg-type]
+    list(ingest(BytesIO(dumps(events).encode()), GroupAuditEventInfo))
+    parse_response(b")]}'\n" + dumps(events).encode(), list[GroupAuditEventInfo])
+
+    found = rows(recorder)
+    union = 'GroupAuditAccountEventInfo | GroupAuditGroupEventInfo'
+    assert found['latest', union]['count'] == 4  # noqa: PLR2004
+    assert found['latest', f'list[{union}]']['count'] == 2  # noqa: PLR2004
+
+
+def test_sampling() -> None:
+    recorder = Telemetry(sample_rate=0, seed=0)
+    for _ in range(3):
+        recorder.call(AccountInfo, 0, AccountInfo.model_validate, synthetic.account(0))
+    row = rows(recorder)['latest', 'AccountInfo']
+    assert row['count'] == 3  # noqa: PLR2004
+    assert row['p50_seconds'] is None
+
+    recorder = Telemetry(max_samples=10, seed=0)
+    for _ in range(100):
+        recorder.call(AccountInfo, 0, AccountInfo.model_validate, synthetic.account(0))
+    row = rows(recorder)['latest', 'AccountInfo']
+    assert row['count'] == 100  # noqa: PLR2004
+    assert row['p99_seconds'] <= row['max_seconds']
+
+    with pytest.raises(ValueError, match='sample_rate'):
+        Telemetry(sample_rate=2)
@@ -0,0 +1,112 @@
+import copy
+import pickle
+from datetime import datetime, timedelta, timezone
+from json import loads
+
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+from pydantic_gerrit.timestamps import Timestamp, format_timestamp, lossless_model, lossless_type, parse_timestamp
+from pydantic_gerrit.v3_12.groups import (
+    GroupAuditAccountEventInfo,
+    GroupAuditEventInfo,
+    GroupAuditGroupEventInfo,
+    GroupInfo,
+)
+from tests.helpers import read_recorded
+
+adapter: TypeAdapter[Timestamp] = TypeAdapter(Timestamp)
+audit_adapter: TypeAdapter[list[GroupAuditEventInfo]] = TypeAdapter(list[GroupAuditEventInfo])
+
+
+def test_parse_timestamp_keeps_nanoseconds() -> None:
+    timestamp = parse_timestamp('2025-07-12 22:04:22.123456789')
+    assert timestamp == datetime(2025, 7, 12, 22, 4, 22, 123456)  # noqa: DTZ001
+    assert timestamp.nanosecond == 789  # noqa: PLR2004
+    assert timestamp.tzinfo is None
+    assert timestamp.gerrit_format() == '2025-07-12 22:04:22.123456789'
+
+
+def test_parse_timestamp_is_cached() -> None:
+    assert parse_timestamp('2025-07-12 22:04:22.000000000') is parse_timestamp('2025-07-12 22:04:22.000000000')
+
+
+@pytest.mark.parametrize(
+    ('value', 'expected'),
+    [
+        ('2025-07-12T22:04:22', datetime(2025, 7, 12, 22, 4, 22)),  # noqa: DTZ001
+        ('2025-07-12 22:04:22.123456', datetime(2025, 7, 12, 22, 4, 22, 123456)),  # noqa: DTZ001
+        ('2025-07-12', datetime(2025, 7, 12)),  # noqa: DTZ001
+        ('2025-07-12T22:04:22+02:00', datetime(2025, 7, 12, 22, 4, 22, tzinfo=timezone(timedelta(hours=2)))),
+        (datetime(2025, 7, 12, 22, 4, 22, tzinfo=timezone.utc), datetime(2025, 7, 12, 22, 4, 22, tzinfo=timezone.utc)),
+    ],
+)
+def test_other_iso_formats(value: object, expected: datetime) -> None:
+    timestamp = adapter.validate_python(value)
+    assert isinstance(timestamp, Timestamp)
+    assert timestamp == expected
+    assert timestamp.utcoffset() == expected.utcoffset()
+    assert timestamp.nanosecond == 0
+
+
+@pytest.mark.parametrize(
+    'value',
+    [
+        '',
+        'yesterday',
+        '2025-07-12 22:04:22.00000000x',
+        '2025-13-12 22:04:22.000000000',
+        '1752357862',
+        1752357862,
+        None,
+    ],
+)
+def test_invalid_timestamps(value: object) -> None:
+    with pytest.raises(ValidationError):
+        adapter.validate_python(value)
+
+
+def test_format_timestamp() -> None:
+    assert format_timestamp(datetime(2025, 1, 2, 3, 4, 5, 6)) == '2025-01-02 03:04:05.000006000'  # noqa: DTZ001
+
+
+def test_timestamp_from_datetime() -> None:
+    timestamp = adapter.validate_python(datetime(2025, 1, 2, 3, 4, 5))  # noqa: DTZ001
+    assert isinstance(timestamp, Timestamp)
+    assert timestamp.gerrit_format() == '2025-01-02 03:04:05.000000000'
+
+
+def test_timestamp_serialization() -> None:
+    timestamp = adapter.validate_json('"2025-07-12 22:04:22.000000001"')
+    assert adapter.dump_json(timestamp) == b'"2025-07-12 22:04:22.000000001"'
+    assert adapter.dump_python(timestamp) is timestamp
+    assert adapter.json_schema()['type'] == 'string'
+
+
+@pytest.mark.parametrize('function', [pickle.loads, copy.copy, copy.deepcopy])
+def test_timestamp_copies_keep_nanoseconds(function: object) -> None:
+    timestamp = parse_timestamp('2025-07-12 22:04:22.000000999')
+    data = pickle.dumps(timestamp) if function is pickle.loads else timestamp
+    copied = function(data)  # type: ignore[operator]
+    assert isinstance(copied, Timestamp)
+    assert copied.gerrit_format() == '2025-07-12 22:04:22.000000999'
+
+
+def test_models_use_datetime_by_default() -> None:
+    event = audit_adapter.validate_json(read_recorded('group-audit-event-info.jsonl'))[0]
+    assert type(event.date) is datetime
+
+
+def test_lossless_models_round_trip_the_gerrit_timestamps() -> None:
+    content = read_recorded('group-audit-event-info.jsonl').decode()
+    events_adapter: TypeAdapter[list[GroupAuditEventInfo]] = TypeAdapter(lossless_type(list[GroupAuditEventInfo]))
+    events = events_adapter.validate_json(content)
+    assert isinstance(events[0], (GroupAuditAccountEventInfo, GroupAuditGroupEventInfo))
+    assert isinstance(events[0].date, Timestamp)
+    assert [x['date'] for x in loads(events_adapter.dump_json(events))] == [x['date'] for x in loads(content)]
+
+    group = lossless_model(GroupInfo).model_validate(
+        {'id': 'x', 'options': {}, 'created_on': '2025-07-12 22:04:22.000000001'}
+    )
+    assert isinstance(group, GroupInfo)
+    assert loads(group.model_dump_json())['created_on'] == '2025-07-12 22:04:22.000000001'
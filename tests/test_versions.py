@@ -0,0 +1,75 @@
+import subprocess
+import sys
+from importlib import import_module
+
+import pytest
+from pydantic import BaseModel
+
+import pydantic_gerrit.v3_12
+from pydantic_gerrit.v3_12 import accounts, groups
+
+
+def run_python(code: str) -> str:
+    """Run the code on a fresh interpreter, where no model was imported yet."""
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)  # noqa: S603
+    return result.stdout.strip()
+
+
+@pytest.mark.parametrize('package', ['pydantic_gerrit.latest', 'pydantic_gerrit.v3_12'])
+def test_version_package_exports_all_models(package: str) -> None:
+    module = import_module(package)
+    endpoints = [import_module(f'{package}.accounts'), import_module(f'{package}.groups')]
+    for name in module.__all__:
+        assert any(getattr(module, name) is getattr(x, name, None) for x in endpoints)
+        assert name in dir(module)
+
+
+@pytest.mark.parametrize('package', ['pydantic_gerrit.latest', 'pydantic_gerrit.v3_12'])
+def test_version_package_table_matches_the_endpoints(package: str) -> None:
+    module = import_module(package)
+    for endpoint_name, names in module._MODELS.items():  # noqa: SLF001
+        endpoint = import_module(f'{package}.{endpoint_name}')
+        defined = [
+            name
+            for name, value in vars(endpoint).items()
+            if not name.startswith('_')
+            and isinstance(value, type)
+            and issubclass(value, BaseModel)
+            and value.__module__ == endpoint.__name__
+        ]
+        assert set(defined) <= set(names)
+        assert sorted(getattr(endpoint, '__all__', names)) == sorted(names)
+
+
+def test_version_package_attributes_are_the_endpoint_models() -> None:
+    assert pydantic_gerrit.v3_12.AccountInfo is accounts.AccountInfo
+    assert pydantic_gerrit.v3_12.GroupInfo is groups.GroupInfo
+
+
+def test_version_package_unknown_attribute() -> None:
+    with pytest.raises(AttributeError, match='NotAModel'):
+        _ = pydantic_gerrit.v3_12.NotAModel
+
+
+def test_version_package_imports_endpoints_lazily() -> None:
+    output = run_python(
+        'import sys\n'
+        'import pydantic_gerrit.v3_12 as v\n'
+        'print(sorted(x for x in sys.modules if x.startswith("pydantic_gerrit.")))\n'
+        'v.AvatarInfo\n'
+        'print(sorted(x for x in sys.modules if x.startswith("pydantic_gerrit.") and "groups" in x))\n'
+    )
+    assert output.splitlines() == [
+        "['pydantic_gerrit._lazy', 'pydantic_gerrit.v3_12']",
+        '[]',  # the groups endpoint is not imported when using an accounts model
+    ]
+
+
+def test_models_are_built_on_first_use() -> None:
+    output = run_python(
+        'from pydantic_gerrit.v3_12 import GroupInfo\n'
+        'print(GroupInfo.__pydantic_complete__)\n'
+        'GroupInfo.model_validate({"id": "x", "options": {}})\n'
+        'print(GroupInfo.__pydantic_complete__)\n'
+    )
+    assert output.splitlines() == ['False', 'True']